@@ -11,10 +11,14 @@ import string
 import os
 from io import StringIO
 from datetime import datetime, timedelta
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, session, redirect, url_for, stream_with_context
 from flask_compress import Compress
 from functools import wraps
 from src.crawler import WebCrawler
+from src.core.exclusion_matcher import get_exclusion_matcher
+from src.core.link_manager import build_status_index, apply_link_statuses
+from src.core.result_log import ResultLog
+from src.core.result_store import ResultStore
 from src.settings_manager import SettingsManager
 from src.auth_db import init_db, create_user, authenticate_user, get_user_by_id, log_guest_crawl, get_guest_crawls_last_24h, verify_user, set_user_tier, create_verification_token, verify_token, get_user_by_email
 from src.email_service import send_verification_email, send_welcome_email
@@ -333,41 +337,15 @@ def generate_links_csv_export(links):
 
 def generate_links_json_export(links):
     """Generate JSON export for links data"""
-    return json.dumps(links, indent=2)
+    return json.dumps(list(links), indent=2)
 
 def filter_issues_by_exclusion_patterns(issues, exclusion_patterns):
     """Filter issues based on exclusion patterns (applies current settings to loaded crawls)"""
-    from fnmatch import fnmatch
-    from urllib.parse import urlparse
-
     if not exclusion_patterns:
         return issues
 
-    filtered_issues = []
-
-    for issue in issues:
-        url = issue.get('url', '')
-        parsed = urlparse(url)
-        path = parsed.path
-
-        # Check if URL matches any exclusion pattern
-        should_exclude = False
-        for pattern in exclusion_patterns:
-            if not pattern.strip() or pattern.strip().startswith('#'):
-                continue
-
-            if '*' in pattern:
-                if fnmatch(path, pattern):
-                    should_exclude = True
-                    break
-            elif path == pattern or path.startswith(pattern.rstrip('*')):
-                should_exclude = True
-                break
-
-        if not should_exclude:
-            filtered_issues.append(issue)
-
-    return filtered_issues
+    # Compiled once per pattern list and shared with issue detection
+    return get_exclusion_matcher(exclusion_patterns).filter_issues(issues)
 
 def generate_issues_csv_export(issues):
     """Generate CSV export for issues data"""
@@ -744,30 +722,28 @@ def crawl_status():
     crawler = get_or_create_crawler()
     settings_manager = get_session_settings()
 
-    # Check for incremental update parameters
+    # Check for incremental update parameters (cursors from the previous response)
     url_since = request.args.get('url_since', type=int)
     link_since = request.args.get('link_since', type=int)
     issue_since = request.args.get('issue_since', type=int)
+    generation = request.args.get('generation', type=int)
 
-    # Get full status data
-    status_data = crawler.get_status()
+    # Check if we need to force a full refresh (after loading from DB)
+    force_full = session.pop('force_full_refresh', False)
+
+    if url_since is None and link_since is None and issue_since is None:
+        # Full status data
+        status_data = crawler.get_status()
+    else:
+        # Only the rows added after the client's cursors
+        if force_full:
+            generation = -1
+        status_data = crawler.get_status_since(url_since, link_since, issue_since, generation)
 
     # Ensure baseUrl is in stats (needed for UI to work correctly)
     if crawler.base_url and 'stats' in status_data:
         status_data['stats']['baseUrl'] = crawler.base_url
 
-    # Check if we need to force a full refresh (after loading from DB)
-    force_full = session.pop('force_full_refresh', False)
-
-    # If incremental parameters provided AND not forcing full refresh, slice the arrays
-    if not force_full:
-        if url_since is not None:
-            status_data['urls'] = status_data.get('urls', [])[url_since:]
-        if link_since is not None:
-            status_data['links'] = status_data.get('links', [])[link_since:]
-        if issue_since is not None:
-            status_data['issues'] = status_data.get('issues', [])[issue_since:]
-
     # Apply current issue exclusion patterns to displayed issues
     issues = status_data.get('issues', [])
     if issues:
@@ -779,17 +755,92 @@ def crawl_status():
 
     return jsonify(status_data)
 
+# Push channel for crawl progress (Server-Sent Events). Each open stream holds a Waitress
+# thread, so streams get their own share of threads and clients past the limit fall back to polling
+MAX_CRAWL_STREAMS = 16
+crawl_stream_slots = threading.BoundedSemaphore(MAX_CRAWL_STREAMS)
+STREAM_MIN_INTERVAL = 0.25    # seconds between events - updates arriving faster are coalesced
+STREAM_HEARTBEAT = 2          # seconds - send stats even when no new rows arrived
+STREAM_MAX_DURATION = 300     # seconds - then close; EventSource reconnects from the last event id
+STREAM_BATCH_ROWS = 2000      # max rows per log in one event
+
+@app.route('/api/crawl_stream')
+@login_required
+def crawl_stream():
+    """Stream crawl status as Server-Sent Events carrying only the rows added since the last event"""
+    if not crawl_stream_slots.acquire(blocking=False):
+        return jsonify({'success': False, 'error': 'Too many open streams, poll /api/crawl_status instead'}), 503
+
+    try:
+        crawler = get_or_create_crawler()
+        settings_manager = get_session_settings()
+        exclusion_patterns_text = settings_manager.get_settings().get('issueExclusionPatterns', '')
+        exclusion_patterns = [p.strip() for p in exclusion_patterns_text.split('\n') if p.strip()]
+
+        # Cursors come from the query string, or from Last-Event-ID when EventSource reconnects
+        cursors = {
+            'generation': request.args.get('generation', type=int),
+            'urls': request.args.get('url_since', 0, type=int),
+            'links': request.args.get('link_since', 0, type=int),
+            'issues': request.args.get('issue_since', 0, type=int)
+        }
+        last_event_id = request.headers.get('Last-Event-ID', '')
+        try:
+            generation, url_since, link_since, issue_since = (int(part) for part in last_event_id.split(':'))
+            cursors = {'generation': generation, 'urls': url_since, 'links': link_since, 'issues': issue_since}
+        except ValueError:
+            pass
+
+        if session.pop('force_full_refresh', False):
+            cursors['generation'] = -1
+    except Exception:
+        crawl_stream_slots.release()
+        raise
+
+    def generate():
+        yield 'retry: 1000\n\n'
+        started = time.time()
+        while True:
+            # Read the version first so changes made while building the event wake the next wait
+            version = crawler.results_version
+            status_data = crawler.get_status_since(cursors['urls'], cursors['links'], cursors['issues'],
+                                                   cursors['generation'], limit=STREAM_BATCH_ROWS)
+            cursors.update(status_data['cursors'])
+
+            if crawler.base_url:
+                status_data['stats']['baseUrl'] = crawler.base_url
+            if status_data['issues']:
+                status_data['issues'] = filter_issues_by_exclusion_patterns(status_data['issues'], exclusion_patterns)
+
+            # A slow client blocks this yield once Waitress's output buffer is full, and
+            # the next event then carries everything that arrived in the meantime
+            event_id = f"{cursors['generation']}:{cursors['urls']}:{cursors['links']}:{cursors['issues']}"
+            yield f"id: {event_id}\nevent: status\ndata: {json.dumps(status_data, default=str)}\n\n"
+
+            if status_data['status'] != 'running' and not status_data['more']:
+                yield 'event: end\ndata: {}\n\n'
+                return
+            if time.time() - started > STREAM_MAX_DURATION:
+                return
+
+            time.sleep(STREAM_MIN_INTERVAL)
+            if not status_data['more']:
+                crawler.wait_for_results(version, STREAM_HEARTBEAT)
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    # Close runs when the stream ends or the client goes away, even before the first event
+    response.call_on_close(crawl_stream_slots.release)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @app.route('/api/visualization_data')
 @login_required
 def visualization_data():
     """Get graph data for site structure visualization"""
     try:
         crawler = get_or_create_crawler()
-        status_data = crawler.get_status()
-
-        # Get URLs from the status data
-        crawled_pages = status_data.get('urls', [])
-        all_links = status_data.get('links', [])
+        crawled_pages = crawler.crawl_results
 
         # Build nodes and edges for the graph
         nodes = []
@@ -831,29 +882,25 @@ def visualization_data():
             nodes.append(node)
             url_to_id[url] = f'node-{idx}'
 
-        # Create edges from links data
-        # Links are stored as: {'source_url': url, 'target_url': url, 'is_internal': bool, ...}
+        # Create edges from the internal links between visualized pages, read from the link graph
+        internal_links = crawler.link_manager.internal_links_between(url_to_id) if crawler.link_manager else []
         edges_set = set()  # Use set to avoid duplicate edges
-        for link in all_links:
-            if link.get('is_internal'):  # Only use internal links
-                source_url = link.get('source_url', '')
-                target_url = link.get('target_url', '')
-
-                source_id = url_to_id.get(source_url)
-                target_id = url_to_id.get(target_url)
-
-                if source_id and target_id and source_id != target_id:
-                    edge_key = f'{source_id}-{target_id}'
-                    if edge_key not in edges_set:
-                        edges_set.add(edge_key)
-                        edge = {
-                            'data': {
-                                'id': f'edge-{edge_key}',
-                                'source': source_id,
-                                'target': target_id
-                            }
+        for source_url, target_url in internal_links:
+            source_id = url_to_id.get(source_url)
+            target_id = url_to_id.get(target_url)
+
+            if source_id and target_id and source_id != target_id:
+                edge_key = f'{source_id}-{target_id}'
+                if edge_key not in edges_set:
+                    edges_set.add(edge_key)
+                    edge = {
+                        'data': {
+                            'id': f'edge-{edge_key}',
+                            'source': source_id,
+                            'target': target_id
                         }
-                        edges.append(edge)
+                    }
+                    edges.append(edge)
 
         return jsonify({
             'success': True,
@@ -879,8 +926,6 @@ def visualization_data():
 @login_required
 def debug_memory():
     """Debug endpoint showing memory stats for all active crawler instances"""
-    from src.core.memory_profiler import MemoryProfiler
-
     with instances_lock:
         memory_stats = {
             'total_instances': len(crawler_instances),
@@ -891,12 +936,8 @@ def debug_memory():
             crawler = instance_data['crawler']
             stats = crawler.memory_monitor.get_stats()
 
-            # Get accurate data sizes
-            data_sizes = MemoryProfiler.get_crawler_data_size(
-                crawler.crawl_results,
-                crawler.link_manager.all_links if crawler.link_manager else [],
-                crawler.issue_detector.detected_issues if crawler.issue_detector else []
-            )
+            # Cached, sampled data sizes
+            data_sizes = crawler.data_size.get_sizes()
 
             memory_stats['instances'].append({
                 'session_id': session_id[:8] + '...',  # Truncate for privacy
@@ -923,12 +964,8 @@ def debug_memory_profile():
             # Get object breakdown
             breakdown = MemoryProfiler.get_object_memory_breakdown()
 
-            # Get crawler-specific data sizes
-            data_sizes = MemoryProfiler.get_crawler_data_size(
-                crawler.crawl_results,
-                crawler.link_manager.all_links if crawler.link_manager else [],
-                crawler.issue_detector.detected_issues if crawler.issue_detector else []
-            )
+            # Get crawler-specific data sizes (cached, sampled)
+            data_sizes = crawler.data_size.get_sizes()
 
             profiles.append({
                 'session_id': session_id[:8] + '...',
@@ -1114,7 +1151,7 @@ def load_crawl_into_session(crawl_id):
 
         # Inject into current crawler instance
         with crawler.results_lock:
-            crawler.crawl_results = urls
+            crawler.crawl_results = ResultLog(urls, table=ResultStore())
             crawler.stats['crawled'] = len(urls)
             crawler.stats['discovered'] = len(urls)
             crawler.base_url = crawl['base_url']
@@ -1122,16 +1159,15 @@ def load_crawl_into_session(crawl_id):
 
         # Load links into link manager
         if crawler.link_manager:
-            crawler.link_manager.all_links = links
-            # Rebuild links_set
-            crawler.link_manager.links_set.clear()
-            for link in links:
-                link_key = f"{link['source_url']}|{link['target_url']}"
-                crawler.link_manager.links_set.add(link_key)
+            crawler.link_manager.load_links(links)
+            crawler.link_manager.update_link_statuses(urls)
 
         # Load issues into issue detector
         if crawler.issue_detector:
-            crawler.issue_detector.detected_issues = issues
+            crawler.issue_detector.detected_issues = ResultLog(issues)
+
+        # Status cursors into the previous results no longer apply
+        crawler.new_results_generation()
 
         # Set Flask session flag for force full refresh
         session['force_full_refresh'] = True
@@ -1173,6 +1209,28 @@ def resume_crawl_endpoint(crawl_id):
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/crawls/<int:crawl_id>/recrawl', methods=['POST'])
+@login_required
+def recrawl_endpoint(crawl_id):
+    """Refresh a previous crawl into a new crawl, reusing pages that have not changed"""
+    try:
+        user_id = session.get('user_id')
+        session_id = session.get('session_id')
+
+        # Get crawler for this session
+        crawler = get_or_create_crawler()
+
+        success, message = crawler.recrawl_from_database(crawl_id, user_id=user_id, session_id=session_id)
+
+        if success:
+            session['current_crawl_id'] = crawler.crawl_id
+
+        return jsonify({'success': success, 'message': message, 'crawl_id': crawler.crawl_id if success else None})
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/api/crawls/<int:crawl_id>/delete', methods=['DELETE'])
 @login_required
 def delete_crawl_endpoint(crawl_id):
@@ -1221,22 +1279,20 @@ def crawl_stats():
     """Get statistics about user's crawls"""
     try:
         user_id = session.get('user_id')
-        from src.crawl_db import get_crawl_count, get_database_size_mb
-        import sqlite3
+        from src.crawl_db import get_crawl_count, get_database_size_mb, get_db
 
         # Get counts by status
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
+        with get_db() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT status, COUNT(*) as count
-            FROM crawls
-            WHERE user_id = ?
-            GROUP BY status
-        ''', (user_id,))
+            cursor.execute('''
+                SELECT status, COUNT(*) as count
+                FROM crawls
+                WHERE user_id = ?
+                GROUP BY status
+            ''', (user_id,))
 
-        status_counts = {row[0]: row[1] for row in cursor.fetchall()}
-        conn.close()
+            status_counts = {row[0]: row[1] for row in cursor.fetchall()}
 
         return jsonify({
             'success': True,
@@ -1261,24 +1317,22 @@ def export_data():
             urls = local_data.get('urls', [])
             links = local_data.get('links', [])
             issues = local_data.get('issues', [])
+            status_index = build_status_index(urls)
         else:
-            # Get current crawl results
+            # Get current crawl results. Links are read through the link graph, which fills in
+            # each link's target status as it is read
             crawler = get_or_create_crawler()
-            crawl_data = crawler.get_status()
-            urls = crawl_data.get('urls', [])
-            links = crawl_data.get('links', [])
-            issues = crawl_data.get('issues', [])
+            urls = crawler.crawl_results.copy()
+            links = crawler.link_manager.all_links if crawler.link_manager else []
+            issues = crawler.issue_detector.get_issues() if crawler.issue_detector else []
+            status_index = None
 
         if not urls:
             return jsonify({'success': False, 'error': 'No data to export'})
 
         # Update link statuses from crawled URLs (fixes missing status codes in exports)
-        if links and urls:
-            status_lookup = {url_data['url']: url_data.get('status_code') for url_data in urls}
-            for link in links:
-                target_url = link.get('target_url')
-                if target_url in status_lookup:
-                    link['target_status'] = status_lookup[target_url]
+        if links and status_index is not None:
+            apply_link_statuses(links, status_index)
 
         # Apply current issue exclusion patterns (works for loaded crawls too)
         if issues:
@@ -1435,7 +1489,7 @@ def graceful_shutdown(signum, frame):
                 if crawler.is_running and crawler.crawl_id and crawler.db_save_enabled:
                     print(f"  → Saving crawl {crawler.crawl_id}...")
                     try:
-                        crawler._save_batch_to_db(force=True)
+                        crawler.flush_persistence()
                         crawler._save_queue_checkpoint()
                         from src.crawl_db import set_crawl_status
                         set_crawl_status(crawler.crawl_id, 'paused')
@@ -1487,7 +1541,7 @@ def main():
     from waitress import serve
     print("Starting LibreCrawl on http://localhost:5000")
     print("Using Waitress WSGI server with multi-threading support")
-    serve(app, host='0.0.0.0', port=5000, threads=8)
+    serve(app, host='0.0.0.0', port=5000, threads=8 + MAX_CRAWL_STREAMS)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""Asyncio HTTP fetch engine using a single event loop and a bounded connection pool"""
+import asyncio
+import aiohttp
+
+
+class AsyncFetcher:
+    """
+    Fetches pages with aiohttp on one event loop.
+    Keeps many requests in flight over a bounded, keep-alive connection pool
+    instead of tying up one OS thread per request.
+    """
+
+    def __init__(self, config, headers=None):
+        self.config = config
+        self.headers = {k: v for k, v in (headers or {}).items() if k.lower() != 'connection'}
+        self.session = None
+        self.initialized = False
+
+    async def initialize(self):
+        """Create the shared client session and connection pool"""
+        if self.initialized:
+            return
+
+        max_connections = self.config.get('async_max_connections', 100)
+        connector = aiohttp.TCPConnector(
+            limit=max_connections,
+            limit_per_host=self.config.get('async_max_per_host', 0),
+            ttl_dns_cache=300
+        )
+
+        # Mirror the requests.Session cookie behaviour
+        cookie_jar = aiohttp.CookieJar(unsafe=True)
+        if not self.config.get('allow_cookies', True):
+            cookie_jar = aiohttp.DummyCookieJar()
+
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            cookie_jar=cookie_jar,
+            timeout=aiohttp.ClientTimeout(total=self.config.get('timeout', 10))
+        )
+        self.initialized = True
+        print(f"Async fetch engine initialized with {max_connections} connections")
+
+    async def cleanup(self):
+        """Close the client session and its pooled connections"""
+        try:
+            if self.session:
+                await self.session.close()
+                self.session = None
+            self.initialized = False
+        except Exception as e:
+            print(f"Error during async fetcher cleanup: {e}")
+
+    async def fetch(self, url, headers=None):
+        """
+        Fetch a URL with retries.
+
+        Args:
+            url: URL to fetch
+            headers: Extra request headers (e.g., conditional GET validators)
+
+        Returns:
+            tuple: (status_code, headers, content_bytes, text, error_message)
+        """
+        if not self.initialized:
+            return 0, {}, b'', '', "Async fetch engine not initialized"
+
+        retries = self.config.get('retries', 3)
+        max_file_size = self.config.get('max_file_size', 0)
+        proxy = self.config.get('proxy_url') if self.config.get('enable_proxy') else None
+
+        for attempt in range(retries + 1):
+            try:
+                async with self.session.get(
+                    url,
+                    headers=headers,
+                    allow_redirects=self.config.get('follow_redirects', True),
+                    proxy=proxy
+                ) as response:
+                    response_headers = {k.lower(): v for k, v in response.headers.items()}
+
+                    # Check file size before downloading the body
+                    content_length = response.content_length
+                    if max_file_size > 0 and content_length and content_length > max_file_size:
+                        return response.status, response_headers, b'', '', f'File too large: {content_length} bytes'
+
+                    content = await response.read()
+                    encoding = response.get_encoding() if content else 'utf-8'
+                    try:
+                        text = content.decode(encoding, errors='replace')
+                    except LookupError:
+                        text = content.decode('utf-8', errors='replace')
+
+                    return response.status, response_headers, content, text, None
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= retries:
+                    return 0, {}, b'', '', str(e) or e.__class__.__name__
+                await asyncio.sleep(1)
+
+        return 0, {}, b'', '', 'Fetch failed'
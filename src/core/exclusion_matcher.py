@@ -0,0 +1,73 @@
+"""Compiled issue exclusion patterns, shared by issue detection, the issues API and exports"""
+import os
+import re
+from fnmatch import translate
+from functools import lru_cache
+from urllib.parse import urlparse
+
+URL_MEMO_SIZE = 65536  # URLs whose exclusion result each matcher remembers
+MATCHER_CACHE_SIZE = 32  # Compiled pattern lists kept by get_exclusion_matcher
+
+# fnmatch compares normcased paths - on POSIX that changes nothing, so "prefix*" globs are plain prefixes
+_NORMCASE_IS_IDENTITY = os.path.normcase('A/b') == 'A/b'
+
+
+class ExclusionMatcher:
+    """
+    Issue exclusion patterns compiled once, checked against a URL's path.
+
+    A pattern containing '*' is a glob (fnmatch) on the whole path; any other pattern is a path
+    prefix. Blank patterns and '#' comments are ignored. Prefixes, including globs whose only
+    wildcard is a trailing '*', are checked with a single str.startswith over a tuple; the other
+    globs are combined into one regex. Results are memoized per URL.
+    """
+
+    def __init__(self, patterns):
+        """
+        Initialize exclusion matcher.
+
+        Args:
+            patterns: Exclusion patterns, e.g. the issue_exclusion_patterns setting
+        """
+        self.patterns = tuple(patterns)
+
+        prefixes = []
+        globs = []
+        for pattern in self.patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith('#'):
+                continue
+            if '*' not in pattern:
+                prefixes.append(pattern)
+            elif _NORMCASE_IS_IDENTITY and pattern.endswith('*') and not re.search(r'[*?\[]', pattern[:-1]):
+                prefixes.append(pattern[:-1])
+            else:
+                globs.append(translate(os.path.normcase(pattern)))
+
+        self.prefixes = tuple(prefixes)
+        self.glob_regex = re.compile('|'.join(globs)) if globs else None
+        self.excludes = lru_cache(maxsize=URL_MEMO_SIZE)(self._excludes)
+
+    def _excludes(self, url):
+        """Whether issues for this URL are excluded"""
+        path = urlparse(url).path
+        if path.startswith(self.prefixes):
+            return True
+        return bool(self.glob_regex and self.glob_regex.match(os.path.normcase(path)))
+
+    def filter_issues(self, issues):
+        """Issues whose URL is not excluded"""
+        if not self.prefixes and not self.glob_regex:
+            return issues
+        excludes = self.excludes
+        return [issue for issue in issues if not excludes(issue.get('url', ''))]
+
+
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def _cached_matcher(patterns):
+    return ExclusionMatcher(patterns)
+
+
+def get_exclusion_matcher(patterns):
+    """Shared compiled matcher for a list of exclusion patterns (compiled on first use)"""
+    return _cached_matcher(tuple(patterns or ()))
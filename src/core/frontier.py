@@ -0,0 +1,127 @@
+"""Crawl frontier that keeps a bounded window of queued URLs in memory and spills the rest to disk"""
+import os
+import pickle
+import shutil
+import tempfile
+from collections import deque
+
+
+class Frontier:
+    """
+    FIFO queue of (url, depth) entries with bounded memory.
+
+    Entries are popped from an in-memory head window and pushed onto an in-memory tail.
+    Once the tail reaches segment_size it is written out as a segment file, so the queue
+    order is head -> segment files (oldest first) -> tail. When the head runs dry the
+    oldest segment is read back in. Push and pop are O(1) amortised, and at most
+    window + segment_size entries are held in memory however long the queue gets.
+
+    Supports the deque operations LinkManager uses (append, popleft, len, bool, clear).
+    Not thread-safe - LinkManager guards it with urls_lock.
+    """
+
+    def __init__(self, window=100000, segment_size=50000, spill_dir=None, track_changes=False):
+        """
+        Initialize frontier.
+
+        Args:
+            window: Entries kept in memory before new entries start going to disk
+            segment_size: Entries per segment file
+            spill_dir: Parent directory for segment files (default: system temp dir)
+            track_changes: Record pushed entries so they can be persisted (see take_pushed)
+        """
+        self.window = max(1, window)
+        self.segment_size = max(1, segment_size)
+        self.spill_dir = spill_dir
+
+        self.head = deque()
+        self.tail = []
+        self.segments = deque()  # (path, entry_count), oldest first
+        self.segment_dir = None
+        self.segment_counter = 0
+        self.length = 0
+
+        self.pushed = [] if track_changes else None
+
+    def append(self, entry):
+        """Push an entry onto the back of the queue"""
+        if self.pushed is not None:
+            self.pushed.append(entry)
+
+        self.length += 1
+        if not self.segments and not self.tail and len(self.head) < self.window:
+            self.head.append(entry)
+            return
+
+        self.tail.append(entry)
+        if len(self.tail) >= self.segment_size:
+            self._spill_tail()
+
+    def popleft(self):
+        """Pop the entry at the front of the queue"""
+        if not self.head:
+            self._refill_head()
+            if not self.head:
+                raise IndexError('pop from an empty frontier')
+
+        self.length -= 1
+        return self.head.popleft()
+
+    def _spill_tail(self):
+        """Write the tail out as the newest segment file"""
+        if self.segment_dir is None:
+            self.segment_dir = tempfile.mkdtemp(prefix='librecrawl-frontier-', dir=self.spill_dir)
+
+        self.segment_counter += 1
+        path = os.path.join(self.segment_dir, f"segment-{self.segment_counter:08d}.pkl")
+        with open(path, 'wb') as f:
+            pickle.dump(self.tail, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self.segments.append((path, len(self.tail)))
+        self.tail = []
+
+    def _refill_head(self):
+        """Move the next entries in queue order into the head window"""
+        if self.segments:
+            path, _ = self.segments.popleft()
+            with open(path, 'rb') as f:
+                self.head.extend(pickle.load(f))
+            os.remove(path)
+        elif self.tail:
+            self.head.extend(self.tail)
+            self.tail = []
+
+    def take_pushed(self):
+        """Entries pushed since the last call (only when track_changes is on)"""
+        pushed = self.pushed or []
+        if self.pushed is not None:
+            self.pushed = []
+        return pushed
+
+    def stats(self):
+        """Where the queued entries currently live"""
+        return {
+            'pending': self.length,
+            'in_memory': len(self.head) + len(self.tail),
+            'on_disk': sum(count for _, count in self.segments),
+            'segments': len(self.segments)
+        }
+
+    def __len__(self):
+        return self.length
+
+    def __bool__(self):
+        return self.length > 0
+
+    def clear(self):
+        """Drop all entries and delete the segment files"""
+        self.head.clear()
+        self.tail = []
+        self.segments.clear()
+        self.length = 0
+        if self.pushed is not None:
+            self.pushed = []
+
+        if self.segment_dir:
+            shutil.rmtree(self.segment_dir, ignore_errors=True)
+            self.segment_dir = None
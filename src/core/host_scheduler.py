@@ -0,0 +1,183 @@
+"""Per-host politeness scheduler with separate token buckets and concurrency limits"""
+import time
+import threading
+from collections import deque
+from urllib.parse import urlparse
+
+
+class _HostState:
+    """Queue, token bucket and in-flight count for a single host"""
+
+    __slots__ = ('queue', 'tokens', 'last_refill', 'active')
+
+    def __init__(self, now):
+        self.queue = deque()
+        self.tokens = 1.0
+        self.last_refill = now
+        self.active = 0
+
+
+class HostScheduler:
+    """
+    Hands out the next URL whose host is ready to be fetched.
+
+    Every host gets its own token bucket (refilled at the configured rate, or slower
+    if robots.txt asks for a Crawl-delay) and its own concurrency limit, so one slow
+    host never throttles the others and total throughput scales with the number of hosts.
+    """
+
+    def __init__(self, fetch_next, requests_per_second=1.0, max_per_host=0,
+                 crawl_delay_lookup=None, buffer_size=1000, max_buffer_size=20000):
+        """
+        Initialize scheduler.
+
+        Args:
+            fetch_next: Callable returning the next (url, depth) from the crawl queue, or None
+            requests_per_second: Per-host request rate (e.g., 1.0 = 1 req/sec per host)
+            max_per_host: Maximum in-flight requests per host (0 = no per-host limit)
+            crawl_delay_lookup: Callable(origin) returning a robots.txt Crawl-delay in seconds, or None
+            buffer_size: URLs pulled from the crawl queue ahead of dispatch
+            max_buffer_size: Upper bound on buffered URLs when no host is ready
+        """
+        self.fetch_next = fetch_next
+        self.crawl_delay_lookup = crawl_delay_lookup
+        self.max_per_host = max_per_host
+        self.buffer_size = buffer_size
+        self.max_buffer_size = max_buffer_size
+
+        self.requests_per_second = max(0.01, requests_per_second)
+        self.min_interval = 1.0 / self.requests_per_second
+
+        self.hosts = {}
+        self.rotation = deque()  # Hosts with queued URLs, in round-robin order
+        self.url_hosts = {}  # In-flight url -> origin
+        self.buffered = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_origin(url):
+        """Get the scheme://host key used for per-host state"""
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def update_rate(self, requests_per_second):
+        """Update the per-host rate limit dynamically"""
+        with self.lock:
+            self.requests_per_second = max(0.01, requests_per_second)
+            self.min_interval = 1.0 / self.requests_per_second
+
+    def _host_interval(self, origin):
+        """Seconds between requests to a host, honoring robots.txt Crawl-delay"""
+        interval = self.min_interval
+        if self.crawl_delay_lookup:
+            crawl_delay = self.crawl_delay_lookup(origin)
+            if crawl_delay:
+                interval = max(interval, float(crawl_delay))
+        return interval
+
+    def _refill(self, state, origin, now):
+        """Add tokens earned since the last refill (bucket capacity is one request)"""
+        interval = self._host_interval(origin)
+        if interval <= 0:
+            state.tokens = 1.0
+        else:
+            state.tokens = min(1.0, state.tokens + max(0.0, now - state.last_refill) / interval)
+        state.last_refill = max(state.last_refill, now)
+        return interval
+
+    def _enqueue(self, url, depth):
+        """Queue a URL on its host (lock must be held)"""
+        origin = self.get_origin(url)
+        state = self.hosts.get(origin)
+        if state is None:
+            state = _HostState(time.time())
+            self.hosts[origin] = state
+        if not state.queue:
+            self.rotation.append(origin)
+        state.queue.append((url, depth))
+        self.buffered += 1
+
+    def _pull(self, limit):
+        """Move URLs from the crawl queue into per-host queues (lock must be held)"""
+        while self.buffered < limit:
+            url_info = self.fetch_next()
+            if not url_info:
+                return False
+            self._enqueue(*url_info)
+        return True
+
+    def _pop_ready(self, now):
+        """Pop a URL from the first ready host in round-robin order (lock must be held)"""
+        for _ in range(len(self.rotation)):
+            origin = self.rotation[0]
+            self.rotation.rotate(-1)
+            state = self.hosts[origin]
+
+            if self.max_per_host and state.active >= self.max_per_host:
+                continue
+
+            self._refill(state, origin, now)
+            if state.tokens < 1.0:
+                continue
+
+            state.tokens -= 1.0
+            state.active += 1
+            url, depth = state.queue.popleft()
+            self.buffered -= 1
+            if not state.queue:
+                self.rotation.remove(origin)
+            self.url_hosts[url] = origin
+            return url, depth
+        return None
+
+    def next_url(self):
+        """
+        Get the next URL whose host is ready.
+
+        Returns:
+            tuple: (url, depth), or None if no host is ready right now
+        """
+        with self.lock:
+            now = time.time()
+            self._pull(self.buffer_size)
+            url_info = self._pop_ready(now)
+
+            # Every buffered host is busy or cooling down - look further ahead in the queue
+            while url_info is None and self.buffered < self.max_buffer_size:
+                if not self._pull(min(self.buffered + self.buffer_size, self.max_buffer_size)):
+                    break
+                url_info = self._pop_ready(now)
+
+            return url_info
+
+    def release(self, url):
+        """Mark a dispatched URL as finished, freeing its host's concurrency slot"""
+        with self.lock:
+            origin = self.url_hosts.pop(url, None)
+            if origin and origin in self.hosts:
+                self.hosts[origin].active = max(0, self.hosts[origin].active - 1)
+
+    def time_until_ready(self):
+        """Seconds until some queued host can be dispatched (None if no host is waiting on its bucket)"""
+        with self.lock:
+            now = time.time()
+            wait_times = []
+            for origin in self.rotation:
+                state = self.hosts[origin]
+                if self.max_per_host and state.active >= self.max_per_host:
+                    continue
+                interval = self._refill(state, origin, now)
+                wait_times.append(max(0.0, (1.0 - state.tokens) * interval))
+            return min(wait_times) if wait_times else None
+
+    def pending_count(self):
+        """Number of URLs buffered in per-host queues (lock-free read)"""
+        return self.buffered
+
+    def reset(self):
+        """Reset all state"""
+        with self.lock:
+            self.hosts.clear()
+            self.rotation.clear()
+            self.url_hosts.clear()
+            self.buffered = 0
@@ -0,0 +1,171 @@
+"""Parsed HTML documents behind a small adapter interface, so extraction can run on any parser backend"""
+from bs4 import BeautifulSoup, FeatureNotFound, Tag
+from bs4.dammit import UnicodeDammit
+
+# Parser backends selectable with the parser_backend setting
+PARSER_BACKENDS = ('html.parser', 'lxml', 'selectolax')
+
+# Elements whose text is not page content (matches BeautifulSoup's string containers)
+NON_CONTENT_ELEMENTS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+# Elements whose whitespace-only text is kept as-is
+PREFORMATTED_ELEMENTS = frozenset(['pre', 'textarea'])
+
+ASCII_WHITESPACE = ' \n\t\x0c\r'
+
+# Attributes that are always exposed as lists of whitespace-separated values
+LIST_ATTRIBUTES = frozenset(['class', 'rel'])
+
+# Backends that failed to import, so the fallback warning is only printed once
+_missing_backends = set()
+
+
+class SoupDocument:
+    """
+    Document parsed by BeautifulSoup (html.parser or lxml tree builder).
+
+    Adapter interface shared by every backend:
+        root_key: Key of the document root (parent_key of top-level elements)
+        events(): Yields content text as str, and every element in document order as
+                  (name, attrs, key, parent_key, node); class/rel attrs are lists
+        get_text(node): Content text of an element's subtree
+        get_string(node): The element's only text child, or None
+    """
+
+    def __init__(self, soup):
+        self.soup = soup
+        self.root_key = id(soup)
+
+    @classmethod
+    def parse(cls, content, parser='html.parser'):
+        return cls(BeautifulSoup(content, parser))
+
+    def events(self):
+        text_types = self.soup.interesting_string_types
+        for node in self.soup.descendants:
+            node_type = type(node)
+            if node_type in text_types:
+                yield node
+            elif node_type is Tag or isinstance(node, Tag):
+                yield node.name, node.attrs, id(node), id(node.parent), node
+
+    @staticmethod
+    def get_text(node):
+        return node.get_text()
+
+    @staticmethod
+    def get_string(node):
+        return node.string
+
+
+class LexborDocument:
+    """Document parsed by selectolax's lexbor engine (see SoupDocument for the interface)"""
+
+    def __init__(self, tree):
+        self.tree = tree
+        root = tree.root
+        self.root_key = root.parent.mem_id if root is not None and root.parent is not None else 0
+
+    @classmethod
+    def parse(cls, content):
+        from selectolax.lexbor import LexborHTMLParser
+
+        # Decode bytes the same way BeautifulSoup does (BOM, <meta charset>, then fallbacks)
+        if isinstance(content, bytes):
+            content = UnicodeDammit(content, is_html=True).unicode_markup or ''
+        return cls(LexborHTMLParser(content))
+
+    def events(self):
+        root = self.tree.root
+        if root is None:
+            return
+
+        excluded = set()  # mem_ids of elements inside non-content elements
+        preformatted = set()  # mem_ids of elements inside <pre>/<textarea>
+        for node in root.traverse(include_text=True):
+            tag = node.tag
+            parent = node.parent
+            parent_key = parent.mem_id if parent is not None else self.root_key
+
+            if tag == '-text':
+                if parent_key not in excluded:
+                    yield self._text_value(node, parent_key in preformatted)
+                continue
+            if tag[0] in '-_!':
+                continue  # Comments, doctype and other non-element nodes
+
+            key = node.mem_id
+            if tag in NON_CONTENT_ELEMENTS or parent_key in excluded:
+                excluded.add(key)
+            if tag in PREFORMATTED_ELEMENTS or parent_key in preformatted:
+                preformatted.add(key)
+            yield tag, self._normalize_attrs(node.attributes), key, parent_key, node
+
+    @staticmethod
+    def _text_value(node, preformatted):
+        """Text of a text node; whitespace-only runs collapse to one character, as in BeautifulSoup"""
+        text = node.text_content or ''
+        if not preformatted and text and not text.strip(ASCII_WHITESPACE):
+            return '\n' if '\n' in text else ' '
+        return text
+
+    @staticmethod
+    def _normalize_attrs(attributes):
+        """Valueless attributes become '' and class/rel become lists, as in BeautifulSoup"""
+        attrs = {}
+        for name, value in attributes.items():
+            if value is None:
+                value = ''
+            if name in LIST_ATTRIBUTES:
+                value = value.split()
+            attrs[name] = value
+        return attrs
+
+    @classmethod
+    def get_text(cls, node):
+        parts = []
+        excluded = set()
+        preformatted = set()
+        for child in node.traverse(include_text=True):
+            tag = child.tag
+            parent_key = child.parent.mem_id if child.parent is not None else None
+            if tag == '-text':
+                if parent_key not in excluded:
+                    parts.append(cls._text_value(child, parent_key in preformatted))
+            elif tag[0] not in '-_!':
+                if tag in NON_CONTENT_ELEMENTS or parent_key in excluded:
+                    excluded.add(child.mem_id)
+                if tag in PREFORMATTED_ELEMENTS or parent_key in preformatted:
+                    preformatted.add(child.mem_id)
+        return ''.join(parts)
+
+    @staticmethod
+    def get_string(node):
+        children = list(node.iter(include_text=True))
+        if len(children) == 1 and children[0].tag == '-text':
+            return children[0].text_content
+        return None
+
+
+def parse_html(content, backend='html.parser'):
+    """
+    Parse an HTML page with the chosen backend.
+
+    Args:
+        content: Page body as bytes or str
+        backend: One of PARSER_BACKENDS; falls back to html.parser if the backend is unavailable
+
+    Returns:
+        SoupDocument or LexborDocument
+    """
+    if backend not in _missing_backends:
+        try:
+            if backend == 'selectolax':
+                return LexborDocument.parse(content)
+            if backend == 'lxml':
+                return SoupDocument.parse(content, 'lxml')
+        except (ImportError, FeatureNotFound):
+            _missing_backends.add(backend)
+            print(f"Parser backend '{backend}' is not installed, falling back to html.parser")
+
+    return SoupDocument.parse(content, 'html.parser')
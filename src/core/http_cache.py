@@ -0,0 +1,153 @@
+"""Conditional GET cache so recrawls only download and parse pages that changed"""
+import hashlib
+import threading
+
+from src.core.seo_extractor import SEOExtractor, NAMED_META_FIELDS
+
+
+class HttpCache:
+    """
+    Per-URL ETag / Last-Modified validators and content hashes, stored in the http_cache table
+    under the owner (user, or session for guests) of the crawl that recorded them.
+
+    Entries are recorded for every crawl saved to the database. With revalidation on, the
+    validators are sent as If-None-Match / If-Modified-Since. When the server answers 304 (or
+    returns a body with the same content hash) the page is rebuilt from the crawled_urls row
+    and links of the crawl that last fetched it, instead of being parsed again, and those rows
+    are copied into the current crawl inside the database.
+    """
+
+    def __init__(self, crawl_id, revalidate=True):
+        self.crawl_id = crawl_id
+        self.revalidate = revalidate
+        self.pending_entries = []  # Saved together with the next URL batch
+        self.pending_copies = []  # Unchanged pages to copy from their stored crawl
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(content):
+        """Hash of a response body"""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        return hashlib.sha1(content).hexdigest()
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Request headers that make the server answer 304 if the page is unchanged"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def lookup(self, url):
+        """Get the cache entry for a URL, or None if it has no reusable copy"""
+        if not self.revalidate:
+            return None
+
+        from src.crawl_db import get_http_cache_entry
+        return get_http_cache_entry(self.crawl_id, url)
+
+    def is_unchanged(self, entry, status_code, content):
+        """Check whether a response shows the cached copy is still current"""
+        if not entry:
+            return False
+        if status_code == 304:
+            return True
+        return status_code == 200 and bool(content) and self.content_hash(content) == entry.get('content_hash')
+
+    def load_page(self, entry, depth):
+        """
+        Rebuild a page from its stored crawl.
+
+        Returns:
+            tuple: (result, link_records, content signature or None), or None if the stored copy is gone
+        """
+        from src.crawl_db import load_cached_page
+
+        cached = load_cached_page(entry['url_row_id'])
+        if not cached:
+            return None
+
+        url_data, links = cached
+        result = SEOExtractor.create_result(url_data['url'], depth)
+        for key in result:
+            if key in url_data and url_data[key] is not None:
+                result[key] = url_data[key]
+
+        result['is_internal'] = bool(result['is_internal'])
+        if url_data.get('javascript_rendered'):
+            result['javascript_rendered'] = True
+
+        # Fields that are not stored in their own column come from meta_tags
+        for name, field in NAMED_META_FIELDS.items():
+            if name in result['meta_tags']:
+                result[field] = result['meta_tags'][name]
+
+        link_records = [
+            (link['target_url'], link['target_domain'] or '', link['anchor_text'] or '', link['placement'] or 'body')
+            for link in links
+        ]
+        return result, link_records, url_data.get('content_signature')
+
+    def record(self, url, response_headers, content_hash, previous=None):
+        """Queue a cache entry for a fetched page (validators fall back to the previous entry's)"""
+        previous = previous or {}
+        entry = {
+            'url': url,
+            'etag': response_headers.get('etag') or previous.get('etag'),
+            'last_modified': response_headers.get('last-modified') or previous.get('last_modified'),
+            'content_hash': content_hash
+        }
+        with self.lock:
+            self.pending_entries.append(entry)
+
+    def queue_copy(self, entry, result):
+        """Queue an unchanged page's stored URL row and links to be copied into this crawl"""
+        copy = {
+            'url': result['url'],
+            'url_row_id': entry['url_row_id'],
+            'depth': result['depth'],
+            'response_time': result['response_time'],
+            'linked_from': result.get('linked_from', [])
+        }
+        with self.lock:
+            self.pending_copies.append(copy)
+
+    def pending_copy_urls(self):
+        """URLs of unchanged pages not copied into this crawl yet - their queue rows must stay"""
+        with self.lock:
+            return set(copy['url'] for copy in self.pending_copies)
+
+    def flush(self):
+        """
+        Save queued copies and cache entries (call after the matching URL batch is saved).
+        Anything that fails to save stays queued for the next flush.
+
+        Returns:
+            bool: True if everything queued was saved
+        """
+        from src.crawl_db import copy_reused_pages, save_http_cache_batch
+
+        with self.lock:
+            copies = self.pending_copies
+            entries = self.pending_entries
+            self.pending_copies = []
+            self.pending_entries = []
+
+        # Copies first - entries of reused pages point at the copied rows. Each copy also
+        # removes the page's crawl_queue row, in the same transaction
+        saved = True
+        if copies and not copy_reused_pages(self.crawl_id, copies):
+            with self.lock:
+                self.pending_copies = copies + self.pending_copies
+            saved = False
+
+        if entries and not save_http_cache_batch(self.crawl_id, entries):
+            # Keep them for the next save attempt
+            with self.lock:
+                self.pending_entries = entries + self.pending_entries
+            saved = False
+        return saved
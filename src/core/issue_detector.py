@@ -1,8 +1,9 @@
 """SEO issue detection and reporting"""
 import threading
-from fnmatch import fnmatch
-from urllib.parse import urlparse
-from difflib import SequenceMatcher
+
+from src.core.exclusion_matcher import get_exclusion_matcher
+from src.core.near_duplicates import DuplicateIndex
+from src.core.result_log import ResultLog
 
 
 class IssueDetector:
@@ -10,17 +11,36 @@ class IssueDetector:
 
     def __init__(self, exclusion_patterns=None):
         self.exclusion_patterns = exclusion_patterns or []
-        self.detected_issues = []
+        self.exclusion_matcher = get_exclusion_matcher(self.exclusion_patterns)
+        self.detected_issues = ResultLog()
         self.issues_lock = threading.Lock()
+        self.duplicate_index = DuplicateIndex()  # Content signatures of the pages checked for duplicates
 
     def detect_issues(self, result):
         """Detect SEO issues for a crawled URL"""
+        self.add_issues(self.find_issues(result))
+
+    def add_issues(self, issues):
+        """Add issues found by find_issues (possibly in another process) to the detected list"""
+        if not issues:
+            return
+        with self.issues_lock:
+            self.detected_issues.extend(issues)
+
+    def find_issues(self, result):
+        """
+        Find SEO issues for a crawled URL without recording them.
+        Pure function of the result, so it can run in a worker process.
+
+        Returns:
+            list: Issue dicts (empty if the URL matches an exclusion pattern)
+        """
         url = result.get('url', '')
         issues = []
 
         # Skip if URL matches exclusion patterns
         if self._should_exclude(url):
-            return
+            return issues
 
         # Critical SEO Issues
         self._check_title_issues(result, issues)
@@ -35,9 +55,7 @@ class IssueDetector:
         self._check_performance_issues(result, issues)
         self._check_indexability_issues(result, issues)
 
-        # Add all detected issues
-        with self.issues_lock:
-            self.detected_issues.extend(issues)
+        return issues
 
     def _check_title_issues(self, result, issues):
         """Check for title-related issues"""
@@ -311,137 +329,68 @@ class IssueDetector:
                 'details': 'Links on this page are NOT followed by search engines - has nofollow directive'
             })
 
-    def detect_duplication_issues(self, all_results, similarity_threshold=0.85):
+    def find_duplication_issues(self, result, signature=None, similarity_threshold=0.85):
         """
-        Detect content duplication across all crawled pages.
+        Probe a crawled page for near-duplicates among the pages checked so far, and index it
+        for the pages after it (see DuplicateIndex).
 
         Args:
-            all_results: List of all crawled result dictionaries
+            result: The page's result dictionary
+            signature: The page's content signature (see near_duplicates.content_signature); pages
+                       without one are left out, as nothing else compares with body text signatures
             similarity_threshold: Minimum similarity ratio to flag as duplicate (0.0-1.0)
+
+        Returns:
+            list: Duplication issues for the page, and for earlier pages it is the first duplicate of -
+                  every page of a duplicate cluster gets one issue, when it joins the cluster
         """
+        url = result.get('url', '')
+        if signature is None or self._should_exclude(url):
+            return []
+
         issues = []
-        processed_pairs = set()
-
-        # Compare each result with all others
-        for i, result1 in enumerate(all_results):
-            url1 = result1.get('url', '')
-
-            # Skip if URL should be excluded
-            if self._should_exclude(url1):
-                continue
-
-            for j, result2 in enumerate(all_results):
-                # Skip same URL or already processed pairs
-                if i >= j:
-                    continue
-
-                url2 = result2.get('url', '')
-
-                # Skip if URL should be excluded
-                if self._should_exclude(url2):
-                    continue
-
-                # Create unique pair identifier
-                pair_key = tuple(sorted([url1, url2]))
-                if pair_key in processed_pairs:
-                    continue
-
-                processed_pairs.add(pair_key)
-
-                # Calculate similarity
-                similarity = self._calculate_content_similarity(result1, result2)
-
-                # Flag as duplicate if above threshold
-                if similarity >= similarity_threshold:
-                    # Add issue for both URLs
-                    issues.append({
-                        'url': url1,
-                        'type': 'warning',
-                        'category': 'Duplication',
-                        'issue': 'Duplicate Content Detected',
-                        'details': f'Content is {similarity*100:.1f}% similar to {url2}'
-                    })
-                    issues.append({
-                        'url': url2,
-                        'type': 'warning',
-                        'category': 'Duplication',
-                        'issue': 'Duplicate Content Detected',
-                        'details': f'Content is {similarity*100:.1f}% similar to {url1}'
-                    })
-
-        # Add all detected duplication issues
-        with self.issues_lock:
-            self.detected_issues.extend(issues)
+        for page_url, other_count, other_urls, similarity in self.duplicate_index.add(url, signature,
+                                                                                      similarity_threshold):
+            listed = ', '.join(other_urls)
+            if other_count > len(other_urls):
+                listed += f' and {other_count - len(other_urls)} more'
+            issues.append({
+                'url': page_url,
+                'type': 'warning',
+                'category': 'Duplication',
+                'issue': 'Duplicate Content Detected',
+                'details': f'Content is {similarity*100:.1f}% similar to {other_count} other '
+                           f'page{"s" if other_count > 1 else ""}: {listed}'
+            })
+        return issues
 
-    def _calculate_content_similarity(self, result1, result2):
+    def detect_duplication_issues(self, all_results, signatures, similarity_threshold=0.85, report=True):
         """
-        Calculate similarity between two page results.
+        Detect content duplication across crawled pages that were not checked as they were
+        crawled (see find_duplication_issues), e.g. pages loaded from a saved crawl.
 
-        Compares title, meta description, h1, and content length.
-        Returns a similarity ratio between 0.0 and 1.0.
+        Args:
+            all_results: List of crawled result dictionaries
+            signatures: Dict of URL -> stored content signature; pages without one are skipped
+            similarity_threshold: Minimum similarity ratio to flag as duplicate (0.0-1.0)
+            report: Add the issues found; False only indexes the pages, for results whose
+                    duplication issues were already reported (e.g. loaded with them)
         """
-        # Extract content fields
-        title1 = result1.get('title', '').lower().strip()
-        title2 = result2.get('title', '').lower().strip()
-
-        desc1 = result1.get('meta_description', '').lower().strip()
-        desc2 = result2.get('meta_description', '').lower().strip()
-
-        h1_1 = result1.get('h1', '').lower().strip()
-        h1_2 = result2.get('h1', '').lower().strip()
-
-        word_count1 = result1.get('word_count', 0)
-        word_count2 = result2.get('word_count', 0)
-
-        # Calculate individual similarities
-        title_sim = self._text_similarity(title1, title2) if title1 and title2 else 0
-        desc_sim = self._text_similarity(desc1, desc2) if desc1 and desc2 else 0
-        h1_sim = self._text_similarity(h1_1, h1_2) if h1_1 and h1_2 else 0
-
-        # Word count similarity (1.0 if within 10% of each other)
-        if word_count1 and word_count2:
-            max_count = max(word_count1, word_count2)
-            min_count = min(word_count1, word_count2)
-            word_count_sim = min_count / max_count if max_count > 0 else 0
-        else:
-            word_count_sim = 0
-
-        # Weighted average (title and description are most important)
-        weights = {
-            'title': 0.35,
-            'desc': 0.35,
-            'h1': 0.20,
-            'word_count': 0.10
-        }
-
-        overall_similarity = (
-            title_sim * weights['title'] +
-            desc_sim * weights['desc'] +
-            h1_sim * weights['h1'] +
-            word_count_sim * weights['word_count']
-        )
+        with self.duplicate_index.lock:
+            indexed = set(self.duplicate_index.keys)
 
-        return overall_similarity
+        issues = []
+        for result in all_results:
+            if result.get('url', '') not in indexed:
+                issues.extend(self.find_duplication_issues(result, signatures.get(result.get('url', '')),
+                                                           similarity_threshold))
 
-    def _text_similarity(self, text1, text2):
-        """Calculate similarity ratio between two text strings using SequenceMatcher"""
-        if not text1 or not text2:
-            return 0.0
-        return SequenceMatcher(None, text1, text2).ratio()
+        if report:
+            self.add_issues(issues)
 
     def _should_exclude(self, url):
         """Check if URL should be excluded from issue detection"""
-        parsed = urlparse(url)
-        path = parsed.path
-
-        for pattern in self.exclusion_patterns:
-            if '*' in pattern:
-                if fnmatch(path, pattern):
-                    return True
-            elif path == pattern or path.startswith(pattern.rstrip('*')):
-                return True
-
-        return False
+        return self.exclusion_matcher.excludes(url)
 
     def _get_status_code_message(self, status_code):
         """Get descriptive message for HTTP status codes"""
@@ -473,3 +422,4 @@ class IssueDetector:
         """Reset detected issues"""
         with self.issues_lock:
             self.detected_issues.clear()
+        self.duplicate_index.clear()
@@ -0,0 +1,242 @@
+"""Compact link storage: integer URL ids and parallel edge arrays"""
+import sys
+import threading
+from array import array
+
+# Fields of a link dict, in the order LinkManager creates them
+LINK_FIELDS = ('source_url', 'target_url', 'anchor_text', 'is_internal', 'target_domain', 'target_status', 'placement')
+
+# Link placements known up front; others get a code when first seen
+PLACEMENTS = ('body', 'navigation', 'footer')
+
+# is_internal codes
+INTERNAL_VALUES = (False, True, None)
+
+
+class LinkGraph:
+    """
+    Links stored as edges between integer URL ids instead of one dict per link.
+
+    Every URL gets an id in one URL table, shared by sources and targets. An edge is a row in
+    parallel arrays: source id, target id, anchor text id (anchors are deduplicated in their own
+    table), and one-byte codes for is_internal and placement. The target domain is kept once per
+    URL. target_status is not stored per edge: it is looked up when the link is read, through
+    status_lookup (the crawl's URL -> status index), so links pick up statuses of pages crawled
+    after they were found. Statuses that came with the links themselves (e.g. loaded from the
+    database) are kept once per target URL and used when the lookup has none.
+
+    Behaves like the list it replaces for ResultLog: append/extend link dicts, len, indexing,
+    slicing and iteration (return link dicts with the LINK_FIELDS keys; other keys, such as
+    database row ids, are not kept) and deleting edges from the front. The URL table is kept
+    when edges are deleted, so URL ids stay valid.
+    """
+
+    SCAN_CHUNK = 100000  # Edges read per lock hold by internal_links_between()
+
+    def __init__(self, status_lookup=None):
+        """
+        Initialize link graph.
+
+        Args:
+            status_lookup: Returns the status code of a crawled URL, or None
+        """
+        self.status_lookup = status_lookup
+        self.lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            # URL table
+            self.urls = []
+            self.url_ids = {}
+            self.url_domains = array('I')  # Domain code + 1 per URL id (0 = not seen as a target)
+            self.url_bytes = 0
+
+            # Value tables
+            self.domains = []
+            self.domain_ids = {}
+            self.anchors = []
+            self.anchor_ids = {}
+            self.anchor_bytes = 0
+            self.placements = list(PLACEMENTS)
+            self.placement_ids = {placement: code for code, placement in enumerate(PLACEMENTS)}
+
+            # Edges
+            self.offset = 0  # Absolute id of the first edge still stored
+            self.count = 0
+            self.sources = array('I')
+            self.targets = array('I')
+            self.anchor_codes = array('I')
+            self.internal_codes = array('B')
+            self.placement_codes = array('B')
+
+            # Sparse data
+            self.loaded_statuses = {}   # target URL id -> status that came with its links
+            self.domain_overrides = {}  # edge id -> domain code, if it differs from the target URL's
+
+    def url_id(self, url):
+        """The URL's id, adding it to the URL table if it is new"""
+        url_id = self.url_ids.get(url)
+        if url_id is None:
+            with self.lock:
+                url_id = self.url_ids.get(url)
+                if url_id is None:
+                    url_id = len(self.urls)
+                    self.urls.append(url)
+                    self.url_ids[url] = url_id
+                    self.url_domains.append(0)
+                    self.url_bytes += sys.getsizeof(url)
+        return url_id
+
+    def link_key(self, source_url, target_url):
+        """Integer key of a source -> target pair, e.g. for a seen-set of links"""
+        return (self.url_id(source_url) << 32) | self.url_id(target_url)
+
+    @staticmethod
+    def _code(value, values, ids):
+        code = ids.get(value)
+        if code is None:
+            code = len(values)
+            values.append(value)
+            ids[value] = code
+        return code
+
+    # List interface
+
+    def append(self, link):
+        with self.lock:
+            edge_id = self.offset + self.count
+            source_id = self.url_id(link.get('source_url'))
+            target_id = self.url_id(link.get('target_url'))
+
+            anchor_text = link.get('anchor_text')
+            anchor_code = self.anchor_ids.get(anchor_text)
+            if anchor_code is None:
+                anchor_code = self._code(anchor_text, self.anchors, self.anchor_ids)
+                self.anchor_bytes += sys.getsizeof(anchor_text)
+
+            is_internal = link.get('is_internal')
+            internal_code = 2 if is_internal is None else int(bool(is_internal))
+            placement_code = self._code(link.get('placement'), self.placements, self.placement_ids)
+            if placement_code > 255:
+                raise ValueError('too many distinct link placements')
+
+            domain_code = self._code(link.get('target_domain'), self.domains, self.domain_ids) + 1
+            if not self.url_domains[target_id]:
+                self.url_domains[target_id] = domain_code
+            elif self.url_domains[target_id] != domain_code:
+                self.domain_overrides[edge_id] = domain_code
+
+            status = link.get('target_status')
+            if status is not None and self._lookup_status(target_id) != status:
+                self.loaded_statuses[target_id] = status
+
+            self.sources.append(source_id)
+            self.targets.append(target_id)
+            self.anchor_codes.append(anchor_code)
+            self.internal_codes.append(internal_code)
+            self.placement_codes.append(placement_code)
+            self.count += 1
+
+    def extend(self, links):
+        with self.lock:
+            for link in links:
+                self.append(link)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        with self.lock:
+            if isinstance(index, slice):
+                return [self._link(self.offset + position) for position in range(*index.indices(self.count))]
+
+            if index < 0:
+                index += self.count
+            if not 0 <= index < self.count:
+                raise IndexError('link graph index out of range')
+            return self._link(self.offset + index)
+
+    def __delitem__(self, index):
+        """Delete edges from the front (del graph[:count]) - the only deletion ResultLog needs"""
+        if not isinstance(index, slice) or index.start not in (None, 0) or index.step not in (None, 1):
+            raise TypeError('LinkGraph only supports deleting edges from the front')
+
+        with self.lock:
+            count = min(len(range(*index.indices(self.count))), self.count)
+            if count <= 0:
+                return
+
+            for column in (self.sources, self.targets, self.anchor_codes, self.internal_codes, self.placement_codes):
+                del column[:count]
+            self.offset += count
+            self.count -= count
+            for edge_id in [edge_id for edge_id in self.domain_overrides if edge_id < self.offset]:
+                del self.domain_overrides[edge_id]
+
+    def __iter__(self):
+        """Iterate links as dicts"""
+        position = 0
+        while True:
+            with self.lock:
+                if position >= self.count:
+                    return
+                link = self._link(self.offset + position)
+            yield link
+            position += 1
+
+    # Reads
+
+    def _lookup_status(self, target_id):
+        status = self.status_lookup(self.urls[target_id]) if self.status_lookup else None
+        if status is None:
+            status = self.loaded_statuses.get(target_id)
+        return status
+
+    def _link(self, edge_id):
+        position = edge_id - self.offset
+        target_id = self.targets[position]
+        domain_code = self.domain_overrides.get(edge_id) or self.url_domains[target_id]
+        return {
+            'source_url': self.urls[self.sources[position]],
+            'target_url': self.urls[target_id],
+            'anchor_text': self.anchors[self.anchor_codes[position]],
+            'is_internal': INTERNAL_VALUES[self.internal_codes[position]],
+            'target_domain': self.domains[domain_code - 1],
+            'target_status': self._lookup_status(target_id),
+            'placement': self.placements[self.placement_codes[position]]
+        }
+
+    def internal_links_between(self, urls):
+        """
+        (source_url, target_url) of every internal link between two of the given URLs,
+        compared by id without building link dicts.
+        """
+        with self.lock:
+            ids = {self.url_ids[url] for url in urls if url in self.url_ids}
+            edge_id = self.offset
+
+        # Scan in chunks so appends aren't blocked for the whole scan
+        pairs = []
+        while True:
+            with self.lock:
+                start = max(edge_id - self.offset, 0)
+                stop = min(start + self.SCAN_CHUNK, self.count)
+                if start >= stop:
+                    return pairs
+                chunk = zip(self.sources[start:stop], self.targets[start:stop], self.internal_codes[start:stop])
+                edge_id = self.offset + stop
+                url_table = self.urls
+            pairs.extend((url_table[source_id], url_table[target_id]) for source_id, target_id, internal_code in chunk
+                         if internal_code == 1 and source_id in ids and target_id in ids)
+
+    def memory_bytes(self):
+        """Approximate bytes held by the graph"""
+        with self.lock:
+            edges = sum(column.itemsize * len(column) for column in
+                        (self.sources, self.targets, self.anchor_codes, self.internal_codes, self.placement_codes))
+            # Strings plus a list slot, domain code and dict entry each
+            urls = self.url_bytes + len(self.urls) * (8 + 4 + 100)
+            anchors = self.anchor_bytes + len(self.anchors) * 100
+            sparse = (len(self.loaded_statuses) + len(self.domain_overrides)) * 100
+            return edges + urls + anchors + sparse
@@ -1,42 +1,49 @@
 """Link management and extraction"""
 import threading
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 from collections import deque
 
+from src.core.link_graph import LinkGraph
+from src.core.result_log import ResultLog
+from src.core.url_set import make_seen_set
+
 
 class LinkManager:
     """Manages link discovery, tracking, and extraction"""
 
-    def __init__(self, base_domain):
+    def __init__(self, base_domain, seen_set_type='exact', bloom_error_rate=0.001, frontier=None):
+        """
+        Initialize link manager.
+
+        Args:
+            base_domain: Domain of the crawl, for internal/external classification
+            seen_set_type: 'exact', 'fingerprint' or 'bloom' - how visited/discovered URLs and
+                           link keys are remembered (see src.core.url_set)
+            bloom_error_rate: False-positive bound for the 'bloom' seen-set
+            frontier: Queue for discovered URLs, e.g. a disk-backed Frontier (default: in-memory deque)
+        """
         self.base_domain = base_domain
-        self.visited_urls = set()
-        self.discovered_urls = deque()
-        self.all_discovered_urls = set()
-        self.all_links = []
-        self.links_set = set()
+        self.visited_urls = make_seen_set(seen_set_type, bloom_error_rate)
+        self.discovered_urls = frontier if frontier is not None else deque()
+        self.all_discovered_urls = make_seen_set(seen_set_type, bloom_error_rate)
+        self.all_links = self._new_links_log()
+        self.links_set = make_seen_set(seen_set_type, bloom_error_rate)  # Link keys (source/target id pairs)
         self.source_pages = {}  # Maps target_url -> list of source_urls
 
+        # URL -> status code of every crawled URL; links read their target_status from it
+        self.status_index = {}
+
         self.urls_lock = threading.Lock()
         self.links_lock = threading.Lock()
 
-    def extract_links(self, soup, current_url, depth, should_crawl_callback):
-        """Extract links from HTML and add to discovery queue"""
-        links = soup.find_all('a', href=True)
-
-        for link in links:
-            href = link['href'].strip()
-            if not href or href.startswith('#') or href.startswith('mailto:') or href.startswith('tel:'):
-                continue
-
-            # Convert relative URLs to absolute
-            absolute_url = urljoin(current_url, href)
-
-            # Clean URL (remove fragment)
-            parsed = urlparse(absolute_url)
-            clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-            if parsed.query:
-                clean_url += f"?{parsed.query}"
+        # Signalled whenever URLs enter the queue (or a waiter needs waking), so the
+        # crawl dispatcher can block instead of polling
+        self.queue_changed = threading.Condition(self.urls_lock)
+        self.queue_version = 0
 
+    def queue_link_records(self, link_records, current_url, depth, should_crawl_callback):
+        """Add the targets of pre-extracted link records to the discovery queue"""
+        for clean_url, _, _, _ in link_records:
             # Thread-safe checking and adding
             with self.urls_lock:
                 # Track source page for this URL
@@ -49,111 +56,101 @@ class LinkManager:
                     clean_url not in self.all_discovered_urls and
                     clean_url != current_url):
 
-                    # Check if this URL should be crawled
-                    if should_crawl_callback(clean_url):
+                    # Check if this URL should be crawled (at this depth)
+                    if should_crawl_callback(clean_url, depth):
                         self.all_discovered_urls.add(clean_url)
                         self.discovered_urls.append((clean_url, depth))
+                        self._signal_queue_changed()
+
+    def add_link_records(self, link_records, source_url):
+        """
+        Add pre-extracted link records to the Links tab collection.
+
+        Returns:
+            list: The link dicts that were new and got added
+        """
+        base_domain_clean = self.base_domain.replace('www.', '', 1)
+        added_links = []
+
+        for clean_url, target_domain, anchor_text, placement in link_records:
+            # Determine if link is internal or external
+            is_internal = target_domain.replace('www.', '', 1) == base_domain_clean
+
+            link_data = {
+                'source_url': source_url,
+                'target_url': clean_url,
+                'anchor_text': anchor_text or '(no text)',
+                'is_internal': is_internal,
+                'target_domain': target_domain,
+                'target_status': self.status_index.get(clean_url),
+                'placement': placement
+            }
 
-    def collect_all_links(self, soup, source_url, crawl_results):
-        """Collect all links for the Links tab display"""
-        links = soup.find_all('a', href=True)
+            # Track source page for this URL (for "Linked From" feature)
+            with self.urls_lock:
+                if clean_url not in self.source_pages:
+                    self.source_pages[clean_url] = []
+                if source_url not in self.source_pages[clean_url]:
+                    self.source_pages[clean_url].append(source_url)
+
+            # Thread-safe adding to links collection with duplicate checking
+            with self.links_lock:
+                link_key = self.all_links.rows.link_key(source_url, clean_url)
+
+                if link_key not in self.links_set:
+                    self.links_set.add(link_key)
+                    self.all_links.append(link_data)
+                    added_links.append(link_data)
 
+        return added_links
+
+    def _new_links_log(self, links=None):
+        """Links log backed by a LinkGraph that reads target statuses from the status index"""
+        return ResultLog(links, table=LinkGraph(self._target_status), on_load=self._fill_spilled_link_statuses)
+
+    def _target_status(self, url):
+        return self.status_index.get(url)
+
+    def _fill_spilled_link_statuses(self, links):
+        """Fill in statuses that arrived after these links were spilled to disk"""
         for link in links:
-            href = link['href'].strip()
-            if not href or href.startswith('#'):
-                continue
-
-            # Get anchor text
-            anchor_text = link.get_text().strip()[:100]
-
-            # Handle special link types
-            if href.startswith('mailto:') or href.startswith('tel:'):
-                continue
-
-            # Convert relative URLs to absolute
-            try:
-                absolute_url = urljoin(source_url, href)
-                parsed_target = urlparse(absolute_url)
-
-                # Clean URL (remove fragment)
-                clean_url = f"{parsed_target.scheme}://{parsed_target.netloc}{parsed_target.path}"
-                if parsed_target.query:
-                    clean_url += f"?{parsed_target.query}"
-
-                # Determine if link is internal or external
-                target_domain_clean = parsed_target.netloc.replace('www.', '', 1)
-                base_domain_clean = self.base_domain.replace('www.', '', 1)
-                is_internal = target_domain_clean == base_domain_clean
-
-                # Find the status of the target URL if we've crawled it
-                target_status = None
-                for result in crawl_results:
-                    if result['url'] == clean_url:
-                        target_status = result['status_code']
-                        break
-
-                # Determine placement (navigation, footer, body)
-                placement = self._detect_link_placement(link)
-
-                link_data = {
-                    'source_url': source_url,
-                    'target_url': clean_url,
-                    'anchor_text': anchor_text or '(no text)',
-                    'is_internal': is_internal,
-                    'target_domain': parsed_target.netloc,
-                    'target_status': target_status,
-                    'placement': placement
-                }
-
-                # Track source page for this URL (for "Linked From" feature)
-                with self.urls_lock:
-                    if clean_url not in self.source_pages:
-                        self.source_pages[clean_url] = []
-                    if source_url not in self.source_pages[clean_url]:
-                        self.source_pages[clean_url].append(source_url)
-
-                # Thread-safe adding to links collection with duplicate checking
-                with self.links_lock:
-                    link_key = f"{link_data['source_url']}|{link_data['target_url']}"
-
-                    if link_key not in self.links_set:
-                        self.links_set.add(link_key)
-                        self.all_links.append(link_data)
-
-            except Exception:
-                continue
-
-    def _detect_link_placement(self, link_element):
-        """Detect where on the page a link is placed"""
-        # Check parent elements up the tree
-        current = link_element.parent
-
-        while current and current.name:
-            # Check for footer
-            if current.name == 'footer':
-                return 'footer'
-
-            # Check for footer by class/id
-            classes = current.get('class', [])
-            element_id = current.get('id', '')
-            classes_str = ' '.join(classes).lower() if classes else ''
-
-            if 'footer' in classes_str or 'footer' in element_id.lower():
-                return 'footer'
-
-            # Check for navigation
-            if current.name in ['nav', 'header']:
-                return 'navigation'
-
-            # Check for navigation by class/id
-            if any(keyword in classes_str or keyword in element_id.lower()
-                   for keyword in ['nav', 'menu', 'header']):
-                return 'navigation'
-
-            current = current.parent
-
-        # Default to body if not in nav or footer
-        return 'body'
+            if link['target_status'] is None:
+                link['target_status'] = self.status_index.get(link['target_url'])
+
+    def load_links(self, links):
+        """Replace the Links tab collection with previously saved links"""
+        with self.links_lock:
+            self.all_links = self._new_links_log(links)
+            graph = self.all_links.rows
+            self.links_set.clear()
+            for link in links:
+                self.links_set.add(graph.link_key(link['source_url'], link['target_url']))
+
+    def spill_links(self, keep):
+        """
+        Spill all but the newest `keep` links to disk (see ResultLog.spill).
+        Spilled links without a target status get it when read back.
+
+        Returns:
+            int: Number of links spilled
+        """
+        with self.links_lock:
+            return self.all_links.spill(keep)
+
+    def record_status(self, url, status_code):
+        """Record a crawled URL's status; links pointing at it read it from the index"""
+        with self.links_lock:
+            self.status_index[url] = status_code
+
+    def internal_links_between(self, urls):
+        """(source_url, target_url) of every internal link between two of the given URLs"""
+        urls = set(urls)
+        log = self.all_links
+        with log.lock:
+            spilled_count = log.spilled_count
+        pairs = [(link['source_url'], link['target_url']) for link in log[:spilled_count]
+                 if link['is_internal'] and link['source_url'] in urls and link['target_url'] in urls]
+        return pairs + log.rows.internal_links_between(urls)
 
     def is_internal(self, url):
         """Check if URL is internal to the base domain"""
@@ -168,6 +165,28 @@ class LinkManager:
             if url not in self.all_discovered_urls and url not in self.visited_urls:
                 self.all_discovered_urls.add(url)
                 self.discovered_urls.append((url, depth))
+                self._signal_queue_changed()
+
+    def _signal_queue_changed(self):
+        """Wake threads waiting on the queue (urls_lock must be held)"""
+        self.queue_version += 1
+        self.queue_changed.notify_all()
+
+    def notify_queue_changed(self):
+        """Wake threads waiting on the queue, e.g. when a crawl slot frees up"""
+        with self.urls_lock:
+            self._signal_queue_changed()
+
+    def wait_for_queue_change(self, version, timeout=None):
+        """
+        Block until the queue changes after the given version, or the timeout expires.
+
+        Args:
+            version: queue_version read before the caller last checked for work
+            timeout: Maximum seconds to wait (None = wait indefinitely)
+        """
+        with self.urls_lock:
+            return self.queue_changed.wait_for(lambda: self.queue_version != version, timeout)
 
     def mark_visited(self, url):
         """Mark a URL as visited"""
@@ -181,6 +200,17 @@ class LinkManager:
                 return self.discovered_urls.popleft()
         return None
 
+    def take_queued_entries(self):
+        """(url, depth) entries queued since the last call, for persisting the queue (Frontier only)"""
+        with self.urls_lock:
+            if hasattr(self.discovered_urls, 'take_pushed'):
+                return self.discovered_urls.take_pushed()
+        return []
+
+    def pending_count(self):
+        """Number of queued URLs (lock-free read, cheap enough for the dispatch loop)"""
+        return len(self.discovered_urls)
+
     def get_stats(self):
         """Get current statistics"""
         with self.urls_lock:
@@ -191,15 +221,12 @@ class LinkManager:
             }
 
     def update_link_statuses(self, crawl_results):
-        """Update target_status for all links based on crawl results"""
-        # Build a fast lookup dict
-        status_lookup = {result['url']: result['status_code'] for result in crawl_results}
-
+        """
+        Rebuild the status index from a full set of crawl results (e.g. a crawl loaded from
+        the database). Links read their statuses from it.
+        """
         with self.links_lock:
-            for link in self.all_links:
-                target_url = link['target_url']
-                if target_url in status_lookup:
-                    link['target_status'] = status_lookup[target_url]
+            self.status_index = build_status_index(crawl_results)
 
     def get_source_pages(self, url):
         """Get list of source pages that link to this URL"""
@@ -217,3 +244,17 @@ class LinkManager:
         with self.links_lock:
             self.all_links.clear()
             self.links_set.clear()
+            self.status_index.clear()
+
+
+def build_status_index(crawl_results):
+    """URL -> status code lookup for a list of crawl results"""
+    return {result['url']: result.get('status_code') for result in crawl_results}
+
+
+def apply_link_statuses(links, status_index):
+    """Fill in target_status for links whose target appears in the status index"""
+    for link in links:
+        status = status_index.get(link.get('target_url'))
+        if status is not None:
+            link['target_status'] = status
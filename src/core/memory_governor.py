@@ -0,0 +1,123 @@
+"""Keeps a crawl under its memory_limit by spilling results to disk and throttling dispatch"""
+import threading
+import time
+
+
+class MemoryGovernor:
+    """
+    Enforces the memory_limit setting for one crawl.
+
+    Memory use is taken as the larger of the process RSS growth since the governor started and the
+    estimated size of the result rows still held in memory (from DataSizeTracker). Above the
+    spill threshold the governor spills the older rows of the result logs to disk, keeping only
+    the newest rows in memory. If the crawl's own in-memory rows are still over the limit
+    afterwards - spilling can't keep up - dispatch is throttled to one request at a time until
+    a later spill brings them back under it, so the crawl slows down instead of running the
+    server out of memory.
+
+    RSS is process-wide and doesn't shrink after a spill, and with several crawls in one server
+    each crawl's RSS growth also includes the others'. So it only triggers spilling (erring on
+    the side of spilling early) and never throttles.
+    """
+
+    SPILL_THRESHOLD = 0.8  # Fraction of the limit at which rows are spilled
+
+    # Newest rows kept in memory per log when spilling (status polls read these)
+    KEEP_ROWS = {'crawl_results': 1000, 'links': 10000, 'issues': 10000}
+
+    def __init__(self, memory_monitor, data_size, logs_callback, spill_callback, memory_limit, interval=2):
+        """
+        Initialize governor.
+
+        Args:
+            memory_monitor: The crawl's MemoryMonitor (RSS)
+            data_size: The crawl's DataSizeTracker (estimated size of the result logs)
+            logs_callback: Returns the current (crawl_results, links, issues) logs
+            spill_callback: Called with KEEP_ROWS to spill the logs; returns the rows spilled
+            memory_limit: Limit in bytes (0 disables the governor)
+            interval: Seconds between checks
+        """
+        self.memory_monitor = memory_monitor
+        self.data_size = data_size
+        self.logs_callback = logs_callback
+        self.spill_callback = spill_callback
+        self.memory_limit = memory_limit
+        self.interval = interval
+
+        self.throttled = False
+        self.spilled_rows = 0
+        self.spill_count = 0
+        self.last_usage = 0
+        self.baseline_mb = 0
+        self.thread = None
+
+    def start(self, should_run):
+        """Check memory on a background thread for as long as should_run() is true"""
+        if not self.memory_limit or (self.thread and self.thread.is_alive()):
+            return
+
+        self.memory_monitor.update()
+        self.baseline_mb = self.memory_monitor.current_memory_mb
+
+        def governor():
+            while should_run():
+                try:
+                    self.check()
+                except Exception as e:
+                    print(f"Error in memory governor: {e}")
+                time.sleep(self.interval)
+            self.throttled = False
+
+        self.thread = threading.Thread(target=governor, daemon=True)
+        self.thread.start()
+
+    def usage_bytes(self):
+        """Memory attributed to the crawl: max(RSS growth, in-memory result rows)"""
+        self.memory_monitor.update()
+        rss_growth = max(self.memory_monitor.current_memory_mb - self.baseline_mb, 0) * 1024 * 1024
+        return max(rss_growth, self.in_memory_bytes())
+
+    def in_memory_bytes(self):
+        """Estimated size of the crawl's result rows still held in memory"""
+        sizes = self.data_size.get_sizes()
+        in_memory = 0
+        for name, log in zip(('crawl_results', 'links', 'issues'), self.logs_callback()):
+            count = sizes.get(f"{name}_count") or 0
+            if count:
+                per_row = sizes[f"{name}_deep_mb"] * 1024 * 1024 / count
+                in_memory += per_row * getattr(log, 'memory_count', len(log))
+
+        return in_memory
+
+    def check(self):
+        """Spill result rows if usage is near the limit, and throttle if the rows are still over it"""
+        usage = self.usage_bytes()
+        spill_at = self.memory_limit * self.SPILL_THRESHOLD
+
+        if usage >= spill_at:
+            spilled = self.spill()
+            if spilled:
+                usage = self.usage_bytes()
+            self.throttled = self.in_memory_bytes() >= self.memory_limit
+        else:
+            self.throttled = False
+
+        self.last_usage = usage
+
+    def spill(self):
+        """Spill the older rows of every result log to disk; returns the number of rows spilled"""
+        spilled = self.spill_callback(self.KEEP_ROWS)
+        if spilled:
+            self.spilled_rows += spilled
+            self.spill_count += 1
+            print(f"Memory governor spilled {spilled} result rows to disk")
+        return spilled
+
+    def get_stats(self):
+        return {
+            'limit_mb': round(self.memory_limit / 1024 / 1024, 2),
+            'usage_mb': round(self.last_usage / 1024 / 1024, 2),
+            'throttled': self.throttled,
+            'spilled_rows': self.spilled_rows,
+            'spills': self.spill_count
+        }
@@ -2,7 +2,11 @@
 import sys
 import gc
 import json
+import random
+import threading
+import time
 from collections import defaultdict
+from datetime import datetime
 
 
 class MemoryProfiler:
@@ -98,3 +102,173 @@ class MemoryProfiler:
             'total_deep_mb': round((crawl_results_deep + links_deep + issues_deep) / 1024 / 1024, 2),
             'total_json_mb': round((crawl_json_size + links_json_size + issues_json_size) / 1024 / 1024, 2)
         }
+
+
+def estimate_size(obj):
+    """
+    Cheap size estimate for a result record: the container plus its direct values, without
+    recursing further. Cheap enough to call for every record as it is appended; DataSizeTracker
+    scales it to a deep size by sampling.
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        values = obj.values()
+    elif isinstance(obj, (list, tuple)):
+        values = obj
+    else:
+        return size
+
+    for value in values:
+        size += sys.getsizeof(value)
+    return size
+
+
+class DataSizeTracker:
+    """
+    Maintains get_crawler_data_size-style figures without walking the whole crawl.
+
+    Each record's estimate_size is added to a running total when it is appended (record()).
+    A background thread periodically deep-sizes and JSON-encodes a random sample of each log
+    and uses it to scale the running totals; the result is cached and get_sizes() only reads
+    the cache. Rows appended without record() (loaded crawls, end-of-crawl issues) are counted
+    at the sampled average size.
+    """
+
+    LOGS = ('crawl_results', 'links', 'issues')
+
+    def __init__(self, logs_callback, sample_size=200, interval=10):
+        """
+        Initialize tracker.
+
+        Args:
+            logs_callback: Returns the current (crawl_results, links, issues) lists
+            sample_size: Records deep-sized per log on each refresh
+            interval: Seconds between background refreshes
+        """
+        self.logs_callback = logs_callback
+        self.sample_size = sample_size
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.thread = None
+        self.reset()
+
+    def reset(self):
+        """Forget recorded sizes (the logs were cleared or replaced)"""
+        with self.lock:
+            self.recorded_bytes = {name: 0 for name in self.LOGS}
+            self.recorded_count = {name: 0 for name in self.LOGS}
+            self.cached_sizes = None
+            self.sampled_at = 0
+            self.last_averages = {}
+
+    def record(self, log_name, rows):
+        """Add the estimated size of rows just appended to a log"""
+        estimate = 0
+        for row in rows:
+            estimate += estimate_size(row)
+        with self.lock:
+            self.recorded_bytes[log_name] += estimate
+            self.recorded_count[log_name] += len(rows)
+
+    def start(self, should_run):
+        """Refresh the cache on a background thread for as long as should_run() is true"""
+        if self.thread and self.thread.is_alive():
+            return
+
+        def sampler():
+            while should_run():
+                self.refresh()
+                time.sleep(self.interval)
+
+        self.thread = threading.Thread(target=sampler, daemon=True)
+        self.thread.start()
+
+    def get_sizes(self):
+        """Cached sizes; refreshed here only if no background refresh has run recently"""
+        if self.cached_sizes is None or time.time() - self.sampled_at > self.interval * 2:
+            self.refresh()
+        return self.cached_sizes
+
+    def _sample(self, rows):
+        """
+        Average deep, JSON and estimated sizes of a random sample of a log's rows.
+        Only rows held in memory are sampled - reading a spilled row loads its whole segment.
+        """
+        rows = getattr(rows, 'rows', rows)  # In-memory tail of a ResultLog
+        count = len(rows)
+        if not count:
+            return None
+
+        indexes = random.sample(range(count), min(self.sample_size, count))
+        deep = json_size = estimate = sampled = 0
+        # Objects shared between rows (dict keys, interned strings, small ints) are counted once,
+        # as they are when the whole log is measured
+        seen = set()
+        for index in indexes:
+            try:
+                row = rows[index]
+            except IndexError:
+                continue  # Spilled meanwhile
+            sampled += 1
+            deep += MemoryProfiler.get_deep_size(row, seen)
+            estimate += estimate_size(row)
+            try:
+                json_size += len(json.dumps(row, default=str))
+            except:
+                pass
+        if not sampled:
+            return None
+        return deep / sampled, json_size / sampled, estimate / sampled
+
+    def refresh(self):
+        """Sample each log and update the cached sizes"""
+        deep_bytes = {}
+        json_bytes = {}
+        counts = {}
+
+        for name, rows in zip(self.LOGS, self.logs_callback()):
+            count = len(rows)
+            # Averages from the last sample are kept while every row is on disk
+            averages = self._sample(rows) or self.last_averages.get(name, (0, 0, 0))
+            self.last_averages[name] = averages
+            avg_deep, avg_json, avg_estimate = averages
+            with self.lock:
+                recorded_bytes = self.recorded_bytes[name]
+                recorded_count = min(self.recorded_count[name], count)
+
+            # Scale the append-time estimates by the sampled deep/estimate ratio
+            ratio = avg_deep / avg_estimate if avg_estimate else 1
+            deep_bytes[name] = recorded_bytes * ratio + (count - recorded_count) * avg_deep
+
+            # Columnar logs (ResultStore) report their actual footprint; sampled rows are decoded
+            # dicts and would overstate it
+            memory_bytes = rows.memory_bytes() if hasattr(rows, 'memory_bytes') else None
+            if memory_bytes is not None and rows.memory_count:
+                deep_bytes[name] = memory_bytes * count / rows.memory_count
+            json_bytes[name] = count * avg_json
+            counts[name] = count
+
+        mb = lambda size: round(size / 1024 / 1024, 2)
+        sizes = {
+            'crawl_results_deep_mb': mb(deep_bytes['crawl_results']),
+            'crawl_results_json_mb': mb(json_bytes['crawl_results']),
+            'crawl_results_count': counts['crawl_results'],
+            'avg_per_url_kb': round(deep_bytes['crawl_results'] / counts['crawl_results'] / 1024, 2) if counts['crawl_results'] else 0,
+
+            'links_deep_mb': mb(deep_bytes['links']),
+            'links_json_mb': mb(json_bytes['links']),
+            'links_count': counts['links'],
+
+            'issues_deep_mb': mb(deep_bytes['issues']),
+            'issues_json_mb': mb(json_bytes['issues']),
+            'issues_count': counts['issues'],
+
+            'total_deep_mb': mb(sum(deep_bytes.values())),
+            'total_json_mb': mb(sum(json_bytes.values())),
+            'sampled_at': datetime.now().isoformat()
+        }
+
+        with self.lock:
+            self.cached_sizes = sizes
+            self.sampled_at = time.time()
+        return sizes
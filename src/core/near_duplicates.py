@@ -0,0 +1,189 @@
+"""Near-duplicate page detection: MinHash signatures and locality-sensitive hashing"""
+import random
+import re
+import threading
+import zlib
+from array import array
+
+NUM_PERM = 64        # MinHash values per signature (32 bits each, so 256 bytes per page)
+BANDS = 16           # LSH bands; pages sharing all NUM_PERM // BANDS values of any band are candidates
+SHINGLE_SIZE = 3     # Words per shingle
+MAX_WORDS = 20000    # Words of a page that go into its signature
+BUCKET_COMPARE_LIMIT = 16  # Earlier pages of a band bucket a page is compared with
+LISTED_DUPLICATES = 5      # Other pages of its cluster named for a page
+
+HASH_MASK = (1 << 64) - 1
+ROWS_PER_BAND = NUM_PERM // BANDS
+
+# Fixed (a, b) parameters of the NUM_PERM hash functions, so signatures built in different
+# processes (e.g. parse workers) and different runs compare with each other
+_random = random.Random(0x6D696E68)
+PERMUTATIONS = tuple((_random.getrandbits(64) | 1, _random.getrandbits(64)) for _ in range(NUM_PERM))
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def content_signature(text):
+    """
+    MinHash signature of a page's text, over its word shingles.
+
+    The fraction of equal values in two signatures estimates the Jaccard similarity of the
+    two pages' shingle sets. Computed once per page, e.g. while it is extracted.
+
+    Returns:
+        bytes: NUM_PERM 32-bit minimums, or None if the text has no words
+    """
+    words = [zlib.crc32(word.encode('utf-8')) for word in _WORD_PATTERN.findall(text.lower())[:MAX_WORDS]]
+    if not words:
+        return None
+
+    # One 64-bit hash per distinct shingle of SHINGLE_SIZE consecutive words
+    shingles = set()
+    for i in range(max(len(words) - SHINGLE_SIZE + 1, 1)):
+        shingle = 0
+        for word in words[i:i + SHINGLE_SIZE]:
+            shingle = (shingle * 0x100000001B3 + word) & HASH_MASK
+        shingles.add(shingle)
+
+    # Multiply-shift hashing: the top 32 bits of (a * h + b) mod 2**64 are a universal hash of h
+    return array('I', [min([(a * shingle + b) & HASH_MASK for shingle in shingles]) >> 32
+                       for a, b in PERMUTATIONS]).tobytes()
+
+
+def signature_similarity(signature1, signature2):
+    """Estimated Jaccard similarity of two signatures (fraction of equal MinHash values)"""
+    values1 = array('I', signature1)
+    values2 = array('I', signature2)
+    return sum(1 for value1, value2 in zip(values1, values2) if value1 == value2) / NUM_PERM
+
+
+class DuplicateIndex:
+    """
+    Content signatures of crawled pages, probed for near-duplicates as each page arrives.
+
+    Signatures are kept in one flat array (NUM_PERM 32-bit values per page). Each signature is
+    split into BANDS bands, and every band has a bucket table (band hash -> earlier pages with
+    that band), so a new page is only compared with pages sharing a whole band - near-linear in
+    the number of pages instead of comparing every pair. Candidates are verified on their full
+    signatures and joined into clusters with union-find.
+    """
+
+    def __init__(self):
+        """Initialize an empty duplicate index."""
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.keys = []  # URL of each signature
+            self.signatures = array('I')
+            self.buckets = [{} for _ in range(BANDS)]  # Band hash -> position, or list of positions
+            self.parents = array('I')  # Union-find parent of each position
+            self.members = {}  # Root position -> positions of its cluster (clusters of 2+ pages only)
+            self.best = {}     # Root position -> highest verified similarity in its cluster
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key, signature, threshold):
+        """
+        Add a page's signature (from content_signature) and join it to the clusters of the
+        earlier pages it is at least `threshold` similar to.
+
+        Returns:
+            list: (key, other_count, other_keys, similarity) for every page that just became
+                  part of a cluster - the new page and any earlier pages it is the first match of.
+                  other_count is the number of other pages in the cluster at this point, and
+                  other_keys names up to LISTED_DUPLICATES of them.
+        """
+        with self.lock:
+            position = len(self.keys)
+            self.keys.append(key)
+            self.signatures.frombytes(signature)
+            self.parents.append(position)
+
+            # Matched earlier pages that were not in a cluster yet -> similarity to the new page
+            joined = {}
+            best_match = 0
+            for band in range(BANDS):
+                start = position * NUM_PERM + band * ROWS_PER_BAND
+                band_key = hash(self.signatures[start:start + ROWS_PER_BAND].tobytes())
+                bucket = self.buckets[band]
+                entry = bucket.get(band_key)
+                if entry is None:
+                    bucket[band_key] = position
+                    continue
+
+                # Compare with a bounded number of earlier pages in the bucket - pages of a
+                # large cluster are joined through the ones already compared
+                candidates = (entry,) if isinstance(entry, int) else entry
+                for other in candidates:
+                    if self._find(other) == self._find(position):
+                        continue
+                    similarity = self._similarity(position, other)
+                    if similarity >= threshold:
+                        if self._find(other) not in self.members:
+                            joined[other] = similarity
+                        self._union(position, other, similarity)
+                        best_match = max(best_match, similarity)
+
+                if isinstance(entry, int):
+                    bucket[band_key] = [entry, position]
+                elif len(entry) < BUCKET_COMPARE_LIMIT:
+                    entry.append(position)
+
+            if not best_match:
+                return []
+
+            cluster = self.members[self._find(position)]
+            flagged = [(position, best_match)] + list(joined.items())
+            return [(self.keys[member], len(cluster) - 1, self._listed_keys(cluster, member), similarity)
+                    for member, similarity in flagged]
+
+    def _listed_keys(self, cluster, member):
+        keys = []
+        for other in cluster:
+            if other != member:
+                keys.append(self.keys[other])
+                if len(keys) == LISTED_DUPLICATES:
+                    break
+        return keys
+
+    def _find(self, position):
+        parents = self.parents
+        while parents[position] != position:
+            parents[position] = parents[parents[position]]
+            position = parents[position]
+        return position
+
+    def _union(self, position1, position2, similarity):
+        root1 = self._find(position1)
+        root2 = self._find(position2)
+        members1 = self.members.pop(root1, None) or [root1]
+        members2 = self.members.pop(root2, None) or [root2]
+        if len(members1) < len(members2):
+            root1, root2, members1, members2 = root2, root1, members2, members1
+
+        self.parents[root2] = root1
+        members1.extend(members2)
+        self.members[root1] = members1
+        self.best[root1] = max(similarity, self.best.pop(root1, 0), self.best.pop(root2, 0))
+
+    def _similarity(self, position1, position2):
+        start1 = position1 * NUM_PERM
+        start2 = position2 * NUM_PERM
+        signatures = self.signatures
+        return sum(1 for offset in range(NUM_PERM)
+                   if signatures[start1 + offset] == signatures[start2 + offset]) / NUM_PERM
+
+    def clusters(self):
+        """
+        Current clusters of near-duplicate pages.
+
+        Returns:
+            list: One (keys, similarity) tuple per cluster - the cluster's keys in index order,
+                  and the highest similarity found between two of them
+        """
+        with self.lock:
+            return [([self.keys[member] for member in sorted(members)], self.best[root])
+                    for root, members in self.members.items()]
@@ -0,0 +1,50 @@
+"""CPU-bound page processing (parse, SEO extraction, issue detection), runnable inline or in a worker process"""
+import time
+from urllib.parse import urlparse
+
+from src.core.seo_extractor import SEOExtractor
+from src.core.html_document import parse_html
+from src.core.issue_detector import IssueDetector
+from src.core.near_duplicates import content_signature
+
+
+def process_page(url, depth, status_code, content_type, content, text, start_time,
+                 base_domain, parser_backend='html.parser', exclusion_patterns=None,
+                 javascript_rendered=False, content_signatures=False):
+    """
+    Parse a fetched page and extract everything the crawler records for it.
+
+    Only depends on its arguments, so it can run in a ProcessPoolExecutor worker
+    while the crawler's threads stay free for network I/O.
+
+    Returns:
+        tuple: (result, link_records, issues, signature) - the result dict (without linked_from),
+               the page's link records, the issues detected on it and, if content_signatures
+               is set, its content signature for duplicate detection (None otherwise)
+    """
+    # Determine if URL is internal (www vs non-www counts as the same site)
+    is_internal = urlparse(url).netloc.replace('www.', '', 1) == base_domain.replace('www.', '', 1)
+
+    size = len(content) if isinstance(content, bytes) else len(content.encode('utf-8'))
+    result = SEOExtractor.create_result(
+        url, depth, status_code, content_type.split(';')[0], size, is_internal
+    )
+    if javascript_rendered:
+        result['javascript_rendered'] = True
+
+    # Only parse HTML content
+    link_records = []
+    signature = None
+    if 'text/html' in content_type:
+        document = parse_html(content, parser_backend)
+
+        # Extract every SEO field and the page's links in one pass over the tree
+        page_text = []
+        link_records = SEOExtractor.extract_page(document, text, result, base_domain, page_text)
+        if content_signatures:
+            signature = content_signature(page_text[0])
+
+    result['response_time'] = round((time.time() - start_time) * 1000, 2)
+
+    issues = IssueDetector(exclusion_patterns).find_issues(result)
+    return result, link_records, issues, signature
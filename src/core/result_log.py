@@ -0,0 +1,193 @@
+"""Append-only result log that can move its older rows to disk under memory pressure"""
+import bisect
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+
+
+class ResultLog:
+    """
+    Append-only list of result rows (crawled URLs, links or issues).
+
+    spill() writes all but the most recent rows to a segment file and drops them from memory,
+    keeping only the segment's path and row count. Reads still see every row: indexing, slicing
+    and iteration load spilled rows back from their segments as needed, so code that treats the
+    log as a list keeps working. Status polls read the newest rows, which stay in memory.
+
+    The in-memory rows can be held in a ResultStore (table=ResultStore()) instead of a list, which
+    keeps them in compact columns. Rows loaded back from disk or read from a ResultStore are
+    copies - changing them does not change the log; use update_each() to modify rows in place.
+    Thread-safe.
+    """
+
+    ITER_CHUNK = 1000  # Rows read per step while iterating
+
+    def __init__(self, rows=None, spill_dir=None, on_load=None, table=None):
+        """
+        Initialize log.
+
+        Args:
+            rows: Initial rows
+            spill_dir: Parent directory for segment files (default: system temp dir)
+            on_load: Called with each list of rows read back from disk, e.g. to refresh fields
+                     that are filled in after a row is appended
+            table: Empty list-like container for the in-memory rows, e.g. a ResultStore
+                   (default: list)
+        """
+        self.rows = table if table is not None else []  # In-memory tail
+        self.rows.extend(rows or [])
+        self.segments = []            # (path, row_count), oldest first
+        self.segment_starts = []      # Index of each segment's first row
+        self.spilled_count = 0
+        self.spill_dir = spill_dir
+        self.segment_dir = None
+        self.on_load = on_load
+        self.lock = threading.RLock()
+
+    def append(self, row):
+        with self.lock:
+            self.rows.append(row)
+
+    def extend(self, rows):
+        with self.lock:
+            self.rows.extend(rows)
+
+    def __len__(self):
+        with self.lock:
+            return self.spilled_count + len(self.rows)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    @property
+    def memory_count(self):
+        """Rows currently held in memory"""
+        return len(self.rows)
+
+    def memory_bytes(self):
+        """Bytes held by the in-memory rows if the table tracks them, else None"""
+        if hasattr(self.rows, 'memory_bytes'):
+            return self.rows.memory_bytes()
+        return None
+
+    def spill(self, keep=0):
+        """
+        Move all but the newest `keep` rows to a new segment file.
+
+        Returns:
+            int: Number of rows spilled
+        """
+        with self.lock:
+            count = len(self.rows) - keep
+            if count <= 0:
+                return 0
+
+            if self.segment_dir is None:
+                self.segment_dir = tempfile.mkdtemp(prefix='librecrawl-results-', dir=self.spill_dir)
+
+            path = os.path.join(self.segment_dir, f"segment-{len(self.segments) + 1:08d}.pkl")
+            with open(path, 'wb') as f:
+                pickle.dump(self.rows[:count], f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            self.segments.append((path, count))
+            self.segment_starts.append(self.spilled_count)
+            self.spilled_count += count
+            del self.rows[:count]
+            return count
+
+    def _load_segment(self, number):
+        path, _ = self.segments[number]
+        with open(path, 'rb') as f:
+            rows = pickle.load(f)
+        if self.on_load:
+            self.on_load(rows)
+        return rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return self[start:stop][::step]
+            return self._slice(start, stop)
+
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('result log index out of range')
+        return self._slice(index, index + 1)[0]
+
+    def _slice(self, start, stop):
+        """Rows start..stop-1, reading spilled ones from their segments"""
+        with self.lock:
+            rows = []
+            if start < self.spilled_count:
+                number = bisect.bisect_right(self.segment_starts, start) - 1
+                while number < len(self.segments) and self.segment_starts[number] < stop:
+                    segment_start = self.segment_starts[number]
+                    segment_rows = self._load_segment(number)
+                    rows.extend(segment_rows[max(start - segment_start, 0):stop - segment_start])
+                    number += 1
+
+            memory_start = max(start - self.spilled_count, 0)
+            memory_stop = max(stop - self.spilled_count, 0)
+            rows.extend(self.rows[memory_start:memory_stop])
+            return rows
+
+    def __iter__(self):
+        """Iterate every row, one segment or chunk of in-memory rows at a time"""
+        with self.lock:
+            segment_count = len(self.segments)
+            position = self.spilled_count
+            length = len(self)
+
+        for number in range(segment_count):
+            yield from self._load_segment(number)
+
+        # Later rows by absolute position, so a spill mid-iteration doesn't skip or repeat rows
+        while position < length:
+            chunk = self._slice(position, min(position + self.ITER_CHUNK, length))
+            if not chunk:
+                return
+            yield from chunk
+            position += len(chunk)
+
+    def copy(self):
+        """All rows as a list (loads every spilled row into memory)"""
+        return list(self)
+
+    def update_each(self, update):
+        """
+        Call update(row) for every row, writing changed segments back to disk.
+        update returns True if it changed the row.
+        """
+        with self.lock:
+            for number, (path, _) in enumerate(self.segments):
+                rows = self._load_segment(number)
+                changed = False
+                for row in rows:
+                    changed = update(row) or changed
+                if changed:
+                    with open(path, 'wb') as f:
+                        pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            # Index the in-memory rows so a ResultStore hands out write-through row views
+            for position in range(len(self.rows)):
+                update(self.rows[position])
+
+    def clear(self):
+        """Drop all rows and delete the segment files"""
+        with self.lock:
+            self.rows.clear()
+            self.segments = []
+            self.segment_starts = []
+            self.spilled_count = 0
+            if self.segment_dir:
+                shutil.rmtree(self.segment_dir, ignore_errors=True)
+                self.segment_dir = None
+
+    def __del__(self):
+        if self.segment_dir:
+            shutil.rmtree(self.segment_dir, ignore_errors=True)
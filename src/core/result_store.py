@@ -0,0 +1,380 @@
+"""Columnar in-memory store for crawled page results"""
+import copy
+import pickle
+import sys
+import threading
+import zlib
+from array import array
+from collections.abc import MutableMapping
+
+from src.core.seo_extractor import SEOExtractor
+
+# Fixed schema - the fields of SEOExtractor.create_result, in the same order
+FIELD_ORDER = tuple(SEOExtractor.create_result('', 0))
+FIELD_DEFAULTS = SEOExtractor.create_result('', 0)
+
+# Scalar columns in array buffers
+INT_FIELDS = ('status_code', 'size', 'depth', 'word_count', 'external_links', 'internal_links')
+FLOAT_FIELDS = ('response_time',)
+BOOL_FIELDS = ('is_internal',)
+
+# Strings that are mostly unique per page - one str reference per row
+STRING_FIELDS = ('url', 'title', 'meta_description', 'h1', 'canonical_url')
+
+# Strings with few distinct values across a site - dictionary-encoded to a 32-bit code per row
+CODED_FIELDS = ('content_type', 'lang', 'charset', 'viewport', 'robots', 'author', 'keywords',
+                'generator', 'theme_color')
+
+# Lists and dicts - stored sparsely, only for rows where they differ from the default, as one
+# compressed pickle per row
+NESTED_FIELDS = tuple(field for field in FIELD_ORDER
+                      if field not in INT_FIELDS + FLOAT_FIELDS + BOOL_FIELDS + STRING_FIELDS + CODED_FIELDS)
+
+COLUMN_TYPES = {
+    **{field: int for field in INT_FIELDS},
+    **{field: float for field in FLOAT_FIELDS},
+    **{field: bool for field in BOOL_FIELDS}
+}
+
+
+class ResultRow(MutableMapping):
+    """
+    Dict-like view of one row of a ResultStore, so result['title'] style access keeps working.
+
+    Assigning a key writes through to the store. Lists and dicts read from the view are
+    decoded copies - assign the changed value back to store it.
+    """
+
+    __slots__ = ('store', 'row_id')
+
+    def __init__(self, store, row_id):
+        self.store = store
+        self.row_id = row_id
+
+    def __getitem__(self, key):
+        return self.store.get_field(self.row_id, key)
+
+    def __setitem__(self, key, value):
+        self.store.set_field(self.row_id, key, value)
+
+    def __delitem__(self, key):
+        self.store.delete_field(self.row_id, key)
+
+    def __iter__(self):
+        return iter(self.store.row_keys(self.row_id))
+
+    def __len__(self):
+        return len(self.store.row_keys(self.row_id))
+
+    def copy(self):
+        """The row as a plain dict"""
+        return self.store.row_dict(self.row_id)
+
+    def __repr__(self):
+        return f"ResultRow({self.copy()!r})"
+
+
+class ResultStore:
+    """
+    Crawl results in columns instead of one ~40-key dict per page.
+
+    Numbers live in array buffers, low-cardinality strings are dictionary-encoded, and the nested
+    lists/dicts are kept only for rows where they are non-empty, pickled and zlib-compressed.
+    Values that don't fit their column (e.g. None for a number) and keys outside the schema are
+    kept per row in a sparse overflow dict, so every row reads back exactly as it was appended.
+
+    Behaves like the list it replaces for ResultLog: append/extend, len, integer indexing (returns
+    a ResultRow view), slicing and iteration (return plain dicts, e.g. for JSON and export) and
+    deleting rows from the front. Row ids passed to the view methods are absolute - they don't
+    change when front rows are deleted.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.offset = 0  # Absolute id of the first row still stored
+            self.count = 0
+            self.ints = {field: array('q') for field in INT_FIELDS}
+            self.floats = {field: array('d') for field in FLOAT_FIELDS}
+            self.bools = {field: array('b') for field in BOOL_FIELDS}
+            self.strings = {field: [] for field in STRING_FIELDS}
+            self.codes = {field: array('I') for field in CODED_FIELDS}
+            self.code_values = {field: [] for field in CODED_FIELDS}
+            self.code_lookup = {field: {} for field in CODED_FIELDS}
+            self.row_bytes = array('I')  # Approximate payload bytes per row, for memory_bytes()
+
+            # Sparse per-row data, keyed by absolute row id
+            self.nested = {}    # row id -> compressed pickle of the non-default nested fields
+            self.overflow = {}  # row id -> {field: value} for values that don't fit their column
+            self.layouts = {}   # row id -> the row's keys, for rows without exactly the schema keys in order
+            self.layout_lookup = {}  # Distinct layouts, shared between rows
+
+            self.payload_bytes = 0
+
+    # List interface
+
+    def append(self, row):
+        with self.lock:
+            row_id = self.offset + self.count
+            position = self.count
+            nested = {}
+            overflow = {}
+
+            for field in FIELD_ORDER:
+                if field not in row:
+                    continue
+                value = row[field]
+                if field in NESTED_FIELDS:
+                    if value != FIELD_DEFAULTS[field]:
+                        nested[field] = value
+                elif not self._fits(field, value):
+                    overflow[field] = value
+
+            keys = tuple(row)
+            for key in keys:
+                if key not in FIELD_DEFAULTS:
+                    overflow[key] = row[key]
+
+            for field in INT_FIELDS:
+                self.ints[field].append(0 if field in overflow or field not in row else row[field])
+            for field in FLOAT_FIELDS:
+                self.floats[field].append(0.0 if field in overflow or field not in row else row[field])
+            for field in BOOL_FIELDS:
+                self.bools[field].append(0 if field in overflow or field not in row else row[field])
+            for field in STRING_FIELDS:
+                value = '' if field in overflow or field not in row else str(row[field])
+                if field != 'url' and value and value == row.get('url'):
+                    value = self.strings['url'][-1]  # e.g. a self-referencing canonical
+                self.strings[field].append(value)
+            for field in CODED_FIELDS:
+                value = '' if field in overflow or field not in row else str(row[field])
+                self.codes[field].append(self._code(field, value))
+
+            if nested:
+                self.nested[row_id] = zlib.compress(pickle.dumps(nested, protocol=pickle.HIGHEST_PROTOCOL), 1)
+            if overflow:
+                self.overflow[row_id] = overflow
+            self._set_layout(row_id, keys)
+
+            payload = self._payload(row_id, position)
+            self.row_bytes.append(payload)
+            self.payload_bytes += payload
+            self.count += 1
+
+    def extend(self, rows):
+        with self.lock:
+            for row in rows:
+                self.append(row)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            with self.lock:
+                return [self.row_dict(self.offset + position) for position in range(*index.indices(self.count))]
+
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('result store index out of range')
+        return ResultRow(self, self.offset + index)
+
+    def __delitem__(self, index):
+        """Delete rows from the front (del store[:count]) - the only deletion ResultLog needs"""
+        if not isinstance(index, slice) or index.start not in (None, 0) or index.step not in (None, 1):
+            raise TypeError('ResultStore only supports deleting rows from the front')
+
+        with self.lock:
+            count = min(len(range(*index.indices(self.count))), self.count)
+            if count <= 0:
+                return
+
+            for columns in (self.ints, self.floats, self.bools, self.strings, self.codes):
+                for column in columns.values():
+                    del column[:count]
+            self.payload_bytes -= sum(self.row_bytes[:count])
+            del self.row_bytes[:count]
+
+            self.offset += count
+            self.count -= count
+            for sparse in (self.nested, self.overflow, self.layouts):
+                for row_id in [row_id for row_id in sparse if row_id < self.offset]:
+                    del sparse[row_id]
+
+    def __iter__(self):
+        """Iterate rows as plain dicts"""
+        position = 0
+        while True:
+            with self.lock:
+                if position >= self.count:
+                    return
+                row = self.row_dict(self.offset + position)
+            yield row
+            position += 1
+
+    # Row access by absolute id
+
+    def _fits(self, field, value):
+        column_type = COLUMN_TYPES.get(field)
+        if column_type is not None:
+            if type(value) is not column_type:
+                return False
+            return column_type is not int or -2 ** 63 <= value < 2 ** 63
+        return isinstance(value, str)
+
+    def _code(self, field, value):
+        lookup = self.code_lookup[field]
+        code = lookup.get(value)
+        if code is None:
+            code = len(self.code_values[field])
+            self.code_values[field].append(value)
+            lookup[value] = code
+        return code
+
+    def _position(self, row_id):
+        position = row_id - self.offset
+        if not 0 <= position < self.count:
+            raise IndexError(f"result row {row_id} is not in the store")
+        return position
+
+    def _nested(self, row_id):
+        """Decode a row's nested fields - a fresh copy on every call"""
+        blob = self.nested.get(row_id)
+        return pickle.loads(zlib.decompress(blob)) if blob else {}
+
+    def _column_value(self, row_id, position, field):
+        if field in INT_FIELDS:
+            return self.ints[field][position]
+        if field in FLOAT_FIELDS:
+            return self.floats[field][position]
+        if field in BOOL_FIELDS:
+            return bool(self.bools[field][position])
+        if field in STRING_FIELDS:
+            return self.strings[field][position]
+        if field in CODED_FIELDS:
+            return self.code_values[field][self.codes[field][position]]
+
+        # Nested fields are decoded copies, so callers can't change the stored value by accident
+        # Defaults only hold immutable values, so a shallow copy is enough
+        nested = self._nested(row_id)
+        return nested[field] if field in nested else copy.copy(FIELD_DEFAULTS[field])
+
+    def _payload(self, row_id, position):
+        """Approximate bytes a row holds outside the fixed-width columns"""
+        payload = sum(sys.getsizeof(self.strings[field][position]) for field in STRING_FIELDS
+                      if field == 'url' or self.strings[field][position] is not self.strings['url'][position])
+        if row_id in self.nested:
+            payload += sys.getsizeof(self.nested[row_id]) + 100  # plus the sparse dict entry
+        if row_id in self.overflow:
+            payload += sum(sys.getsizeof(value) for value in self.overflow[row_id].values()) + 300
+        if row_id in self.layouts:
+            payload += 100
+        return payload
+
+    def row_keys(self, row_id):
+        with self.lock:
+            self._position(row_id)
+            return self.layouts.get(row_id, FIELD_ORDER)
+
+    def get_field(self, row_id, key):
+        with self.lock:
+            position = self._position(row_id)
+            overflow = self.overflow.get(row_id)
+            if overflow and key in overflow:
+                return overflow[key]
+            if key not in self.layouts.get(row_id, FIELD_DEFAULTS):
+                raise KeyError(key)
+            return self._column_value(row_id, position, key)
+
+    def row_dict(self, row_id):
+        """One row as a plain dict, with its keys in their original order"""
+        with self.lock:
+            position = self._position(row_id)
+            overflow = self.overflow.get(row_id, {})
+            nested = self._nested(row_id)
+
+            values = {field: copy.copy(FIELD_DEFAULTS[field]) for field in NESTED_FIELDS if field not in nested}
+            values.update(nested)
+            values.update({field: self.ints[field][position] for field in INT_FIELDS})
+            values.update({field: self.floats[field][position] for field in FLOAT_FIELDS})
+            values.update({field: bool(self.bools[field][position]) for field in BOOL_FIELDS})
+            values.update({field: self.strings[field][position] for field in STRING_FIELDS})
+            values.update({field: self.code_values[field][self.codes[field][position]] for field in CODED_FIELDS})
+            values.update(overflow)
+
+            return {key: values[key] for key in self.layouts.get(row_id, FIELD_ORDER)}
+
+    def set_field(self, row_id, key, value):
+        with self.lock:
+            position = self._position(row_id)
+            overflow = self.overflow.get(row_id)
+            if overflow and key in overflow:
+                del overflow[key]
+                if not overflow:
+                    del self.overflow[row_id]
+
+            keys = self.layouts.get(row_id, FIELD_ORDER)
+            if key not in keys:
+                self._set_layout(row_id, keys + (key,))
+
+            if key in NESTED_FIELDS:
+                nested = self._nested(row_id)
+                if value != FIELD_DEFAULTS[key]:
+                    nested[key] = value
+                else:
+                    nested.pop(key, None)
+                if nested:
+                    self.nested[row_id] = zlib.compress(pickle.dumps(nested, protocol=pickle.HIGHEST_PROTOCOL), 1)
+                else:
+                    self.nested.pop(row_id, None)
+            elif key not in FIELD_DEFAULTS or not self._fits(key, value):
+                self.overflow.setdefault(row_id, {})[key] = value
+            elif key in INT_FIELDS:
+                self.ints[key][position] = value
+            elif key in FLOAT_FIELDS:
+                self.floats[key][position] = value
+            elif key in BOOL_FIELDS:
+                self.bools[key][position] = value
+            elif key in STRING_FIELDS:
+                self.strings[key][position] = str(value)
+            else:
+                self.codes[key][position] = self._code(key, str(value))
+
+            payload = self._payload(row_id, position)
+            self.payload_bytes += payload - self.row_bytes[position]
+            self.row_bytes[position] = payload
+
+    def delete_field(self, row_id, key):
+        with self.lock:
+            keys = self.row_keys(row_id)
+            if key not in keys:
+                raise KeyError(key)
+
+            # Reset the stored value, then drop the key from the row's layout
+            if key in FIELD_DEFAULTS:
+                self.set_field(row_id, key, copy.copy(FIELD_DEFAULTS[key]))
+            else:
+                del self.overflow[row_id][key]
+                if not self.overflow[row_id]:
+                    del self.overflow[row_id]
+            self._set_layout(row_id, tuple(field for field in keys if field != key))
+
+    def _set_layout(self, row_id, keys):
+        if keys == FIELD_ORDER:
+            self.layouts.pop(row_id, None)
+        else:
+            self.layouts[row_id] = self.layout_lookup.setdefault(keys, keys)
+
+    def memory_bytes(self):
+        """Approximate bytes held by the stored rows"""
+        with self.lock:
+            buffers = sum(column.itemsize * len(column)
+                          for columns in (self.ints, self.floats, self.bools, self.codes)
+                          for column in columns.values())
+            references = 8 * self.count * len(STRING_FIELDS)
+            distinct = sum(sys.getsizeof(value) for values in self.code_values.values() for value in values)
+            return buffers + references + distinct + self.row_bytes.itemsize * self.count + self.payload_bytes
@@ -0,0 +1,254 @@
+"""robots.txt fetching and caching, off the crawl's link-discovery path"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+ROBOTS_TTL = 3600        # seconds a fetched robots.txt is used
+ROBOTS_ERROR_TTL = 300   # seconds before a robots.txt that failed to fetch is retried
+ROBOTS_CACHE_SIZE = 10000  # robots.txt files kept in the shared cache
+ROBOTS_FETCH_WORKERS = 4
+
+
+class RobotsCache:
+    """Parsed robots.txt files by URL, each used until its TTL expires (LRU-evicted when full)"""
+
+    def __init__(self, max_entries=ROBOTS_CACHE_SIZE):
+        """
+        Initialize robots cache.
+
+        Args:
+            max_entries: Maximum robots.txt files kept
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # robots URL -> (parser, expires_at)
+        self.lock = threading.Lock()
+
+    def get(self, robots_url):
+        """The cached parser for a robots.txt URL, or None if it isn't cached or has expired"""
+        with self.lock:
+            entry = self.entries.get(robots_url)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self.entries[robots_url]
+                return None
+            self.entries.move_to_end(robots_url)
+            return entry[0]
+
+    def put(self, robots_url, parser, ttl):
+        with self.lock:
+            self.entries[robots_url] = (parser, time.time() + ttl)
+            self.entries.move_to_end(robots_url)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+# Shared by every crawl in the process
+shared_robots_cache = RobotsCache()
+
+
+class RobotsService:
+    """
+    Answers robots.txt checks without blocking the caller.
+
+    A URL whose host's robots.txt is cached is answered at once. Otherwise the robots.txt is
+    fetched on a small thread pool (once per host, through the crawler's session so its proxy
+    and headers apply) and the URL waits in the host's pending set; when the answer arrives,
+    the allowed pending URLs are passed to on_allowed and the others to on_rejected. Fetched
+    files go into the shared TTL cache, so later crawls in the process reuse them.
+    """
+
+    def __init__(self, session, user_agent='*', timeout=10, on_allowed=None, on_resolved=None,
+                 on_parked=None, on_rejected=None, cache=None, max_workers=ROBOTS_FETCH_WORKERS):
+        """
+        Initialize robots service.
+
+        Args:
+            session: requests.Session to fetch robots.txt files with
+            user_agent: User agent the rules are checked for
+            timeout: Fetch timeout in seconds
+            on_allowed: Called with (url, depth) for each pending URL its robots.txt allows
+            on_resolved: Called after a host's pending URLs have been answered
+            on_parked: Called with (url, depth) when a URL starts waiting for its robots.txt
+                       (under the service's lock, so always before its on_allowed/on_rejected)
+            on_rejected: Called with (url, depth) for each pending URL its robots.txt disallows
+            cache: RobotsCache to use (default: the process-wide shared cache)
+            max_workers: Concurrent robots.txt fetches
+        """
+        self.session = session
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.on_allowed = on_allowed
+        self.on_resolved = on_resolved
+        self.on_parked = on_parked
+        self.on_rejected = on_rejected
+        self.cache = cache if cache is not None else shared_robots_cache
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='robots')
+        self.pending = {}  # robots URL being fetched -> {url: depth} waiting for it
+        self.fetches = {}  # robots URL being fetched -> its fetch's Future
+        self.lock = threading.Lock()
+        self.closed = False
+
+    @staticmethod
+    def robots_url(url):
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+
+    def check(self, url, depth=0):
+        """
+        Whether robots.txt allows the URL.
+
+        Returns:
+            bool or None: True/False if the host's robots.txt is known; None if it is being
+                          fetched - the URL then waits for it and goes to on_allowed if allowed
+        """
+        robots_url = self.robots_url(url)
+        parser = self.cache.get(robots_url)
+        if parser is not None:
+            return self._can_fetch(parser, url)
+
+        with self.lock:
+            parser = self.cache.get(robots_url)
+            if parser is not None:
+                return self._can_fetch(parser, url)
+            if self.closed:
+                return True
+
+            waiting = self._start_fetch(robots_url)
+            if url not in waiting:
+                waiting[url] = depth
+                if self.on_parked:
+                    self.on_parked(url, depth)
+        return None
+
+    def parser(self, robots_url):
+        """
+        The parsed robots.txt, fetched (or the fetch under way waited for) if it isn't cached.
+        Blocks - for background threads only.
+
+        Returns:
+            RobotFileParser or None: None if the service was closed first
+        """
+        parser = self.cache.get(robots_url)
+        if parser is not None:
+            return parser
+
+        with self.lock:
+            parser = self.cache.get(robots_url)
+            if parser is not None:
+                return parser
+            if self.closed:
+                return None
+            self._start_fetch(robots_url)
+            future = self.fetches[robots_url]
+
+        try:
+            future.result()
+        except Exception:
+            return None  # Cancelled by close()
+        return self.cache.get(robots_url)
+
+    def sitemaps(self, robots_url):
+        """Sitemap URLs declared in a robots.txt (see parser - blocks if it isn't cached)"""
+        parser = self.parser(robots_url)
+        return list(parser.site_maps() or []) if parser else []
+
+    def crawl_delay(self, origin):
+        """Crawl-delay for a host (scheme://netloc) from its cached robots.txt, or None"""
+        parser = self.cache.get(f"{origin}/robots.txt")
+        if parser is None:
+            return None
+        try:
+            return parser.crawl_delay(self.user_agent)
+        except Exception:
+            return None
+
+    def pending_count(self):
+        """URLs waiting for a robots.txt"""
+        with self.lock:
+            return sum(len(waiting) for waiting in self.pending.values())
+
+    def _start_fetch(self, robots_url):
+        """Fetch a robots.txt unless it is being fetched; returns its waiting set (lock must be held)"""
+        waiting = self.pending.get(robots_url)
+        if waiting is None:
+            waiting = self.pending[robots_url] = {}
+            self.fetches[robots_url] = self.executor.submit(self._fetch, robots_url)
+        return waiting
+
+    def _can_fetch(self, parser, url):
+        try:
+            return parser.can_fetch(self.user_agent, url)
+        except Exception:
+            return True
+
+    def _fetch(self, robots_url):
+        """Fetch and cache a robots.txt, then answer the URLs waiting for it"""
+        parser, ttl = self._load(robots_url)
+        self.cache.put(robots_url, parser, ttl)
+
+        # Checks for this host are answered from the cache from now on, so no more URLs join
+        # the waiting set. It stays in pending until they are handed over, so they are never
+        # uncounted - neither pending here nor queued by the caller.
+        with self.lock:
+            waiting = dict(self.pending.get(robots_url, {}))
+            closed = self.closed
+
+        try:
+            if closed:
+                return
+            for url, depth in waiting.items():
+                if self._can_fetch(parser, url):
+                    if self.on_allowed:
+                        self.on_allowed(url, depth)
+                elif self.on_rejected:
+                    self.on_rejected(url, depth)
+            if self.on_resolved:
+                self.on_resolved()
+        except Exception as e:
+            print(f"Error releasing URLs waiting for {robots_url}: {e}")
+        finally:
+            with self.lock:
+                self.pending.pop(robots_url, None)
+                self.fetches.pop(robots_url, None)
+
+    def _load(self, robots_url):
+        """
+        Parser for a robots.txt and how long to cache it. Follows RobotFileParser.read():
+        401/403 disallow everything, other 4xx allow everything, 5xx disallow everything.
+        A failed fetch allows everything and is retried sooner.
+        """
+        parser = RobotFileParser(robots_url)
+        try:
+            response = self.session.get(robots_url, timeout=self.timeout)
+        except Exception as e:
+            print(f"Could not fetch {robots_url}: {e}")
+            parser.allow_all = True
+            return parser, ROBOTS_ERROR_TTL
+
+        status = response.status_code
+        if status in (401, 403):
+            parser.disallow_all = True
+        elif 400 <= status < 500:
+            parser.allow_all = True
+        elif status >= 500:
+            parser.disallow_all = True
+            return parser, ROBOTS_ERROR_TTL
+        else:
+            parser.parse(response.text.splitlines())
+        return parser, ROBOTS_TTL
+
+    def close(self):
+        """Stop fetching; URLs still waiting are dropped"""
+        with self.lock:
+            self.closed = True
+            self.pending.clear()
+            self.fetches.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
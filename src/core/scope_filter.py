@@ -0,0 +1,108 @@
+"""Crawl scope rules compiled once per configuration"""
+import re
+from functools import lru_cache
+from urllib.parse import urlparse
+
+URL_MEMO_SIZE = 65536  # URLs whose scope decision each filter remembers
+
+# Backreferences are numbered per pattern, so patterns using them can't be joined into one regex
+_BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+
+
+class ScopeFilter:
+    """
+    The crawl's static scope rules - external domain policy, file extensions and URL
+    include/exclude patterns - compiled once for a configuration.
+
+    Extensions are kept in sets and the include/exclude regexes are each combined into one
+    pattern. Decisions are memoized per URL. Picklable (the compiled state is rebuilt from
+    the rules), so it can be sent to worker processes. robots.txt is not part of the scope:
+    it changes as robots files are fetched, so callers check it separately.
+    """
+
+    def __init__(self, base_domain, crawl_external=False, include_extensions=(), exclude_extensions=(),
+                 include_patterns=(), exclude_patterns=()):
+        """
+        Initialize scope filter.
+
+        Args:
+            base_domain: Domain of the crawl; hosts equal to it (www. ignored) are internal
+            crawl_external: Allow URLs on other hosts
+            include_extensions: If set, only these (lowercase) path extensions are allowed
+            exclude_extensions: Path extensions that are never crawled
+            include_patterns: If set, URLs must match one of these regexes
+            exclude_patterns: URLs matching any of these regexes are not crawled
+        """
+        self.base_domain = base_domain or ''
+        self.crawl_external = bool(crawl_external)
+        self.include_extensions = frozenset(include_extensions or ())
+        self.exclude_extensions = frozenset(exclude_extensions or ())
+        self.include_patterns = tuple(pattern for pattern in include_patterns or () if pattern)
+        self.exclude_patterns = tuple(pattern for pattern in exclude_patterns or () if pattern)
+
+        self.internal_host = self.base_domain.replace('www.', '', 1)
+        self.include_regexes = self._compile(self.include_patterns)
+        self.exclude_regexes = self._compile(self.exclude_patterns)
+        self.allows = lru_cache(maxsize=URL_MEMO_SIZE)(self._allows)
+
+    @classmethod
+    def from_config(cls, config, base_domain):
+        """Scope filter for a crawler config dict"""
+        return cls(
+            base_domain,
+            crawl_external=config.get('crawl_external', False),
+            include_extensions=config.get('include_extensions', []),
+            exclude_extensions=config.get('exclude_extensions', []),
+            include_patterns=config.get('include_patterns', []),
+            exclude_patterns=config.get('exclude_patterns', [])
+        )
+
+    def __reduce__(self):
+        return (ScopeFilter, (self.base_domain, self.crawl_external, self.include_extensions,
+                              self.exclude_extensions, self.include_patterns, self.exclude_patterns))
+
+    @staticmethod
+    def _compile(patterns):
+        """Compiled regexes for a pattern list - one combined regex where the patterns allow it"""
+        compiled = []
+        for pattern in patterns:
+            try:
+                compiled.append(re.compile(pattern))
+            except re.error as e:
+                print(f"Ignoring invalid URL pattern {pattern!r}: {e}")
+
+        if len(compiled) > 1 and not any(_BACKREFERENCE.search(regex.pattern) for regex in compiled):
+            try:
+                return [re.compile('|'.join(f"(?:{regex.pattern})" for regex in compiled))]
+            except re.error:
+                pass  # e.g. inline global flags that are only allowed at the start of a pattern
+        return compiled
+
+    def is_internal(self, url):
+        """Whether the URL is on the crawl's domain (www. ignored)"""
+        return urlparse(url).netloc.replace('www.', '', 1) == self.internal_host
+
+    def _allows(self, url):
+        """Whether the URL is within the crawl's scope"""
+        parsed = urlparse(url)
+
+        # Check external domain policy
+        if not self.crawl_external and parsed.netloc.replace('www.', '', 1) != self.internal_host:
+            return False
+
+        # Check file extensions
+        path = parsed.path.lower()
+        if '.' in path:
+            extension = path.rsplit('.', 1)[1]
+            if extension in self.exclude_extensions:
+                return False
+            if self.include_extensions and extension not in self.include_extensions:
+                return False
+
+        # Check URL patterns
+        if any(regex.search(url) for regex in self.exclude_regexes):
+            return False
+        if self.include_regexes and not any(regex.search(url) for regex in self.include_regexes):
+            return False
+
+        return True
@@ -2,118 +2,23 @@
 import re
 import json
 from urllib.parse import urljoin, urlparse
+from bs4 import BeautifulSoup
+from src.core.html_document import SoupDocument
+
+# <meta name=...> values copied to their own result fields
+NAMED_META_FIELDS = {
+    'viewport': 'viewport',
+    'robots': 'robots',
+    'author': 'author',
+    'keywords': 'keywords',
+    'generator': 'generator',
+    'theme-color': 'theme_color'
+}
 
 
 class SEOExtractor:
     """Extracts SEO-related data from HTML content"""
 
-    @staticmethod
-    def extract_basic_seo_data(soup, result):
-        """Extract basic SEO data (title, headings, meta description, etc.)"""
-        # Extract title
-        title_tag = soup.find('title')
-        result['title'] = title_tag.get_text().strip() if title_tag else ''
-
-        # Extract meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        result['meta_description'] = meta_desc.get('content', '').strip() if meta_desc else ''
-
-        # Extract headings
-        h1_tag = soup.find('h1')
-        result['h1'] = h1_tag.get_text().strip() if h1_tag else ''
-
-        h2_tags = soup.find_all('h2')
-        result['h2'] = [h2.get_text().strip() for h2 in h2_tags[:10]]
-
-        h3_tags = soup.find_all('h3')
-        result['h3'] = [h3.get_text().strip() for h3 in h3_tags[:10]]
-
-        # Count words
-        text_content = soup.get_text()
-        words = re.findall(r'\b\w+\b', text_content)
-        result['word_count'] = len(words)
-
-        # Extract language
-        html_tag = soup.find('html')
-        result['lang'] = html_tag.get('lang', '') if html_tag else ''
-
-        # Extract charset
-        charset_meta = soup.find('meta', attrs={'charset': True})
-        if charset_meta:
-            result['charset'] = charset_meta.get('charset', '')
-        else:
-            content_type_meta = soup.find('meta', attrs={'http-equiv': 'Content-Type'})
-            if content_type_meta:
-                content = content_type_meta.get('content', '')
-                charset_match = re.search(r'charset=([^;]+)', content)
-                result['charset'] = charset_match.group(1) if charset_match else ''
-
-    @staticmethod
-    def extract_meta_tags(soup, result):
-        """Extract all meta tags"""
-        meta_tags = soup.find_all('meta')
-
-        for meta in meta_tags:
-            name = meta.get('name', '').lower()
-            content = meta.get('content', '')
-
-            if name:
-                result['meta_tags'][name] = content
-
-                # Extract specific important meta tags
-                if name == 'viewport':
-                    result['viewport'] = content
-                elif name == 'robots':
-                    result['robots'] = content
-                elif name == 'author':
-                    result['author'] = content
-                elif name == 'keywords':
-                    result['keywords'] = content
-                elif name == 'generator':
-                    result['generator'] = content
-                elif name == 'theme-color':
-                    result['theme_color'] = content
-
-        # Extract canonical URL
-        canonical = soup.find('link', attrs={'rel': 'canonical'})
-        result['canonical_url'] = canonical.get('href', '') if canonical else ''
-
-    @staticmethod
-    def extract_opengraph_tags(soup, result):
-        """Extract OpenGraph meta tags"""
-        og_metas = soup.find_all('meta', attrs={'property': re.compile(r'^og:')})
-
-        for meta in og_metas:
-            property_name = meta.get('property', '')
-            content = meta.get('content', '')
-            if property_name:
-                key = property_name.replace('og:', '')
-                result['og_tags'][key] = content
-
-    @staticmethod
-    def extract_twitter_tags(soup, result):
-        """Extract Twitter Card meta tags"""
-        twitter_metas = soup.find_all('meta', attrs={'name': re.compile(r'^twitter:')})
-
-        for meta in twitter_metas:
-            name = meta.get('name', '')
-            content = meta.get('content', '')
-            if name:
-                key = name.replace('twitter:', '')
-                result['twitter_tags'][key] = content
-
-    @staticmethod
-    def extract_json_ld(soup, result):
-        """Extract JSON-LD structured data"""
-        json_ld_scripts = soup.find_all('script', attrs={'type': 'application/ld+json'})
-
-        for script in json_ld_scripts:
-            try:
-                json_data = json.loads(script.string)
-                result['json_ld'].append(json_data)
-            except (json.JSONDecodeError, AttributeError, TypeError):
-                continue
-
     @staticmethod
     def extract_analytics_tracking(soup, html_content, result):
         """Detect analytics and tracking scripts"""
@@ -156,113 +61,260 @@ class SEOExtractor:
             result['analytics']['mixpanel'] = True
 
     @staticmethod
-    def extract_images(soup, base_url, result):
-        """Extract image information"""
-        images = soup.find_all('img')
-
-        for img in images[:20]:  # Limit to first 20 images
-            src = img.get('src', '')
-            alt = img.get('alt', '')
-
-            if src:
-                # Convert relative URLs to absolute
-                if src.startswith('//'):
-                    src = 'https:' + src
-                elif src.startswith('/'):
-                    parsed_base = urlparse(base_url)
-                    src = f"{parsed_base.scheme}://{parsed_base.netloc}{src}"
-                elif not src.startswith(('http://', 'https://')):
-                    src = urljoin(base_url, src)
-
-                result['images'].append({
-                    'src': src,
-                    'alt': alt,
-                    'width': img.get('width', ''),
-                    'height': img.get('height', '')
-                })
+    def extract_page(document, html_content, result, base_domain, page_text=None):
+        """
+        Extract every SEO field in a single pass over the parsed document.
+
+        Visits every element once instead of re-walking the tree for each field. Works on any
+        parser backend through the html_document adapter interface (a BeautifulSoup
+        object is also accepted). If a page_text list is given, the page's content
+        text is appended to it.
+
+        Returns:
+            list: Link records (clean_url, target_domain, anchor_text, placement) for
+                  every crawlable <a href>, in document order
+        """
+        if isinstance(document, BeautifulSoup):
+            document = SoupDocument(document)
+
+        page_url = result['url']
+        base_domain_clean = base_domain.replace('www.', '', 1)
+        get_text = document.get_text
+        text_parts = []
+        link_records = []
+
+        title = h1 = meta_description = canonical = lang = None
+        charset = http_equiv_charset = None
+        image_count = 0
+
+        # Placement and enclosing microdata items for the children of each element,
+        # keyed by id() so each element inherits its parent's context in O(1)
+        context = {document.root_key: ('body', ())}
+
+        for event in document.events():
+            if isinstance(event, str):
+                text_parts.append(event)
+                continue
 
-    @staticmethod
-    def extract_link_counts(soup, result, base_domain):
-        """Count internal vs external links"""
-        links = soup.find_all('a', href=True)
+            name, attrs, key, parent_key, node = event
+            placement, items = context[parent_key]
+
+            # Microdata properties belong to every enclosing itemtype element
+            if items and 'itemprop' in attrs:
+                SEOExtractor._add_microdata_property(name, attrs, node, get_text, items)
 
-        for link in links:
-            href = link.get('href', '')
-            if href and not href.startswith(('#', 'mailto:', 'tel:', 'javascript:')):
-                absolute_url = urljoin(result['url'], href)
-                parsed_url = urlparse(absolute_url)
+            # Work out the context this element passes on to its children
+            own_placement = SEOExtractor._element_placement(name, attrs)
+            child_items = items
+            itemtype = attrs.get('itemtype')
+            if itemtype:
+                schema_item = {'type': itemtype, 'properties': {}}
+                result['schema_org'].append(schema_item)
+                child_items = items + (schema_item['properties'],)
+            if own_placement or child_items is not items:
+                context[key] = (own_placement or placement, child_items)
+            else:
+                context[key] = (placement, items)
+
+            if name == 'a':
+                href = attrs.get('href')
+                if href is not None:
+                    SEOExtractor._process_anchor(get_text(node), href, placement, page_url,
+                                                 base_domain_clean, result, link_records)
+            elif name == 'meta':
+                meta_name = attrs.get('name', '')
+                content = attrs.get('content', '')
+
+                if meta_description is None and meta_name == 'description':
+                    meta_description = content.strip()
+                if charset is None and 'charset' in attrs:
+                    charset = attrs.get('charset', '')
+                if http_equiv_charset is None and attrs.get('http-equiv') == 'Content-Type':
+                    charset_match = re.search(r'charset=([^;]+)', content)
+                    http_equiv_charset = charset_match.group(1) if charset_match else ''
+
+                if meta_name:
+                    SEOExtractor._apply_named_meta(meta_name.lower(), content, result)
+                    if meta_name.startswith('twitter:'):
+                        result['twitter_tags'][meta_name.replace('twitter:', '')] = content
+
+                property_name = attrs.get('property', '')
+                if property_name and property_name.startswith('og:'):
+                    result['og_tags'][property_name.replace('og:', '')] = content
+            elif name == 'img':
+                if image_count < 20:  # Limit to first 20 images
+                    SEOExtractor._add_image(attrs, page_url, result)
+                image_count += 1
+            elif name == 'link':
+                rel = attrs.get('rel', [])
+                if isinstance(rel, str):
+                    rel = [rel]
+                if canonical is None and 'canonical' in rel:
+                    canonical = attrs.get('href', '')
+                if 'alternate' in rel and attrs.get('hreflang') is not None:
+                    hreflang = attrs.get('hreflang', '')
+                    href = attrs.get('href', '')
+                    if hreflang and href:
+                        result['hreflang'].append({'lang': hreflang, 'url': href})
+            elif name == 'script':
+                if attrs.get('type') == 'application/ld+json':
+                    try:
+                        result['json_ld'].append(json.loads(document.get_string(node)))
+                    except (json.JSONDecodeError, AttributeError, TypeError):
+                        pass
+            elif name == 'title':
+                if title is None:
+                    title = get_text(node).strip()
+            elif name == 'h1':
+                if h1 is None:
+                    h1 = get_text(node).strip()
+            elif name == 'h2' or name == 'h3':
+                if len(result[name]) < 10:
+                    result[name].append(get_text(node).strip())
+            elif name == 'html':
+                if lang is None:
+                    lang = attrs.get('lang', '')
+
+        result['title'] = title or ''
+        result['meta_description'] = meta_description or ''
+        result['h1'] = h1 or ''
+        text = ''.join(text_parts)
+        result['word_count'] = len(re.findall(r'\b\w+\b', text))
+        if page_text is not None:
+            page_text.append(text)
+        result['lang'] = lang or ''
+        if charset is not None:
+            result['charset'] = charset
+        elif http_equiv_charset is not None:
+            result['charset'] = http_equiv_charset
+        result['canonical_url'] = canonical or ''
+
+        # Analytics detection works on the raw HTML, not the tree
+        SEOExtractor.extract_analytics_tracking(document, html_content, result)
+
+        return link_records
 
-                # Handle www vs non-www domains
-                url_domain_clean = parsed_url.netloc.replace('www.', '', 1)
-                base_domain_clean = base_domain.replace('www.', '', 1)
+    @staticmethod
+    def _apply_named_meta(name, content, result):
+        """Record a <meta name=...> tag and the important fields it maps to"""
+        result['meta_tags'][name] = content
+        field = NAMED_META_FIELDS.get(name)
+        if field:
+            result[field] = content
 
-                if url_domain_clean == base_domain_clean:
-                    result['internal_links'] += 1
-                else:
-                    result['external_links'] += 1
+    @staticmethod
+    def _add_image(attrs, base_url, result):
+        """Append an <img> to the result with its src made absolute"""
+        src = attrs.get('src', '')
+        if not src:
+            return
+
+        if src.startswith('//'):
+            src = 'https:' + src
+        elif src.startswith('/'):
+            parsed_base = urlparse(base_url)
+            src = f"{parsed_base.scheme}://{parsed_base.netloc}{src}"
+        elif not src.startswith(('http://', 'https://')):
+            src = urljoin(base_url, src)
+
+        result['images'].append({
+            'src': src,
+            'alt': attrs.get('alt', ''),
+            'width': attrs.get('width', ''),
+            'height': attrs.get('height', '')
+        })
 
     @staticmethod
-    def extract_hreflang(soup, result):
-        """Extract hreflang links"""
-        hreflang_links = soup.find_all('link', attrs={'rel': 'alternate', 'hreflang': True})
-
-        for link in hreflang_links:
-            hreflang = link.get('hreflang', '')
-            href = link.get('href', '')
-            if hreflang and href:
-                result['hreflang'].append({
-                    'lang': hreflang,
-                    'url': href
-                })
+    def _process_anchor(link_text, href, placement, page_url, base_domain_clean, result, link_records):
+        """Count an <a href> as internal/external and record it for link collection"""
+        stripped = href.strip()
+        record = None
+
+        # Link record, as used by the Links tab and the crawl queue
+        if stripped and not stripped.startswith(('#', 'mailto:', 'tel:')):
+            try:
+                parsed = urlparse(urljoin(page_url, stripped))
+                clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+                if parsed.query:
+                    clean_url += f"?{parsed.query}"
+                anchor_text = link_text.strip()[:100]
+                record = (clean_url, parsed.netloc, anchor_text, placement)
+                link_records.append(record)
+            except ValueError:
+                pass
+
+        # Internal/external counts (from the raw href, which may differ from the crawlable link above)
+        if href and not href.startswith(('#', 'mailto:', 'tel:', 'javascript:')):
+            if record and href == stripped:
+                netloc = record[1]
+            else:
+                try:
+                    netloc = urlparse(urljoin(page_url, href)).netloc
+                except ValueError:
+                    return
+
+            if netloc.replace('www.', '', 1) == base_domain_clean:
+                result['internal_links'] += 1
+            else:
+                result['external_links'] += 1
 
     @staticmethod
-    def extract_schema_org(soup, result):
-        """Extract Schema.org microdata"""
-        schema_items = soup.find_all(attrs={'itemtype': True})
+    def _element_placement(name, attrs):
+        """Placement (footer/navigation) an element implies for the links inside it, or None"""
+        if name == 'footer':
+            return 'footer'
 
-        for item in schema_items:
-            itemtype = item.get('itemtype', '')
-            if itemtype:
-                result['schema_org'].append({
-                    'type': itemtype,
-                    'properties': SEOExtractor._extract_microdata_properties(item)
-                })
+        classes = attrs.get('class')
+        element_id = attrs.get('id')
+        if not classes and not element_id:
+            return 'navigation' if name in ('nav', 'header') else None
+
+        if isinstance(classes, str):
+            classes = [classes]
+        classes_str = ' '.join(classes).lower() if classes else ''
+        element_id = element_id.lower() if element_id else ''
+
+        if 'footer' in classes_str or 'footer' in element_id:
+            return 'footer'
+
+        if name in ('nav', 'header'):
+            return 'navigation'
+
+        if any(keyword in classes_str or keyword in element_id
+               for keyword in ('nav', 'menu', 'header')):
+            return 'navigation'
+
+        return None
 
     @staticmethod
-    def _extract_microdata_properties(element):
-        """Extract microdata properties from an element"""
-        properties = {}
-
-        # Find all elements with itemprop
-        prop_elements = element.find_all(attrs={'itemprop': True})
-
-        for prop_elem in prop_elements:
-            prop_name = prop_elem.get('itemprop', '')
-
-            # Get content based on element type
-            if prop_elem.name in ['meta']:
-                content = prop_elem.get('content', '')
-            elif prop_elem.name in ['img']:
-                content = prop_elem.get('src', '')
-            elif prop_elem.name in ['a']:
-                content = prop_elem.get('href', '')
-            else:
-                content = prop_elem.get_text().strip()
+    def _add_microdata_property(name, attrs, node, get_text, items):
+        """Add an itemprop element's value to each enclosing microdata item"""
+        prop_name = attrs.get('itemprop', '')
+        if not prop_name:
+            return
+
+        if name == 'meta':
+            content = attrs.get('content', '')
+        elif name == 'img':
+            content = attrs.get('src', '')
+        elif name == 'a':
+            content = attrs.get('href', '')
+        else:
+            content = get_text(node).strip()
 
-            if prop_name and content:
+        if content:
+            for properties in items:
                 properties[prop_name] = content
 
-        return properties
-
     @staticmethod
-    def create_empty_result(url, depth, status_code=0, error=None):
-        """Create an empty result structure"""
+    def create_result(url, depth, status_code=0, content_type='', size=0, is_internal=False):
+        """Create a result structure with every field at its default value"""
         return {
             'url': url,
             'status_code': status_code,
-            'content_type': '',
-            'size': 0,
-            'is_internal': False,
+            'content_type': content_type,
+            'size': size,
+            'is_internal': is_internal,
             'depth': depth,
             'title': '',
             'meta_description': '',
@@ -299,6 +351,12 @@ class SEOExtractor:
             'redirects': [],
             'hreflang': [],
             'schema_org': [],
-            'linked_from': [],
-            'error': error
+            'linked_from': []
         }
+
+    @staticmethod
+    def create_empty_result(url, depth, status_code=0, error=None):
+        """Create an empty result structure"""
+        result = SEOExtractor.create_result(url, depth, status_code)
+        result['error'] = error
+        return result
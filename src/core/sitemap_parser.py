@@ -1,16 +1,43 @@
 """Sitemap discovery and parsing"""
-import gzip
+import threading
+import zlib
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from urllib.parse import urlparse
 
+from src.core.url_set import make_seen_set
+
+SITEMAP_FETCH_WORKERS = 8   # Sitemap files fetched and parsed at once
+MAX_SITEMAP_DEPTH = 10      # Nesting limit for sitemap indexes
+READ_CHUNK_SIZE = 64 * 1024
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Child elements read from <url> and <sitemap> entries
+ENTRY_FIELDS = ('loc', 'lastmod', 'priority')
+
 
 class SitemapParser:
     """Discovers and parses sitemap.xml files"""
 
-    def __init__(self, session, base_domain, timeout=10):
+    def __init__(self, session, base_domain, timeout=10, max_workers=SITEMAP_FETCH_WORKERS, robots=None):
+        """
+        Initialize sitemap parser.
+
+        Args:
+            session: requests.Session to fetch sitemaps (and robots.txt, without a robots service) with
+            base_domain: Domain of the crawl
+            timeout: Fetch timeout in seconds
+            max_workers: Sitemap files fetched and parsed concurrently
+            robots: RobotsService to read the sitemaps declared in robots.txt from, so the file
+                    is fetched once and shared with the crawl's robots checks
+        """
         self.session = session
         self.base_domain = base_domain
         self.timeout = timeout
+        self.max_workers = max_workers
+        self.robots = robots
 
     def discover_sitemaps(self, base_url):
         """
@@ -19,6 +46,31 @@ class SitemapParser:
         Returns:
             list: List of URLs found in sitemaps
         """
+        return [url for url, lastmod in self.discover_sitemap_entries(base_url)]
+
+    def discover_sitemap_entries(self, base_url):
+        """
+        Discover and parse sitemap.xml files, keeping each URL's <lastmod>
+
+        Returns:
+            list: List of (url, lastmod) tuples; lastmod is a naive UTC datetime or None
+        """
+        entries = []
+        discovery = self.start_discovery(base_url, lambda url, lastmod, priority: entries.append((url, lastmod)))
+        discovery.wait()
+        return entries
+
+    def start_discovery(self, base_url, on_entry):
+        """
+        Discover and parse the site's sitemaps in the background (see SitemapDiscovery).
+
+        Args:
+            base_url: Any URL of the site
+            on_entry: Called with (url, lastmod, priority) for each distinct URL, as it is parsed
+
+        Returns:
+            SitemapDiscovery: The running discovery
+        """
         parsed_base = urlparse(base_url)
         base_domain = f"{parsed_base.scheme}://{parsed_base.netloc}"
 
@@ -30,103 +82,240 @@ class SitemapParser:
             f"{base_domain}/sitemap/sitemap.xml"
         ]
 
-        # Check robots.txt for sitemap declarations
-        robots_sitemaps = self._get_sitemaps_from_robots(base_domain)
-        sitemap_urls.extend(robots_sitemaps)
-
         print(f"Discovering sitemaps for {base_domain}...")
+        discovery = SitemapDiscovery(self.session, self.timeout, on_entry, self.max_workers, self.robots)
+        discovery.start(sitemap_urls, f"{base_domain}/robots.txt")
+        return discovery
 
-        all_urls = []
-        for sitemap_url in sitemap_urls:
-            try:
-                urls = self._parse_sitemap(sitemap_url, depth=1)
-                all_urls.extend(urls)
-            except Exception as e:
-                print(f"Failed to parse sitemap {sitemap_url}: {e}")
-
-        return all_urls
+    @staticmethod
+    def parse_lastmod(value):
+        """Parse a W3C datetime <lastmod> value into a naive UTC datetime (None if invalid)"""
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
 
-    def _get_sitemaps_from_robots(self, base_domain):
-        """Extract sitemap URLs from robots.txt"""
-        sitemaps = []
+    @staticmethod
+    def parse_priority(value):
+        """Parse a <priority> value (0.0-1.0), None if missing or invalid"""
         try:
-            robots_url = f"{base_domain}/robots.txt"
-            response = self.session.get(robots_url, timeout=self.timeout)
+            return float(value) if value else None
+        except ValueError:
+            return None
 
-            if response.status_code == 200:
-                for line in response.text.split('\n'):
-                    line = line.strip()
-                    if line.lower().startswith('sitemap:'):
-                        sitemap_url = line.split(':', 1)[1].strip()
-                        sitemaps.append(sitemap_url)
 
-        except Exception as e:
-            print(f"Could not fetch robots.txt: {e}")
+class SitemapDiscovery:
+    """
+    One run of sitemap discovery.
 
-        return sitemaps
+    Sitemap files (the common locations, those declared in robots.txt and every child of a
+    sitemap index) are fetched on a thread pool, so index children are read concurrently.
+    Each file is streamed - gzip is decompressed and XML parsed incrementally, chunk by chunk -
+    and its URLs go to on_entry as they are parsed, from the worker threads. URLs and sitemap
+    files are de-duplicated across overlapping sitemaps; URLs in a compact fingerprint set.
+    """
+
+    def __init__(self, session, timeout, on_entry, max_workers=SITEMAP_FETCH_WORKERS, robots=None):
+        """
+        Initialize sitemap discovery.
 
-    def _parse_sitemap(self, sitemap_url, depth=1, max_depth=10):
+        Args:
+            session: requests.Session to fetch sitemaps (and robots.txt, without a robots service) with
+            timeout: Fetch timeout in seconds
+            on_entry: Called with (url, lastmod, priority) for each distinct URL
+            max_workers: Sitemap files fetched and parsed concurrently
+            robots: RobotsService to read the sitemaps declared in robots.txt from
         """
-        Parse a sitemap.xml file and extract URLs
+        self.session = session
+        self.timeout = timeout
+        self.on_entry = on_entry
+        self.robots = robots
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sitemap')
+        self.cancelled = threading.Event()
+
+        self.lock = threading.Lock()
+        self.finished = threading.Condition(self.lock)
+        self.pending = 0  # Sitemap files (and the robots.txt) queued or being read
+        self.seen_sitemaps = set()
+        self.seen_urls = make_seen_set('fingerprint')
+        self.sitemap_count = 0
+
+    def start(self, sitemap_urls, robots_url):
+        """Start reading the given sitemaps, and those declared in robots.txt"""
+        # Held until everything is submitted, so discovery can't look finished in between
+        with self.lock:
+            self.pending += 2
+        self.executor.submit(self._run, self._read_robots, robots_url)
+        for sitemap_url in sitemap_urls:
+            self._submit_sitemap(sitemap_url, 1)
+        self._file_done()
+
+    def pending_count(self):
+        """Sitemap files not read yet - more URLs may still arrive while this is above 0"""
+        with self.lock:
+            return self.pending
+
+    def wait(self, timeout=None):
+        """
+        Block until every sitemap has been read (or the discovery is cancelled).
 
         Returns:
-            list: List of URLs found in the sitemap
+            bool: True if discovery finished within the timeout
         """
-        if depth > max_depth:
-            return []
+        with self.lock:
+            return self.finished.wait_for(lambda: self.pending == 0, timeout)
+
+    def cancel(self):
+        """Stop reading sitemaps; files being read stop at their next chunk"""
+        self.cancelled.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        with self.lock:
+            self.pending = 0
+            self.finished.notify_all()
 
+    def _submit_sitemap(self, sitemap_url, depth):
+        if depth > MAX_SITEMAP_DEPTH or self.cancelled.is_set():
+            return
+        with self.lock:
+            if sitemap_url in self.seen_sitemaps:
+                return
+            self.seen_sitemaps.add(sitemap_url)
+            self.pending += 1
         try:
-            print(f"Parsing sitemap: {sitemap_url}")
-            response = self.session.get(sitemap_url, timeout=self.timeout)
+            self.executor.submit(self._run, self._read_sitemap, sitemap_url, depth)
+        except RuntimeError:
+            self._file_done()  # Cancelled meanwhile
+
+    def _run(self, read, *args):
+        try:
+            if not self.cancelled.is_set():
+                read(*args)
+        except Exception as e:
+            print(f"Error reading {args[0]}: {e}")
+        finally:
+            self._file_done()
+
+    def _file_done(self):
+        with self.lock:
+            if self.pending == 0:
+                return  # Cancelled
+            self.pending -= 1
+            if self.pending == 0:
+                print(f"Sitemap discovery finished: {len(self.seen_urls)} URLs in {self.sitemap_count} sitemaps")
+                self.finished.notify_all()
+
+    def _read_robots(self, robots_url):
+        """Queue the sitemaps declared in robots.txt"""
+        if self.robots:
+            # From the robots service's cache - fetched there if the crawl hasn't yet
+            for sitemap_url in self.robots.sitemaps(robots_url):
+                self._submit_sitemap(sitemap_url, 1)
+            return
+
+        try:
+            response = self.session.get(robots_url, timeout=self.timeout)
+        except Exception as e:
+            print(f"Could not fetch robots.txt: {e}")
+            return
 
+        if response.status_code == 200:
+            for line in response.text.split('\n'):
+                line = line.strip()
+                if line.lower().startswith('sitemap:'):
+                    self._submit_sitemap(line.split(':', 1)[1].strip(), 1)
+
+    def _read_sitemap(self, sitemap_url, depth):
+        """Stream one sitemap file, queueing nested sitemaps and passing on new URLs"""
+        response = self.session.get(sitemap_url, timeout=self.timeout, stream=True)
+        try:
             if response.status_code != 200:
-                return []
+                return
+
+            print(f"Parsing sitemap: {sitemap_url}")
+            with self.lock:
+                self.sitemap_count += 1
+
+            url_count = nested_count = 0
+            for kind, loc, lastmod, priority in self._stream_entries(response, sitemap_url):
+                if self.cancelled.is_set():
+                    return
+                if kind == 'sitemap':
+                    nested_count += 1
+                    self._submit_sitemap(loc, depth + 1)
+                    continue
+
+                url_count += 1
+                with self.lock:
+                    if loc in self.seen_urls:
+                        continue
+                    self.seen_urls.add(loc)
+                self.on_entry(loc, SitemapParser.parse_lastmod(lastmod), SitemapParser.parse_priority(priority))
 
-            # Handle compressed sitemaps
-            content = response.content
-            if sitemap_url.endswith('.gz') or response.headers.get('content-encoding') == 'gzip':
-                try:
-                    content = gzip.decompress(content)
-                except:
-                    pass
+            if nested_count:
+                print(f"Found sitemap index with {nested_count} nested sitemaps")
+            if url_count:
+                print(f"Found {url_count} URLs in sitemap")
+        finally:
+            response.close()
+
+    def _stream_entries(self, response, sitemap_url):
+        """
+        Yield ('url' or 'sitemap', loc, lastmod, priority) for each entry of a sitemap file,
+        parsing it chunk by chunk. Parsed entries are dropped from the tree as they are read.
+        """
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        decompressor = None
+        stack = []  # Local names of the open elements
+        root = None
+        fields = {}
+
+        chunks = response.iter_content(READ_CHUNK_SIZE)
+        first_chunk = True
+        while True:
+            chunk = next(chunks, None)
+            if self.cancelled.is_set():
+                return
 
-            # Parse XML
             try:
-                root = ET.fromstring(content)
-            except ET.ParseError as e:
+                if chunk is None:
+                    if decompressor:
+                        parser.feed(decompressor.flush())
+                    parser.close()
+                else:
+                    # Gzipped sitemaps (.xml.gz) - Content-Encoding: gzip is already decoded by requests
+                    if first_chunk:
+                        first_chunk = False
+                        if chunk[:2] == GZIP_MAGIC:
+                            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    if decompressor:
+                        chunk = decompressor.decompress(chunk)
+                    parser.feed(chunk)
+            except (ET.ParseError, zlib.error) as e:
                 print(f"XML parse error for {sitemap_url}: {e}")
-                return []
-
-            # Remove namespace prefixes for easier parsing
-            for elem in root.iter():
-                if '}' in elem.tag:
-                    elem.tag = elem.tag.split('}')[1]
-
-            all_urls = []
-
-            # Check if this is a sitemap index (contains other sitemaps)
-            sitemaps = root.findall('.//sitemap')
-            if sitemaps:
-                print(f"Found sitemap index with {len(sitemaps)} nested sitemaps")
-                for sitemap in sitemaps:
-                    loc_elem = sitemap.find('loc')
-                    if loc_elem is not None and loc_elem.text:
-                        nested_url = loc_elem.text.strip()
-                        nested_urls = self._parse_sitemap(nested_url, depth + 1, max_depth)
-                        all_urls.extend(nested_urls)
-
-            # Extract URLs from sitemap
-            urls = root.findall('.//url')
-            if urls:
-                print(f"Found {len(urls)} URLs in sitemap")
-                for url_elem in urls:
-                    loc_elem = url_elem.find('loc')
-                    if loc_elem is not None and loc_elem.text:
-                        url = loc_elem.text.strip()
-                        all_urls.append(url)
-
-            return all_urls
+                return
 
-        except Exception as e:
-            print(f"Error parsing sitemap {sitemap_url}: {e}")
-            return []
+            for event, element in parser.read_events():
+                name = element.tag.rpartition('}')[2]
+                if event == 'start':
+                    if root is None:
+                        root = element
+                    stack.append(name)
+                    continue
+
+                stack.pop()
+                parent = stack[-1] if stack else None
+                if name in ENTRY_FIELDS and parent in ('url', 'sitemap'):
+                    fields[name] = (element.text or '').strip()
+                elif name in ('url', 'sitemap'):
+                    if fields.get('loc'):
+                        yield name, fields['loc'], fields.get('lastmod'), fields.get('priority')
+                    fields = {}
+                    root.clear()
+
+            if chunk is None:
+                return
@@ -6,17 +6,224 @@ Enables crash recovery and historical crawl access
 import sqlite3
 import json
 import time
+import os
+import queue
+import atexit
+import threading
 from datetime import datetime
 from contextlib import contextmanager
 
 # Database file location (same as auth database)
 DB_FILE = 'users.db'
 
+# Connection tuning
+DB_TIMEOUT = 30             # Seconds to wait for a lock held by another connection
+DB_CACHE_SIZE_KB = 32768    # Page cache per connection
+WRITE_QUEUE_SIZE = 256      # Pending writes before callers block
+WRITE_BATCH_SIZE = 64       # Writes committed together in one transaction
+READER_POOL_SIZE = 8        # Idle read connections kept open
+
+# Owner of a crawl's HTTP cache entries: its user, or its session for guest crawls
+CACHE_OWNER_SQL = '''
+    SELECT CASE WHEN user_id IS NOT NULL THEN 'user:' || user_id ELSE 'session:' || session_id END
+    FROM crawls WHERE id = ?
+'''
+
+def _connect(db_file):
+    """Open a connection with the shared tuning applied"""
+    conn = sqlite3.connect(db_file, timeout=DB_TIMEOUT, check_same_thread=False)
+    conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+    conn.execute('PRAGMA synchronous = NORMAL')  # Safe in WAL mode; fsync at checkpoints only
+    conn.execute(f'PRAGMA cache_size = -{DB_CACHE_SIZE_KB}')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    return conn
+
+class _WriteJob:
+    """A write waiting for the writer thread"""
+
+    def __init__(self, write):
+        self.write = write
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+class DatabaseWriter:
+    """
+    Single writer thread for one database file.
+
+    All writes run on one long-lived connection in WAL mode, so concurrent crawls no longer
+    open a connection per write and fight over the database lock. Writes arrive through a
+    bounded queue; whatever is queued when the writer wakes up (up to WRITE_BATCH_SIZE writes)
+    is committed in one transaction, so many small writes share one commit. Each write runs in
+    its own savepoint - a failing write is rolled back alone and its error is raised to its
+    caller.
+    """
+
+    def __init__(self, db_file):
+        """
+        Initialize writer.
+
+        Args:
+            db_file: Database file path
+        """
+        self.db_file = db_file
+        self.queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self.conn = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, write, wait=True):
+        """
+        Queue write(conn) to run on the writer connection (blocks while the queue is full).
+
+        Returns:
+            The write's return value if wait is true (its exception is re-raised), else the queued job
+        """
+        job = _WriteJob(write)
+        self.queue.put(job)
+        if not wait:
+            return job
+
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def flush(self):
+        """Wait until every write queued so far is committed"""
+        self.submit(lambda conn: None)
+
+    def _run(self):
+        self.conn = _connect(self.db_file)
+        self.conn.isolation_level = None  # Transactions are managed explicitly below
+        self.conn.execute('PRAGMA journal_mode = WAL')
+
+        while True:
+            jobs = [self.queue.get()]
+            while jobs[-1] is not None and len(jobs) < WRITE_BATCH_SIZE:
+                try:
+                    jobs.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # None is queued by close() - commit what came before it and stop
+            stopping = jobs[-1] is None
+            if stopping:
+                jobs.pop()
+            if jobs:
+                self._commit(jobs)
+            if stopping:
+                self.conn.close()
+                return
+
+    def _commit(self, jobs):
+        """Run a group of writes in one transaction"""
+        try:
+            self.conn.execute('BEGIN')
+            for job in jobs:
+                self.conn.execute('SAVEPOINT write_job')
+                try:
+                    job.result = job.write(self.conn)
+                    self.conn.execute('RELEASE write_job')
+                except Exception as e:
+                    job.error = e
+                    self.conn.execute('ROLLBACK TO write_job')
+                    self.conn.execute('RELEASE write_job')
+            self.conn.execute('COMMIT')
+        except Exception as e:
+            print(f"Error committing database writes: {e}")
+            if self.conn.in_transaction:
+                self.conn.execute('ROLLBACK')
+            for job in jobs:
+                if job.error is None:
+                    job.error = e
+        finally:
+            for job in jobs:
+                job.done.set()
+
+    def close(self, timeout=30):
+        """Commit queued writes, then stop the thread and close the connection"""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout)
+
+class ReaderPool:
+    """Pool of read connections for one database file (WAL lets them read while the writer writes)"""
+
+    def __init__(self, db_file, size=READER_POOL_SIZE):
+        """
+        Initialize pool.
+
+        Args:
+            db_file: Database file path
+            size: Idle connections kept open
+        """
+        self.db_file = db_file
+        self.idle = queue.LifoQueue(maxsize=size)
+
+    def acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            return _connect(self.db_file)
+
+    def release(self, conn):
+        try:
+            self.idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+_writers = {}
+_reader_pools = {}
+_pools_lock = threading.Lock()
+
+def get_writer():
+    """The writer for the current DB_FILE (started on first use)"""
+    path = os.path.abspath(DB_FILE)
+    with _pools_lock:
+        if path not in _writers:
+            _writers[path] = DatabaseWriter(path)
+        return _writers[path]
+
+def _get_reader_pool():
+    path = os.path.abspath(DB_FILE)
+    with _pools_lock:
+        if path not in _reader_pools:
+            _reader_pools[path] = ReaderPool(path)
+        return _reader_pools[path]
+
+def run_write(write, wait=True):
+    """Run write(conn) on the database's writer thread, committed together with other pending writes"""
+    return get_writer().submit(write, wait)
+
+@atexit.register
+def close_connections():
+    """Commit pending writes and close all connections"""
+    with _pools_lock:
+        writers = list(_writers.values())
+        pools = list(_reader_pools.values())
+        _writers.clear()
+        _reader_pools.clear()
+    for writer in writers:
+        writer.close()
+    for pool in pools:
+        pool.close()
+
 @contextmanager
 def get_db():
-    """Context manager for database connections"""
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+    """
+    Context manager for a pooled database connection, for reads and schema setup.
+    Crawl data is written through run_write() instead.
+    """
+    pool = _get_reader_pool()
+    conn = pool.acquire()
     try:
         yield conn
         conn.commit()
@@ -24,7 +231,7 @@ def get_db():
         conn.rollback()
         raise e
     finally:
-        conn.close()
+        pool.release(conn)
 
 def init_crawl_tables():
     """Initialize crawl persistence tables"""
@@ -57,6 +264,8 @@ def init_crawl_tables():
                 can_resume BOOLEAN DEFAULT 1,
                 resume_checkpoint TEXT,
 
+                parent_crawl_id INTEGER,
+
                 FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
             )
         ''')
@@ -103,6 +312,7 @@ def init_crawl_tables():
 
                 response_time REAL,
                 javascript_rendered BOOLEAN DEFAULT 0,
+                content_signature BLOB,
 
                 crawled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 
@@ -166,6 +376,42 @@ def init_crawl_tables():
             )
         ''')
 
+        # HTTP cache for conditional recrawls (one row per owner and URL, pointing at the
+        # crawl whose crawled_urls row holds the latest extraction for it). Entries are
+        # scoped by owner so one user's stored pages are never reused in another's crawl.
+        cursor.execute("SELECT 1 FROM pragma_table_info('http_cache') WHERE name = 'url'")
+        has_cache = cursor.fetchone() is not None
+        cursor.execute("SELECT 1 FROM pragma_table_info('http_cache') WHERE name = 'owner'")
+        if has_cache and cursor.fetchone() is None:
+            # Unscoped cache from an older version - only a cache, so start it afresh
+            cursor.execute('DROP TABLE http_cache')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS http_cache (
+                owner TEXT NOT NULL,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                crawl_id INTEGER,
+                change_count INTEGER DEFAULT 0,
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+                PRIMARY KEY (owner, url)
+            )
+        ''')
+
+        # Add parent_crawl_id column to existing crawls table if it doesn't exist
+        try:
+            cursor.execute('ALTER TABLE crawls ADD COLUMN parent_crawl_id INTEGER')
+        except:
+            pass  # Column already exists
+
+        # Add content_signature column (near-duplicate MinHash of the page's text) to existing crawled_urls tables
+        try:
+            cursor.execute('ALTER TABLE crawled_urls ADD COLUMN content_signature BLOB')
+        except:
+            pass  # Column already exists
+
         # Create indexes for performance
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_crawls_user_status ON crawls(user_id, status)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_crawls_session ON crawls(session_id)')
@@ -182,22 +428,26 @@ def init_crawl_tables():
 
         print("Crawl persistence tables initialized successfully")
 
-def create_crawl(user_id, session_id, base_url, base_domain, config_snapshot):
+def create_crawl(user_id, session_id, base_url, base_domain, config_snapshot, parent_crawl_id=None):
     """
     Create a new crawl record
+    parent_crawl_id: the crawl this one refreshes (recrawls only)
     Returns the crawl_id
     """
     try:
-        with get_db() as conn:
+        def write(conn):
             cursor = conn.cursor()
             cursor.execute('''
-                INSERT INTO crawls (user_id, session_id, base_url, base_domain, config_snapshot, status)
-                VALUES (?, ?, ?, ?, ?, 'running')
-            ''', (user_id, session_id, base_url, base_domain, json.dumps(config_snapshot)))
+                INSERT INTO crawls (user_id, session_id, base_url, base_domain, config_snapshot, status, parent_crawl_id)
+                VALUES (?, ?, ?, ?, ?, 'running', ?)
+            ''', (user_id, session_id, base_url, base_domain, json.dumps(config_snapshot), parent_crawl_id))
 
             crawl_id = cursor.lastrowid
             print(f"Created new crawl record: ID={crawl_id}, URL={base_url}")
             return crawl_id
+
+        return run_write(write)
+
     except Exception as e:
         print(f"Error creating crawl: {e}")
         return None
@@ -205,7 +455,7 @@ def create_crawl(user_id, session_id, base_url, base_domain, config_snapshot):
 def update_crawl_stats(crawl_id, discovered=None, crawled=None, max_depth=None, peak_memory_mb=None, estimated_size_mb=None):
     """Update crawl statistics"""
     try:
-        with get_db() as conn:
+        def write(conn):
             cursor = conn.cursor()
 
             updates = []
@@ -234,61 +484,66 @@ def update_crawl_stats(crawl_id, discovered=None, crawled=None, max_depth=None,
             cursor.execute(query, params)
 
             return True
+
+        return run_write(write)
+
     except Exception as e:
         print(f"Error updating crawl stats: {e}")
         return False
 
-def save_url_batch(crawl_id, urls):
+def save_url_batch(crawl_id, urls, signatures=None):
     """
     Batch save crawled URLs
     urls: list of URL result dictionaries from crawler
+    signatures: dict of URL -> content signature, for the pages that have one
     """
     if not urls:
         return True
 
+    signatures = signatures or {}
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-
-            # Prepare batch insert
-            rows = []
-            for url_data in urls:
-                row = (
-                    crawl_id,
-                    url_data.get('url'),
-                    url_data.get('status_code'),
-                    url_data.get('content_type'),
-                    url_data.get('size'),
-                    url_data.get('is_internal'),
-                    url_data.get('depth'),
-                    url_data.get('title'),
-                    url_data.get('meta_description'),
-                    url_data.get('h1'),
-                    json.dumps(url_data.get('h2', [])),
-                    json.dumps(url_data.get('h3', [])),
-                    url_data.get('word_count'),
-                    url_data.get('canonical_url'),
-                    url_data.get('lang'),
-                    url_data.get('charset'),
-                    url_data.get('viewport'),
-                    url_data.get('robots'),
-                    json.dumps(url_data.get('meta_tags', {})),
-                    json.dumps(url_data.get('og_tags', {})),
-                    json.dumps(url_data.get('twitter_tags', {})),
-                    json.dumps(url_data.get('json_ld', [])),
-                    json.dumps(url_data.get('analytics', {})),
-                    json.dumps(url_data.get('images', [])),
-                    json.dumps(url_data.get('hreflang', [])),
-                    json.dumps(url_data.get('schema_org', [])),
-                    json.dumps(url_data.get('redirects', [])),
-                    json.dumps(url_data.get('linked_from', [])),
-                    url_data.get('external_links'),
-                    url_data.get('internal_links'),
-                    url_data.get('response_time'),
-                    url_data.get('javascript_rendered', False)
-                )
-                rows.append(row)
+        # Rows are prepared (JSON fields encoded) on the calling thread, so the writer only inserts
+        rows = []
+        for url_data in urls:
+            row = (
+                crawl_id,
+                url_data.get('url'),
+                url_data.get('status_code'),
+                url_data.get('content_type'),
+                url_data.get('size'),
+                url_data.get('is_internal'),
+                url_data.get('depth'),
+                url_data.get('title'),
+                url_data.get('meta_description'),
+                url_data.get('h1'),
+                json.dumps(url_data.get('h2', [])),
+                json.dumps(url_data.get('h3', [])),
+                url_data.get('word_count'),
+                url_data.get('canonical_url'),
+                url_data.get('lang'),
+                url_data.get('charset'),
+                url_data.get('viewport'),
+                url_data.get('robots'),
+                json.dumps(url_data.get('meta_tags', {})),
+                json.dumps(url_data.get('og_tags', {})),
+                json.dumps(url_data.get('twitter_tags', {})),
+                json.dumps(url_data.get('json_ld', [])),
+                json.dumps(url_data.get('analytics', {})),
+                json.dumps(url_data.get('images', [])),
+                json.dumps(url_data.get('hreflang', [])),
+                json.dumps(url_data.get('schema_org', [])),
+                json.dumps(url_data.get('redirects', [])),
+                json.dumps(url_data.get('linked_from', [])),
+                url_data.get('external_links'),
+                url_data.get('internal_links'),
+                url_data.get('response_time'),
+                url_data.get('javascript_rendered', False),
+                signatures.get(url_data.get('url'))
+            )
+            rows.append(row)
 
+        def write(conn):
+            cursor = conn.cursor()
             cursor.executemany('''
                 INSERT INTO crawled_urls (
                     crawl_id, url, status_code, content_type, size, is_internal, depth,
@@ -296,13 +551,15 @@ def save_url_batch(crawl_id, urls):
                     canonical_url, lang, charset, viewport, robots,
                     meta_tags, og_tags, twitter_tags, json_ld, analytics, images,
                     hreflang, schema_org, redirects, linked_from,
-                    external_links, internal_links, response_time, javascript_rendered
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    external_links, internal_links, response_time, javascript_rendered, content_signature
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', rows)
 
             print(f"Saved {len(urls)} URLs to database for crawl {crawl_id}")
             return True
 
+        return run_write(write)
+
     except Exception as e:
         print(f"Error saving URL batch: {e}")
         import traceback
@@ -315,23 +572,22 @@ def save_links_batch(crawl_id, links):
         return True
 
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-
-            rows = []
-            for link in links:
-                row = (
-                    crawl_id,
-                    link.get('source_url'),
-                    link.get('target_url'),
-                    link.get('anchor_text'),
-                    link.get('is_internal'),
-                    link.get('target_domain'),
-                    link.get('target_status'),
-                    link.get('placement', 'body')
-                )
-                rows.append(row)
+        rows = []
+        for link in links:
+            row = (
+                crawl_id,
+                link.get('source_url'),
+                link.get('target_url'),
+                link.get('anchor_text'),
+                link.get('is_internal'),
+                link.get('target_domain'),
+                link.get('target_status'),
+                link.get('placement', 'body')
+            )
+            rows.append(row)
 
+        def write(conn):
+            cursor = conn.cursor()
             cursor.executemany('''
                 INSERT INTO crawl_links (
                     crawl_id, source_url, target_url, anchor_text,
@@ -342,6 +598,8 @@ def save_links_batch(crawl_id, links):
             print(f"Saved {len(links)} links to database for crawl {crawl_id}")
             return True
 
+        return run_write(write)
+
     except Exception as e:
         print(f"Error saving links batch: {e}")
         return False
@@ -352,21 +610,20 @@ def save_issues_batch(crawl_id, issues):
         return True
 
     try:
-        with get_db() as conn:
-            cursor = conn.cursor()
-
-            rows = []
-            for issue in issues:
-                row = (
-                    crawl_id,
-                    issue.get('url'),
-                    issue.get('type'),
-                    issue.get('category'),
-                    issue.get('issue'),
-                    issue.get('details')
-                )
-                rows.append(row)
+        rows = []
+        for issue in issues:
+            row = (
+                crawl_id,
+                issue.get('url'),
+                issue.get('type'),
+                issue.get('category'),
+                issue.get('issue'),
+                issue.get('details')
+            )
+            rows.append(row)
 
+        def write(conn):
+            cursor = conn.cursor()
             cursor.executemany('''
                 INSERT INTO crawl_issues (
                     crawl_id, url, type, category, issue, details
@@ -376,6 +633,8 @@ def save_issues_batch(crawl_id, issues):
             print(f"Saved {len(issues)} issues to database for crawl {crawl_id}")
             return True
 
+        return run_write(write)
+
     except Exception as e:
         print(f"Error saving issues batch: {e}")
         return False
@@ -383,7 +642,7 @@ def save_issues_batch(crawl_id, issues):
 def save_checkpoint(crawl_id, checkpoint_data):
     """Save queue checkpoint for crash recovery"""
     try:
-        with get_db() as conn:
+        def write(conn):
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE crawls
@@ -392,17 +651,89 @@ def save_checkpoint(crawl_id, checkpoint_data):
             ''', (json.dumps(checkpoint_data), crawl_id))
 
             return True
+
+        return run_write(write)
+
     except Exception as e:
         print(f"Error saving checkpoint: {e}")
         return False
 
+def save_queue_changes(crawl_id, queued, done_urls):
+    """
+    Keep crawl_queue equal to the crawl's pending URLs
+    queued: (url, depth) entries added to the queue since the last save
+    done_urls: URLs finished since the last save
+    """
+    if not queued and not done_urls:
+        return True
+
+    try:
+        def write(conn):
+            cursor = conn.cursor()
+
+            if queued:
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO crawl_queue (crawl_id, url, depth)
+                    VALUES (?, ?, ?)
+                ''', [(crawl_id, url, depth) for url, depth in queued])
+
+            if done_urls:
+                cursor.executemany('''
+                    DELETE FROM crawl_queue WHERE crawl_id = ? AND url = ?
+                ''', [(crawl_id, url) for url in done_urls])
+
+            return True
+
+        return run_write(write)
+
+    except Exception as e:
+        print(f"Error saving queue changes: {e}")
+        return False
+
+def load_crawl_queue(crawl_id):
+    """
+    Load the pending URLs of a crawl in queue order, skipping any that were crawled
+    after the queue was last saved
+    Returns a list of (url, depth) tuples
+    """
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT q.url, q.depth FROM crawl_queue q
+                WHERE q.crawl_id = ? AND NOT EXISTS (
+                    SELECT 1 FROM crawled_urls u WHERE u.crawl_id = q.crawl_id AND u.url = q.url
+                )
+                ORDER BY q.id
+            ''', (crawl_id,))
+
+            return [(row['url'], row['depth']) for row in cursor.fetchall()]
+
+    except Exception as e:
+        print(f"Error loading crawl queue: {e}")
+        return []
+
+def clear_crawl_queue(crawl_id):
+    """Delete the saved queue of a crawl"""
+    try:
+        def write(conn):
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM crawl_queue WHERE crawl_id = ?', (crawl_id,))
+            return True
+
+        return run_write(write)
+
+    except Exception as e:
+        print(f"Error clearing crawl queue: {e}")
+        return False
+
 def set_crawl_status(crawl_id, status):
     """
     Update crawl status
     status: 'running', 'paused', 'completed', 'failed', 'stopped', 'archived'
     """
     try:
-        with get_db() as conn:
+        def write(conn):
             cursor = conn.cursor()
 
             if status in ['completed', 'failed', 'stopped']:
@@ -421,6 +752,8 @@ def set_crawl_status(crawl_id, status):
             print(f"Updated crawl {crawl_id} status to: {status}")
             return True
 
+        return run_write(write)
+
     except Exception as e:
         print(f"Error setting crawl status: {e}")
         return False
@@ -498,6 +831,7 @@ def load_crawled_urls(crawl_id, limit=None, offset=0):
             urls = []
             for row in cursor.fetchall():
                 url_data = dict(row)
+                url_data.pop('content_signature', None)  # Binary - see load_content_signatures
                 # Parse JSON fields
                 for field in ['h2', 'h3', 'meta_tags', 'og_tags', 'twitter_tags',
                              'json_ld', 'analytics', 'images', 'hreflang',
@@ -516,6 +850,21 @@ def load_crawled_urls(crawl_id, limit=None, offset=0):
         print(f"Error loading crawled URLs: {e}")
         return []
 
+def load_content_signatures(crawl_id):
+    """Load the content signatures of a crawl's pages, as a dict of URL -> signature"""
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT url, content_signature FROM crawled_urls
+                WHERE crawl_id = ? AND content_signature IS NOT NULL
+            ''', (crawl_id,))
+            return {row['url']: row['content_signature'] for row in cursor.fetchall()}
+
+    except Exception as e:
+        print(f"Error loading content signatures: {e}")
+        return {}
+
 def load_crawl_links(crawl_id, limit=None, offset=0):
     """Load all links for a crawl"""
     try:
@@ -558,6 +907,198 @@ def load_crawl_issues(crawl_id, limit=None, offset=0):
         print(f"Error loading issues: {e}")
         return []
 
+def get_http_cache_entry(crawl_id, url):
+    """
+    Get the HTTP cache entry for a URL, from the cache of the crawl's owner.
+    Only returns entries whose crawled_urls row still exists, since that row is what gets reused.
+    """
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT c.url, c.etag, c.last_modified, c.content_hash, c.crawl_id, c.change_count,
+                       u.id AS url_row_id
+                FROM http_cache c
+                JOIN crawled_urls u ON u.crawl_id = c.crawl_id AND u.url = c.url
+                WHERE c.owner = ({CACHE_OWNER_SQL}) AND c.url = ?
+                ORDER BY u.id DESC
+                LIMIT 1
+            ''', (crawl_id, url))
+
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    except Exception as e:
+        print(f"Error loading HTTP cache entry: {e}")
+        return None
+
+def load_cached_page(url_row_id):
+    """
+    Load a stored page for reuse: its crawled_urls row and the links found on it.
+    Returns (url_data, links) or None.
+    """
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM crawled_urls WHERE id = ?', (url_row_id,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+
+            url_data = dict(row)
+            # Parse JSON fields
+            for field in ['h2', 'h3', 'meta_tags', 'og_tags', 'twitter_tags',
+                         'json_ld', 'analytics', 'images', 'hreflang',
+                         'schema_org', 'redirects', 'linked_from']:
+                if url_data.get(field):
+                    try:
+                        url_data[field] = json.loads(url_data[field])
+                    except:
+                        url_data[field] = []
+
+            cursor.execute('''
+                SELECT * FROM crawl_links
+                WHERE crawl_id = ? AND source_url = ?
+                ORDER BY id
+            ''', (url_data['crawl_id'], url_data['url']))
+            links = [dict(link) for link in cursor.fetchall()]
+
+            return url_data, links
+
+    except Exception as e:
+        print(f"Error loading cached page: {e}")
+        return None
+
+def save_http_cache_batch(crawl_id, entries):
+    """
+    Batch upsert HTTP cache entries, into the cache of the crawl's owner
+    entries: list of dicts with url, etag, last_modified, content_hash
+    """
+    if not entries:
+        return True
+
+    try:
+        rows = [
+            (entry['url'], entry.get('etag'), entry.get('last_modified'), entry.get('content_hash'), crawl_id)
+            for entry in entries
+        ]
+
+        def write(conn):
+            cursor = conn.cursor()
+            cursor.execute(CACHE_OWNER_SQL, (crawl_id,))
+            owner = cursor.fetchone()
+            if not owner:
+                return True  # Crawl deleted meanwhile
+
+            # change_count goes up whenever the stored content hash changes
+            cursor.executemany('''
+                INSERT INTO http_cache (owner, url, etag, last_modified, content_hash, crawl_id)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(owner, url) DO UPDATE SET
+                    change_count = http_cache.change_count + (
+                        http_cache.content_hash IS NOT NULL AND
+                        http_cache.content_hash != excluded.content_hash
+                    ),
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    content_hash = excluded.content_hash,
+                    crawl_id = excluded.crawl_id,
+                    fetched_at = CURRENT_TIMESTAMP
+            ''', [(owner[0],) + row for row in rows])
+
+            return True
+
+        return run_write(write)
+
+    except Exception as e:
+        print(f"Error saving HTTP cache batch: {e}")
+        return False
+
+def copy_reused_pages(crawl_id, pages):
+    """
+    Copy unchanged pages (URL row and outgoing links) from the crawl that stored them into this crawl,
+    and remove the pages from the crawl's queue in the same transaction.
+    Runs as INSERT...SELECT so the stored data never round-trips through Python.
+
+    Full rows are copied rather than referenced: every reader loads a crawl by its own crawl_id,
+    and crawls are deleted independently (ON DELETE CASCADE), so a recrawl must not depend on
+    rows owned by its parent. What recrawls save is the fetching and parsing, not storage.
+    pages: list of dicts with url, url_row_id, depth, response_time, linked_from
+    """
+    if not pages:
+        return True
+
+    try:
+        def write(conn):
+            cursor = conn.cursor()
+
+            for page in pages:
+                cursor.execute('''
+                    INSERT INTO crawled_urls (
+                        crawl_id, url, status_code, content_type, size, is_internal, depth,
+                        title, meta_description, h1, h2, h3, word_count,
+                        canonical_url, lang, charset, viewport, robots,
+                        meta_tags, og_tags, twitter_tags, json_ld, analytics, images,
+                        hreflang, schema_org, redirects, linked_from,
+                        external_links, internal_links, response_time, javascript_rendered, content_signature
+                    )
+                    SELECT
+                        ?, url, status_code, content_type, size, is_internal, ?,
+                        title, meta_description, h1, h2, h3, word_count,
+                        canonical_url, lang, charset, viewport, robots,
+                        meta_tags, og_tags, twitter_tags, json_ld, analytics, images,
+                        hreflang, schema_org, redirects, ?,
+                        external_links, internal_links, ?, javascript_rendered, content_signature
+                    FROM crawled_urls WHERE id = ?
+                ''', (crawl_id, page['depth'], json.dumps(page.get('linked_from', [])),
+                      page['response_time'], page['url_row_id']))
+
+                cursor.execute('''
+                    INSERT INTO crawl_links (
+                        crawl_id, source_url, target_url, anchor_text,
+                        is_internal, target_domain, target_status, placement
+                    )
+                    SELECT ?, l.source_url, l.target_url, l.anchor_text,
+                           l.is_internal, l.target_domain, l.target_status, l.placement
+                    FROM crawl_links l
+                    JOIN crawled_urls u ON l.crawl_id = u.crawl_id AND l.source_url = u.url
+                    WHERE u.id = ?
+                    ORDER BY l.id
+                ''', (crawl_id, page['url_row_id']))
+
+                cursor.execute('DELETE FROM crawl_queue WHERE crawl_id = ? AND url = ?', (crawl_id, page['url']))
+
+            print(f"Copied {len(pages)} unchanged pages to crawl {crawl_id}")
+            return True
+
+        return run_write(write)
+
+    except Exception as e:
+        print(f"Error copying unchanged pages: {e}")
+        return False
+
+def get_recrawl_seed(crawl_id):
+    """
+    Get the URLs of a previous crawl for seeding a recrawl, with how often each one has changed.
+    Returns a list of dicts with url, depth, status_code, change_count.
+    """
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT u.url, u.depth, u.status_code, COALESCE(c.change_count, 0) AS change_count
+                FROM crawled_urls u
+                LEFT JOIN http_cache c ON c.owner = ({CACHE_OWNER_SQL}) AND c.url = u.url
+                WHERE u.crawl_id = ?
+                ORDER BY u.id
+            ''', (crawl_id, crawl_id))
+
+            return [dict(row) for row in cursor.fetchall()]
+
+    except Exception as e:
+        print(f"Error loading recrawl seed: {e}")
+        return []
+
 def get_resume_data(crawl_id):
     """Get all data needed to resume a crawl"""
     crawl = get_crawl_by_id(crawl_id)
@@ -573,11 +1114,14 @@ def get_resume_data(crawl_id):
 def delete_crawl(crawl_id):
     """Delete a crawl and all associated data (CASCADE handles related tables)"""
     try:
-        with get_db() as conn:
+        def write(conn):
             cursor = conn.cursor()
             cursor.execute('DELETE FROM crawls WHERE id = ?', (crawl_id,))
             print(f"Deleted crawl {crawl_id} and all associated data")
             return True
+
+        return run_write(write)
+
     except Exception as e:
         print(f"Error deleting crawl: {e}")
         return False
@@ -607,7 +1151,7 @@ def get_crashed_crawls():
 def cleanup_old_crawls(days=90):
     """Delete crawls older than specified days (optional maintenance)"""
     try:
-        with get_db() as conn:
+        def write(conn):
             cursor = conn.cursor()
             cursor.execute('''
                 DELETE FROM crawls
@@ -619,6 +1163,8 @@ def cleanup_old_crawls(days=90):
             print(f"Cleaned up {deleted} old crawls")
             return deleted
 
+        return run_write(write)
+
     except Exception as e:
         print(f"Error cleaning up old crawls: {e}")
         return 0
@@ -638,9 +1184,9 @@ def get_crawl_count(user_id):
 def get_database_size_mb():
     """Get total database size in MB"""
     try:
-        import os
         if os.path.exists(DB_FILE):
-            size_bytes = os.path.getsize(DB_FILE)
+            # Recent writes live in the WAL file until they are checkpointed
+            size_bytes = sum(os.path.getsize(path) for path in (DB_FILE, DB_FILE + '-wal') if os.path.exists(path))
             return round(size_bytes / (1024 * 1024), 2)
         return 0
     except Exception as e:
@@ -6,20 +6,57 @@ import requests
 import threading
 import time
 import asyncio
-import re
+import multiprocessing
+from datetime import datetime
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor
-from urllib.robotparser import RobotFileParser
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import nest_asyncio
 
-from src.core.rate_limiter import RateLimiter
+from src.core.host_scheduler import HostScheduler
 from src.core.seo_extractor import SEOExtractor
+from src.core.page_processor import process_page
 from src.core.link_manager import LinkManager
+from src.core.frontier import Frontier
 from src.core.js_renderer import JavaScriptRenderer
+from src.core.async_fetcher import AsyncFetcher
+from src.core.http_cache import HttpCache
 from src.core.sitemap_parser import SitemapParser
 from src.core.issue_detector import IssueDetector
 from src.core.memory_monitor import MemoryMonitor
+from src.core.memory_profiler import DataSizeTracker
+from src.core.memory_governor import MemoryGovernor
+from src.core.result_log import ResultLog
+from src.core.result_store import ResultStore
+from src.core.robots_service import RobotsService
+from src.core.scope_filter import ScopeFilter
+
+PARSE_BACKLOG_PER_WORKER = 4  # Fetched pages waiting per parse worker before fetching pauses
+
+
+class PendingParse:
+    """A fetched page being parsed in a parse worker process; the crawler finishes it once parsed"""
+
+    def __init__(self, future, args, finish):
+        """
+        Initialize pending parse.
+
+        Args:
+            future: The worker's process_page future
+            args: process_page arguments, to parse inline if the worker fails
+            finish: Called with the process_page output to build the page result
+        """
+        self.future = future
+        self.args = args
+        self.finish = finish
+
+    def result(self):
+        """Build the page result (call once the future is done)"""
+        try:
+            parsed = self.future.result()
+        except Exception as e:
+            print(f"Parse worker failed for {self.args[0]}, parsing inline: {e}")
+            parsed = process_page(*self.args)
+        return self.finish(parsed)
 
 
 class WebCrawler:
@@ -40,17 +77,33 @@ class WebCrawler:
         self.base_domain = None
 
         # Component instances (initialized on demand)
-        self.rate_limiter = None
+        self.host_scheduler = None
         self.link_manager = None
         self.js_renderer = None
+        self.async_fetcher = None
+        self.parse_pool = None
+        self.http_cache = None
         self.sitemap_parser = None
         self.issue_detector = None
         self.seo_extractor = SEOExtractor()
         self.memory_monitor = MemoryMonitor()
 
-        # Results storage
-        self.crawl_results = []
+        # Results storage - crawled pages are kept in compact columns
+        self.crawl_results = ResultLog(table=ResultStore())
         self.results_lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self._page_issues = {}  # url -> issues found while processing the page, until it is recorded
+        self._page_signatures = {}  # url -> content signature of the page, until it is recorded
+
+        # crawl_results, links and issues are append-only logs; status polls read them from a
+        # cursor. The generation changes whenever the logs are cleared or replaced
+        self.results_generation = 0
+        self.data_size = DataSizeTracker(self._result_logs)
+        self.memory_governor = None
+
+        # Bumped and signalled whenever results or crawl state change, for status streams
+        self.results_changed = threading.Condition()
+        self.results_version = 0
 
         # State flags
         self.is_running = False
@@ -64,6 +117,7 @@ class WebCrawler:
 
         # Configuration
         self.config = self._get_default_config()
+        self.scope_filter = None  # Compiled crawl scope rules, see _should_crawl_url
 
         # Statistics
         self.stats = {
@@ -77,19 +131,34 @@ class WebCrawler:
         # Thread reference
         self.crawl_thread = None
 
-        # Robots.txt cache
-        self._robots_cache = {}
+        # robots.txt checks (files are cached process-wide, see src.core.robots_service)
+        self.robots_service = None
+
+        # Sitemap discovery running alongside the crawl (see _start_sitemap_discovery)
+        self.sitemap_discovery = None
 
         # Database persistence
         self.crawl_id = crawl_id
         self.resume_mode = resume_from_db
         self.auto_save_interval = 30  # seconds
         self.batch_save_size = 50  # URLs before triggering save
+        self.save_retry_delay = 5  # seconds before retrying after a failed save
         self.last_save_time = time.time()
+
+        # Rows waiting to be saved. Crawl threads append under persist_lock; only the persistence
+        # thread (or a flush once it has stopped) takes them and writes them to the database
         self.unsaved_urls = []
+        self.unsaved_signatures = {}   # url -> content signature, for pages in unsaved_urls that have one
         self.unsaved_links = []
         self.unsaved_issues = []
-        self.auto_save_thread = None
+        self.unsaved_queue_done = []   # Finished URLs to remove from the saved queue
+        self.unsaved_queue_added = []  # Entries waiting for robots.txt, or whose save failed, to add to the saved queue
+        self.persist_lock = threading.Lock()
+        self.persist_changed = threading.Condition(self.persist_lock)
+        self.persist_thread = None
+        self.persist_stop = False
+        self.save_requested = 0  # Flush requests made / served, so flushes wait for a save that started after them
+        self.save_completed = 0
         self.db_save_enabled = False  # Only enable when crawl_id is set
 
         # Enable nested asyncio for thread compatibility
@@ -115,6 +184,16 @@ class WebCrawler:
             'exclude_patterns': [],
             'max_file_size': 50 * 1024 * 1024,
             'concurrency': 5,
+            'fetch_engine': 'threads',
+            'parser_backend': 'html.parser',
+            'parse_workers': 0,
+            'use_http_cache': False,
+            'url_seen_set': 'exact',
+            'bloom_error_rate': 0.001,
+            'frontier_window': 100000,
+            'frontier_segment_size': 50000,
+            'async_max_connections': 100,
+            'max_per_host_concurrency': 0,
             'memory_limit': 512 * 1024 * 1024,
             'log_level': 'INFO',
             'enable_proxy': False,
@@ -281,12 +360,11 @@ class WebCrawler:
                 # Discover sitemaps if enabled
                 if self.config.get('discover_sitemaps', True):
                     print(f"Starting sitemap discovery for {url}")
-                    self._discover_and_add_sitemap_urls(url)
-                    print(f"Sitemap discovery completed. Total discovered URLs: {self.stats['discovered']}")
+                    self._start_sitemap_discovery(url)
 
-            # Start auto-save thread if DB enabled
+            # Start the persistence thread if DB enabled
             if self.db_save_enabled:
-                self._start_auto_save_thread()
+                self._start_persistence_thread()
 
             # Start crawling in separate thread
             self.is_running = True
@@ -300,6 +378,8 @@ class WebCrawler:
 
     def _initialize_components(self):
         """Initialize all crawler components"""
+        self.scope_filter = None  # Compiled from this crawl's config and base domain on first use
+
         # Calculate requests per second from delay
         if self.config['delay'] > 0:
             requests_per_second = 1.0 / self.config['delay']
@@ -307,14 +387,121 @@ class WebCrawler:
             # If delay is 0, set high rate but still smooth
             requests_per_second = 100.0
 
-        self.rate_limiter = RateLimiter(requests_per_second)
-        self.link_manager = LinkManager(self.base_domain)
-        self.sitemap_parser = SitemapParser(self.session, self.base_domain, self.config['timeout'])
+        # Queue keeps a bounded window in memory and spills the rest to segment files;
+        # with DB persistence on, queued URLs are also mirrored to crawl_queue for resume
+        self._release_frontier()
+        frontier = Frontier(
+            window=self.config.get('frontier_window', 100000),
+            segment_size=self.config.get('frontier_segment_size', 50000),
+            track_changes=bool(self.db_save_enabled and self.crawl_id)
+        )
+        self.link_manager = LinkManager(
+            self.base_domain,
+            seen_set_type=self.config.get('url_seen_set', 'exact'),
+            bloom_error_rate=self.config.get('bloom_error_rate', 0.001),
+            frontier=frontier
+        )
+        self.unsaved_queue_done = []
+        self.unsaved_queue_added = []
+        self.host_scheduler = HostScheduler(
+            self._next_queued_url,
+            requests_per_second,
+            max_per_host=self.config.get('max_per_host_concurrency', 0),
+            crawl_delay_lookup=self._get_crawl_delay
+        )
         self.issue_detector = IssueDetector(self.config.get('issue_exclusion_patterns', []))
 
+        # Fetches robots.txt files in the background; URLs of hosts whose robots.txt is still
+        # being fetched wait in the service (and in the saved queue) and are queued once allowed
+        self._shutdown_robots_service()
+        self.robots_service = RobotsService(
+            self.session,
+            user_agent=self.config.get('user_agent', '*'),
+            timeout=self.config['timeout'],
+            on_allowed=self._queue_robots_allowed_url,
+            on_resolved=self.link_manager.notify_queue_changed,
+            on_parked=self._save_robots_parked_url,
+            on_rejected=self._drop_saved_queue_url
+        )
+        self._cancel_sitemap_discovery()
+        self.sitemap_parser = SitemapParser(self.session, self.base_domain, self.config['timeout'],
+                                            robots=self.robots_service)
+
+        # Spills older results to disk and throttles dispatch when memory_limit is near
+        self.memory_governor = MemoryGovernor(
+            self.memory_monitor,
+            self.data_size,
+            self._result_logs,
+            self._spill_results,
+            self.config.get('memory_limit', 0)
+        )
+
         # Initialize JS renderer if needed
         if self.config.get('enable_javascript', False):
             self.js_renderer = JavaScriptRenderer(self.config)
+        elif self.config.get('fetch_engine') == 'async':
+            self.async_fetcher = AsyncFetcher(self.config, headers=dict(self.session.headers))
+
+        # Conditional GET cache - validators are recorded for every saved crawl, and with
+        # use_http_cache on, pages stored by earlier crawls are revalidated and reused
+        self.http_cache = None
+        if self.db_save_enabled and self.crawl_id:
+            self.http_cache = HttpCache(self.crawl_id, revalidate=self.config.get('use_http_cache', False))
+
+        # Worker processes for parsing and extraction (0 = parse inline in the fetch threads)
+        self._shutdown_parse_pool()
+        parse_workers = self.config.get('parse_workers', 0)
+        if parse_workers > 0:
+            # Fork workers from a clean server process rather than this multi-threaded one,
+            # preloading only the parsing code (not the web app in __main__)
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context('forkserver')
+                context.set_forkserver_preload(['src.core.page_processor'])
+            else:
+                context = multiprocessing.get_context('spawn')
+            self.parse_pool = ProcessPoolExecutor(max_workers=parse_workers, mp_context=context)
+            print(f"Parsing pages in {parse_workers} worker processes")
+
+    def _shutdown_parse_pool(self):
+        """Stop the parse worker processes, if running"""
+        if self.parse_pool:
+            self.parse_pool.shutdown(wait=False, cancel_futures=True)
+            self.parse_pool = None
+
+    def _shutdown_robots_service(self):
+        """Stop robots.txt fetching, dropping URLs still waiting for one"""
+        if self.robots_service:
+            self.robots_service.close()
+            self.robots_service = None
+
+    def _cancel_sitemap_discovery(self):
+        """Stop reading sitemaps, if discovery is still running"""
+        if self.sitemap_discovery:
+            self.sitemap_discovery.cancel()
+            self.sitemap_discovery = None
+
+    def _queue_robots_allowed_url(self, url, depth):
+        """Queue a URL that waited for its host's robots.txt and is allowed by it"""
+        if self.link_manager:
+            self.link_manager.add_url(url, depth)
+
+    def _save_robots_parked_url(self, url, depth):
+        """Save a URL waiting for its host's robots.txt to crawl_queue, so a resumed crawl has it"""
+        if self.db_save_enabled:
+            with self.persist_lock:
+                self.unsaved_queue_added.append((url, depth))
+
+    def _drop_saved_queue_url(self, url, depth):
+        """Remove a URL that won't be crawled (e.g. disallowed by the robots.txt it waited for) from crawl_queue"""
+        if self.db_save_enabled:
+            with self.persist_lock:
+                self.unsaved_queue_done.append(url)
+
+    def _release_frontier(self):
+        """Drop the queue and delete its segment files"""
+        if self.link_manager:
+            with self.link_manager.urls_lock:
+                self.link_manager.discovered_urls.clear()
 
     def _reset_state(self):
         """Reset crawler state"""
@@ -322,8 +509,13 @@ class WebCrawler:
             self.link_manager.reset()
         if self.issue_detector:
             self.issue_detector.reset()
+        if self.host_scheduler:
+            self.host_scheduler.reset()
 
         self.crawl_results.clear()
+        self._page_issues.clear()
+        self._page_signatures.clear()
+        self.new_results_generation()
         self.stats = {
             'discovered': 0,
             'crawled': 0,
@@ -335,22 +527,18 @@ class WebCrawler:
         # Start memory monitoring
         self.memory_monitor.start_monitoring()
 
-    def _discover_and_add_sitemap_urls(self, base_url):
-        """Discover sitemaps and add URLs to crawl queue"""
-        sitemap_urls = self.sitemap_parser.discover_sitemaps(base_url)
-
-        added_count = 0
-        filtered_count = 0
-
-        for url in sitemap_urls:
+    def _start_sitemap_discovery(self, base_url):
+        """
+        Discover sitemaps in the background, queueing their URLs as they are parsed so the
+        crawl starts right away. Sitemaps still being read count as pending work, so the
+        crawl doesn't finish before they are done.
+        """
+        def queue_sitemap_url(url, lastmod, priority):
             if self._should_crawl_url(url):
                 self.link_manager.add_url(url, 0)
-                added_count += 1
-            else:
-                filtered_count += 1
+                self.stats['discovered'] = self.link_manager.get_stats()['discovered']
 
-        self.stats['discovered'] = self.link_manager.get_stats()['discovered']
-        print(f"Sitemap processing: {added_count} added, {filtered_count} filtered")
+        self.sitemap_discovery = self.sitemap_parser.start_discovery(base_url, queue_sitemap_url)
 
     def stop_crawl(self):
         """Stop the current crawl"""
@@ -358,12 +546,17 @@ class WebCrawler:
         self.is_paused = False
         self.is_running_pagespeed = False
 
+        # Wake the dispatch loop so it notices the stop immediately
+        if self.link_manager:
+            self.link_manager.notify_queue_changed()
+        self.notify_results_changed()
+
         if self.crawl_thread and self.crawl_thread.is_alive():
             self.crawl_thread.join(timeout=5)
 
         # Save final data to database
         if self.db_save_enabled and self.crawl_id:
-            self._save_batch_to_db(force=True)
+            self._stop_persistence()
             from src.crawl_db import set_crawl_status
             set_crawl_status(self.crawl_id, 'stopped')
 
@@ -372,6 +565,11 @@ class WebCrawler:
             asyncio.run(self.js_renderer.cleanup())
             self.js_renderer = None
 
+        self._shutdown_parse_pool()
+        self._cancel_sitemap_discovery()
+        self._shutdown_robots_service()
+        self._release_frontier()
+
         return True, "Crawl and PageSpeed analysis stopped"
 
     def pause_crawl(self):
@@ -379,10 +577,11 @@ class WebCrawler:
         if not self.is_running:
             return False, "No crawl in progress"
         self.is_paused = True
+        self.notify_results_changed()
 
         # Save checkpoint when pausing
         if self.db_save_enabled and self.crawl_id:
-            self._save_batch_to_db(force=True)
+            self.flush_persistence()
             self._save_queue_checkpoint()
             from src.crawl_db import set_crawl_status
             set_crawl_status(self.crawl_id, 'paused')
@@ -396,6 +595,7 @@ class WebCrawler:
         if not self.is_paused:
             return False, "Crawl is not paused"
         self.is_paused = False
+        self.notify_results_changed()
 
         # Update status in database
         if self.db_save_enabled and self.crawl_id:
@@ -410,8 +610,7 @@ class WebCrawler:
             return False, "Crawl already in progress"
 
         try:
-            from src.crawl_db import get_resume_data, load_crawled_urls, set_crawl_status
-            from collections import deque
+            from src.crawl_db import get_resume_data, load_crawled_urls, load_crawl_queue, set_crawl_status
 
             # Load crawl data
             crawl_data = get_resume_data(crawl_id)
@@ -437,10 +636,10 @@ class WebCrawler:
             self._initialize_components()
 
             # Load already crawled URLs from database
-            from src.crawl_db import load_crawl_links, load_crawl_issues
+            from src.crawl_db import load_crawl_links, load_crawl_issues, load_content_signatures
 
             print(f"Loading crawled data from database...")
-            self.crawl_results = load_crawled_urls(crawl_id)
+            self.crawl_results = ResultLog(load_crawled_urls(crawl_id), table=ResultStore())
 
             # Mark all crawled URLs as discovered to prevent re-discovery
             for url_data in self.crawl_results:
@@ -451,18 +650,26 @@ class WebCrawler:
             # Load links and restore to link manager
             loaded_links = load_crawl_links(crawl_id)
             if loaded_links:
-                self.link_manager.all_links = loaded_links
-                # Rebuild links_set for duplicate detection
-                for link in loaded_links:
-                    link_key = f"{link['source_url']}|{link['target_url']}"
-                    self.link_manager.links_set.add(link_key)
+                self.link_manager.load_links(loaded_links)
+
+            # Index the loaded statuses so links to these pages resolve without a scan
+            self.link_manager.update_link_statuses(self.crawl_results)
 
             # Load issues and restore to issue detector
             loaded_issues = load_crawl_issues(crawl_id)
             if loaded_issues:
-                self.issue_detector.detected_issues = loaded_issues
+                self.issue_detector.detected_issues = ResultLog(loaded_issues)
+
+            # Index the loaded pages by their stored signatures so new pages are checked
+            # against them (their own duplication issues were loaded above)
+            if self.config.get('enable_duplication_check', True):
+                self.issue_detector.detect_duplication_issues(
+                    self.crawl_results, load_content_signatures(crawl_id),
+                    self.config.get('duplication_threshold', 0.85), report=False
+                )
 
             print(f"Loaded {len(self.crawl_results)} URLs, {len(loaded_links)} links, {len(loaded_issues)} issues from database")
+            self.new_results_generation()
 
             # Restore statistics
             self.stats['crawled'] = len(self.crawl_results)
@@ -470,20 +677,32 @@ class WebCrawler:
             self.stats['depth'] = crawl_data.get('max_depth_reached', 0)
             self.stats['start_time'] = time.time()  # New start time for resume
 
+            # Restore the exact pending queue saved in crawl_queue. It includes URLs that were
+            # still waiting for their robots.txt, so entries are checked again - against the
+            # site's robots.txt fetched first, so its URLs don't all wait for it
+            if self.config['respect_robots']:
+                self.robots_service.parser(RobotsService.robots_url(self.base_url))
+            for url, depth in load_crawl_queue(crawl_id):
+                allowed = self._should_crawl_url(url, depth)
+                if allowed:
+                    self.link_manager.add_url(url, depth)
+                elif allowed is False:
+                    self._drop_saved_queue_url(url, depth)
+
             # Restore queue state from checkpoint
             checkpoint = crawl_data.get('resume_checkpoint', {})
             if checkpoint:
-                # Restore discovered URLs queue
-                if 'discovered_urls' in checkpoint:
-                    discovered_list = checkpoint['discovered_urls']
-                    self.link_manager.discovered_urls = deque(discovered_list)
+                # Crawls saved before crawl_queue was kept only checkpointed part of the queue
+                if 'discovered_urls' in checkpoint and not self.link_manager.discovered_urls:
+                    for url, depth in checkpoint['discovered_urls']:
+                        self.link_manager.add_url(url, depth)
 
                 # Restore visited URLs set
                 if 'visited_urls' in checkpoint:
-                    self.link_manager.visited_urls = set(checkpoint['visited_urls'])
+                    self.link_manager.visited_urls.update(checkpoint['visited_urls'])
 
-                print(f"Restored queue: {len(self.link_manager.discovered_urls)} pending, "
-                      f"{len(self.link_manager.visited_urls)} visited")
+            print(f"Restored queue: {len(self.link_manager.discovered_urls)} pending, "
+                  f"{len(self.link_manager.visited_urls)} visited")
 
             # If queue is empty (no checkpoint or crawl crashed early), rebuild queue from links
             if not self.link_manager.discovered_urls:
@@ -511,8 +730,8 @@ class WebCrawler:
             # Update status to running
             set_crawl_status(crawl_id, 'running')
 
-            # Start auto-save thread
-            self._start_auto_save_thread()
+            # Start the persistence thread
+            self._start_persistence_thread()
 
             # Start crawling
             self.is_running = True
@@ -527,8 +746,220 @@ class WebCrawler:
             traceback.print_exc()
             return False, f"Error resuming crawl: {str(e)}"
 
+    def recrawl_from_database(self, crawl_id, user_id=None, session_id=None):
+        """
+        Refresh a previous crawl into a new crawl record.
+        The queue is seeded with the old crawl's URLs, most likely changed first, and every page is
+        revalidated so unchanged pages are copied from the stored crawl instead of parsed again.
+        """
+        if self.is_running:
+            return False, "Crawl already in progress"
+
+        new_crawl_id = None
+        try:
+            from src.crawl_db import get_crawl_by_id, get_recrawl_seed, create_crawl
+
+            parent_crawl = get_crawl_by_id(crawl_id)
+            if not parent_crawl:
+                return False, "Cannot recrawl - crawl not found"
+
+            if parent_crawl['status'] == 'running':
+                return False, "Cannot recrawl a crawl that is still running"
+
+            # Verify user owns this crawl (if not guest)
+            if user_id and parent_crawl.get('user_id') != user_id:
+                return False, "Unauthorized - you don't own this crawl"
+
+            seed = get_recrawl_seed(crawl_id)
+            if not seed:
+                return False, "Cannot recrawl - crawl has no stored URLs"
+
+            # Same scope and settings as the original crawl, with revalidation always on
+            self.list_mode = False
+            self.base_url = parent_crawl['base_url']
+            self.base_domain = parent_crawl['base_domain']
+            self.config = {**self._get_default_config(), **(parent_crawl.get('config_snapshot') or {})}
+            self.config['use_http_cache'] = True
+
+            self.crawl_id = new_crawl_id = create_crawl(
+                user_id=user_id,
+                session_id=session_id or parent_crawl['session_id'],
+                base_url=self.base_url,
+                base_domain=self.base_domain,
+                config_snapshot=self.config,
+                parent_crawl_id=crawl_id
+            )
+            if not self.crawl_id:
+                return False, "Could not create crawl record"
+            self.db_save_enabled = True
+
+            # Initialize components
+            self._initialize_components()
+
+            # Reset state
+            self._reset_state()
+
+            # Start the persistence thread
+            self._start_persistence_thread()
+
+            # Start crawling - the seed is ordered and queued on the crawl thread, since reading
+            # the site's sitemaps for it can take minutes
+            self.is_running = True
+            self.crawl_thread = threading.Thread(
+                target=self._recrawl_worker, args=(seed, parent_crawl.get('started_at'))
+            )
+            self.crawl_thread.start()
+
+            return True, f"Recrawling {len(seed)} URLs"
+
+        except Exception as e:
+            print(f"Error starting recrawl: {e}")
+            import traceback
+            traceback.print_exc()
+            if new_crawl_id:
+                # Don't leave the new crawl's record behind as running
+                from src.crawl_db import set_crawl_status
+                self.is_running = False
+                set_crawl_status(new_crawl_id, 'failed')
+            return False, f"Error starting recrawl: {str(e)}"
+
+    def _recrawl_worker(self, seed, crawled_at):
+        """Queue the recrawl seed, ordered by the site's sitemap <lastmod> dates, then crawl it"""
+        # Sitemap <lastmod> dates show which pages changed since the original crawl
+        sitemap_entries = []
+        if self.config.get('discover_sitemaps', True):
+            self.sitemap_discovery = self.sitemap_parser.start_discovery(
+                self.base_url, lambda url, lastmod, priority: sitemap_entries.append((url, lastmod))
+            )
+            self.sitemap_discovery.wait()
+
+            # The site's robots.txt was read for its sitemaps, so most URLs are answered at once
+            allowed_entries = []
+            for url, lastmod in sitemap_entries:
+                allowed = self._should_crawl_url(url)
+                if allowed is None:
+                    continue  # Waiting for its host's robots.txt - queued once allowed, not in lastmod order
+                if allowed:
+                    allowed_entries.append((url, lastmod))
+            sitemap_entries = allowed_entries
+
+        # Unless the crawl was stopped while the sitemaps were read
+        if self.is_running:
+            for url, depth in self._order_recrawl_seed(seed, sitemap_entries, crawled_at):
+                self.link_manager.add_url(url, depth)
+            self.stats['discovered'] = self.link_manager.get_stats()['discovered']
+
+            print(f"Recrawling as crawl {self.crawl_id}: "
+                  f"{self.stats['discovered']} URLs queued ({len(seed)} from the original crawl)")
+
+        self._crawl_worker()
+
+    @staticmethod
+    def _order_recrawl_seed(seed, sitemap_entries, crawled_at):
+        """
+        Order recrawl URLs by how likely they are to have changed: sitemap lastmod after the
+        original crawl (or new in the sitemap), then non-200 statuses, then past change count.
+
+        Returns:
+            list: (url, depth) tuples
+        """
+        try:
+            crawled_at = datetime.strptime(crawled_at, '%Y-%m-%d %H:%M:%S') if crawled_at else None
+        except ValueError:
+            crawled_at = None
+
+        lastmods = dict(sitemap_entries)
+        known_urls = set(row['url'] for row in seed)
+        rows = seed + [
+            {'url': url, 'depth': 0, 'status_code': None, 'change_count': 0, 'new': True}
+            for url in lastmods if url not in known_urls
+        ]
+
+        def change_likelihood(row):
+            lastmod = lastmods.get(row['url'])
+            updated = row.get('new') or (lastmod is not None and crawled_at is not None and lastmod > crawled_at)
+            return (not updated, row['status_code'] == 200, -row['change_count'], row['depth'] or 0)
+
+        return [(row['url'], row['depth'] or 0) for row in sorted(rows, key=change_likelihood)]
+
+    def new_results_generation(self):
+        """Mark the result logs as replaced, so status cursors from before are invalid"""
+        self.results_generation += 1
+        self.data_size.reset()
+        self.notify_results_changed()
+
+    def notify_results_changed(self):
+        """Wake status streams waiting for new results or a state change"""
+        with self.results_changed:
+            self.results_version += 1
+            self.results_changed.notify_all()
+
+    def wait_for_results(self, version, timeout):
+        """
+        Block until the results version moves past the given one, or the timeout passes.
+
+        Returns:
+            int: The current results version
+        """
+        with self.results_changed:
+            self.results_changed.wait_for(lambda: self.results_version != version, timeout)
+            return self.results_version
+
+    def _result_logs(self):
+        """The append-only result logs: (crawl_results, links, issues)"""
+        return (
+            self.crawl_results,
+            self.link_manager.all_links if self.link_manager else [],
+            self.issue_detector.detected_issues if self.issue_detector else []
+        )
+
     def get_status(self):
         """Get current crawl status and results"""
+        crawl_results, links, issues = self._result_logs()
+        status_data = self._status_summary()
+        status_data.update({
+            'urls': crawl_results.copy(),
+            'links': links.copy(),
+            'issues': self.issue_detector.get_issues() if self.issue_detector else []
+        })
+        return status_data
+
+    def get_status_since(self, url_since=0, link_since=0, issue_since=0, generation=None, limit=None):
+        """
+        Get current crawl status with only the URLs, links and issues added after the given cursors.
+
+        The cursors are positions in the append-only result logs, as returned in 'cursors' by
+        the previous call. If generation doesn't match (the logs were cleared or replaced since),
+        everything is returned from the start and 'reset' is set. limit caps the rows returned
+        per log; 'more' is set when rows were left for the next call.
+        """
+        reset = generation is not None and generation != self.results_generation
+        if reset:
+            url_since = link_since = issue_since = 0
+
+        status_data = self._status_summary()
+        new_rows = {}
+        more = False
+        cursors = {'generation': self.results_generation}
+        for name, log, since in zip(('urls', 'links', 'issues'), self._result_logs(),
+                                    (url_since, link_since, issue_since)):
+            # Read the end first so rows appended meanwhile are picked up by the next poll
+            end = len(log)
+            since = min(max(since or 0, 0), end)
+            if limit and end - since > limit:
+                end = since + limit
+                more = True
+            new_rows[name] = log[since:end]
+            cursors[name] = end
+
+        status_data.update(new_rows)
+        status_data['cursors'] = cursors
+        status_data['reset'] = reset
+        status_data['more'] = more
+        return status_data
+
+    def _status_summary(self):
+        """Status, stats, progress and memory figures shared by get_status and get_status_since"""
         status = 'completed' if not self.is_running and self.stats['crawled'] > 0 else 'running'
         if not self.is_running and self.stats['crawled'] == 0:
             status = 'idle'
@@ -541,22 +972,11 @@ class WebCrawler:
         # Get link manager stats
         link_stats = self.link_manager.get_stats() if self.link_manager else {'discovered': 0}
 
-        # Update link statuses before returning (ensures all crawled URLs have their status)
-        if self.link_manager:
-            self.link_manager.update_link_statuses(self.crawl_results)
-
         # Update memory stats
         self.memory_monitor.update()
 
-        # Get actual data size for accurate estimates
-        from src.core.memory_profiler import MemoryProfiler
-        data_sizes = MemoryProfiler.get_crawler_data_size(
-            self.crawl_results,
-            self.link_manager.all_links if self.link_manager else [],
-            self.issue_detector.detected_issues if self.issue_detector else []
-        )
-
-        print(f"get_status called - crawl_results length: {len(self.crawl_results)}, status: {status}, crawled: {self.stats['crawled']}")
+        # Cached data size estimate (see DataSizeTracker)
+        data_sizes = self.data_size.get_sizes()
 
         return {
             'status': status,
@@ -564,56 +984,115 @@ class WebCrawler:
                 **self.stats,
                 'discovered': link_stats['discovered']
             },
-            'urls': self.crawl_results.copy(),
-            'links': self.link_manager.all_links.copy() if self.link_manager else [],
-            'issues': self.issue_detector.get_issues() if self.issue_detector else [],
             'progress': min(100, (self.stats['crawled'] / max(link_stats['discovered'], 1)) * 100),
             'is_running_pagespeed': self.is_running_pagespeed,
-            'memory': self.memory_monitor.get_stats(),
+            'memory': {
+                **self.memory_monitor.get_stats(),
+                'governor': self.memory_governor.get_stats() if self.memory_governor else None
+            },
             'memory_data': data_sizes
         }
 
-    def _save_batch_to_db(self, force=False):
-        """Save batched data to database"""
+    def _pending_save_count(self):
+        """Pages waiting to be saved (persist_lock must be held)"""
+        return len(self.unsaved_urls) + (len(self.http_cache.pending_copies) if self.http_cache else 0)
+
+    def _save_batch_to_db(self):
+        """
+        Save batched data to database. Runs on the persistence thread; anything that fails to
+        save is put back in front of the pending rows and retried with the next batch.
+
+        Returns:
+            bool: True if everything pending was saved
+        """
         if not self.db_save_enabled or not self.crawl_id:
-            return
+            return True
 
-        from src.crawl_db import save_url_batch, save_links_batch, save_issues_batch, update_crawl_stats
+        with self.save_lock:
+            from src.crawl_db import (save_url_batch, save_links_batch, save_issues_batch, save_queue_changes,
+                                      update_crawl_stats)
+
+            # Take everything pending at once - crawl threads keep appending to fresh lists.
+            # Finished URLs are taken together with the URL batch, so every URL leaving the
+            # saved queue has its row saved in this batch or an earlier one
+            with self.persist_lock:
+                url_batch, self.unsaved_urls = self.unsaved_urls, []
+                signatures, self.unsaved_signatures = self.unsaved_signatures, {}
+                queue_done, self.unsaved_queue_done = self.unsaved_queue_done, []
+                queued, self.unsaved_queue_added = self.unsaved_queue_added, []
+                link_batch, self.unsaved_links = self.unsaved_links, []
+                issue_batch, self.unsaved_issues = self.unsaved_issues, []
+            if self.link_manager:
+                queued.extend(self.link_manager.take_queued_entries())
+
+            saved = True
+            try:
+                # Save URLs
+                urls_saved = save_url_batch(self.crawl_id, url_batch, signatures)
+                if not urls_saved:
+                    # The queue rows of these URLs must stay until their rows are saved
+                    self._requeue_unsaved(urls=url_batch, signatures=signatures, queue_done=queue_done,
+                                          queued=queued)
+                    queue_done, queued = [], []
+                    saved = False
+
+                # Save queue changes. Pages reused from the HTTP cache leave the queue when they
+                # are copied into this crawl (below), not before
+                if self.http_cache and queue_done:
+                    copy_urls = self.http_cache.pending_copy_urls()
+                    queue_done = [url for url in queue_done if url not in copy_urls]
+                queue_saved = not (queued or queue_done) or save_queue_changes(self.crawl_id, queued, queue_done)
+                if not queue_saved:
+                    self._requeue_unsaved(queue_done=queue_done, queued=queued)
+                    saved = False
+
+                # Save HTTP cache copies and entries (they point at the URL rows saved above, and the
+                # copies remove queue rows added above, so they wait if either failed)
+                if self.http_cache and urls_saved and queue_saved and not self.http_cache.flush():
+                    saved = False
+
+                # Save links
+                if not save_links_batch(self.crawl_id, link_batch):
+                    self._requeue_unsaved(links=link_batch)
+                    saved = False
+
+                # Save issues
+                if not save_issues_batch(self.crawl_id, issue_batch):
+                    self._requeue_unsaved(issues=issue_batch)
+                    saved = False
+
+                # Update statistics
+                memory_stats = self.memory_monitor.get_stats()
+                update_crawl_stats(
+                    self.crawl_id,
+                    discovered=self.stats['discovered'],
+                    crawled=self.stats['crawled'],
+                    max_depth=self.stats['depth'],
+                    peak_memory_mb=memory_stats.get('peak_mb', 0),
+                    estimated_size_mb=memory_stats.get('estimated_crawl_mb', 0)
+                )
 
-        try:
-            # Save URLs
-            if self.unsaved_urls:
-                save_url_batch(self.crawl_id, self.unsaved_urls)
-                self.unsaved_urls.clear()
-
-            # Save links
-            if self.unsaved_links:
-                save_links_batch(self.crawl_id, self.unsaved_links)
-                self.unsaved_links.clear()
-
-            # Save issues
-            if self.unsaved_issues:
-                save_issues_batch(self.crawl_id, self.unsaved_issues)
-                self.unsaved_issues.clear()
-
-            # Update statistics
-            memory_stats = self.memory_monitor.get_stats()
-            update_crawl_stats(
-                self.crawl_id,
-                discovered=self.stats['discovered'],
-                crawled=self.stats['crawled'],
-                max_depth=self.stats['depth'],
-                peak_memory_mb=memory_stats.get('peak_mb', 0),
-                estimated_size_mb=memory_stats.get('estimated_crawl_mb', 0)
-            )
+                self.last_save_time = time.time()
+                if saved:
+                    print(f"Saved batch to database for crawl {self.crawl_id}")
 
-            self.last_save_time = time.time()
-            print(f"Saved batch to database for crawl {self.crawl_id}")
+            except Exception as e:
+                print(f"Error saving batch to database: {e}")
+                import traceback
+                traceback.print_exc()
+                saved = False
 
-        except Exception as e:
-            print(f"Error saving batch to database: {e}")
-            import traceback
-            traceback.print_exc()
+            return saved
+
+    def _requeue_unsaved(self, urls=(), signatures=None, links=(), issues=(), queue_done=(), queued=()):
+        """Put rows that failed to save back in front of the pending ones"""
+        with self.persist_lock:
+            self.unsaved_urls[:0] = urls
+            self.unsaved_signatures.update(signatures or {})
+            self.unsaved_links[:0] = links
+            self.unsaved_issues[:0] = issues
+            self.unsaved_queue_done[:0] = queue_done
+            self.unsaved_queue_added[:0] = queued
 
     def _save_queue_checkpoint(self):
         """Save current queue state for crash recovery"""
@@ -623,20 +1102,16 @@ class WebCrawler:
         from src.crawl_db import save_checkpoint
 
         try:
-            # Get discovered URLs from link manager
-            discovered_urls = []
-            if hasattr(self.link_manager, 'discovered_urls'):
-                discovered_urls = list(self.link_manager.discovered_urls)[:1000]  # Limit to prevent huge checkpoints
-
-            # Get visited URLs
+            # Pending URLs themselves are kept in crawl_queue by _save_batch_to_db
+            # Get visited URLs (compact seen-sets cannot list them - resume rebuilds
+            # them from the crawled URLs instead)
             visited_urls = []
-            if hasattr(self.link_manager, 'visited_urls'):
+            if isinstance(getattr(self.link_manager, 'visited_urls', None), set):
                 visited_urls = list(self.link_manager.visited_urls)
 
             checkpoint = {
-                'discovered_urls': discovered_urls,
                 'visited_urls': visited_urls,
-                'pending_count': self.link_manager.get_stats().get('pending', 0)
+                'pending_count': self._pending_count()
             }
 
             save_checkpoint(self.crawl_id, checkpoint)
@@ -645,22 +1120,95 @@ class WebCrawler:
         except Exception as e:
             print(f"Error saving checkpoint: {e}")
 
-    def _start_auto_save_thread(self):
-        """Background thread for periodic saves"""
-        def auto_save_worker():
-            while self.is_running:
-                time.sleep(5)  # Check every 5 seconds
-                if time.time() - self.last_save_time >= self.auto_save_interval:
-                    self._save_batch_to_db()
+    def _start_persistence_thread(self):
+        """
+        Start the thread that saves batched data to the database. It saves once a batch is
+        pending, when a flush is requested, and every auto_save_interval (with a queue
+        checkpoint); crawl threads only hand it rows and never wait on the database.
+        After a failed save, pending batches wait save_retry_delay before the next attempt.
+        """
+        self._stop_persistence(final_save=False)
+
+        with self.persist_lock:
+            self.persist_stop = False
+            self.save_requested = self.save_completed = 0
+
+        def persistence_worker():
+            last_checkpoint = time.time()
+            retry_at = 0  # Failed rows were put back - don't retry them before this
+            while True:
+                timeout = self.auto_save_interval - (time.time() - last_checkpoint)
+                if retry_at > time.time():
+                    timeout = min(timeout, retry_at - time.time())
+                with self.persist_lock:
+                    self.persist_changed.wait_for(
+                        lambda: (self.persist_stop or self.save_requested > self.save_completed or
+                                 (self._pending_save_count() >= self.batch_save_size and
+                                  time.time() >= retry_at)),
+                        timeout=max(timeout, 0)
+                    )
+                    stopping = self.persist_stop
+                    request = self.save_requested
+
+                if not self._save_batch_to_db():
+                    retry_at = time.time() + self.save_retry_delay
+
+                if not stopping and time.time() - last_checkpoint >= self.auto_save_interval:
                     self._save_queue_checkpoint()
+                    last_checkpoint = time.time()
+
+                with self.persist_lock:
+                    self.save_completed = max(self.save_completed, request)
+                    self.persist_changed.notify_all()
+                if stopping:
+                    return
 
-        self.auto_save_thread = threading.Thread(target=auto_save_worker, daemon=True)
-        self.auto_save_thread.start()
+        self.persist_thread = threading.Thread(target=persistence_worker, daemon=True)
+        self.persist_thread.start()
         print("Auto-save thread started")
 
+    def flush_persistence(self, timeout=None):
+        """
+        Save everything handed to the persistence thread so far, and wait until it is saved.
+        Saves directly if the persistence thread isn't running.
+
+        Args:
+            timeout: Maximum seconds to wait for the persistence thread (None = wait until saved)
+
+        Returns:
+            bool: True if the save finished
+        """
+        thread = self.persist_thread
+        if thread is None or not thread.is_alive():
+            return self._save_batch_to_db()
+
+        with self.persist_lock:
+            self.save_requested += 1
+            request = self.save_requested
+            self.persist_changed.notify_all()
+            return self.persist_changed.wait_for(
+                lambda: self.save_completed >= request or not thread.is_alive(), timeout
+            )
+
+    def _stop_persistence(self, final_save=True):
+        """Stop the persistence thread after it has saved what is pending, then save anything left over"""
+        thread = self.persist_thread
+        if thread is not None:
+            with self.persist_lock:
+                self.persist_stop = True
+                self.persist_changed.notify_all()
+            if thread is not threading.current_thread():
+                thread.join()
+            self.persist_thread = None
+
+        # Rows handed over after the thread's last save, or put back after a failed one
+        if final_save:
+            self._save_batch_to_db()
+
     def update_config(self, new_config):
         """Update crawler configuration"""
         self.config.update(new_config)
+        self.scope_filter = None  # Recompiled from the new config on next use
 
         # Update session headers
         self.session.headers.update({
@@ -681,24 +1229,39 @@ class WebCrawler:
         else:
             self.session.proxies = {}
 
-        # Update rate limiter if it exists
-        if self.rate_limiter:
+        # Update per-host rate limits if the scheduler exists
+        if self.host_scheduler:
             if self.config['delay'] > 0:
-                self.rate_limiter.update_rate(1.0 / self.config['delay'])
+                self.host_scheduler.update_rate(1.0 / self.config['delay'])
             else:
-                self.rate_limiter.update_rate(100.0)
+                self.host_scheduler.update_rate(100.0)
+            self.host_scheduler.max_per_host = self.config.get('max_per_host_concurrency', 0)
 
     def _crawl_worker(self):
-        """Main crawling worker with smooth rate limiting"""
+        """Main crawling worker - dispatches URLs as slots free up, sleeping while idle"""
+        # Keep the data size figures fresh and memory under the limit while the crawl runs
+        self.data_size.start(lambda: self.is_running)
+        self.memory_governor.start(lambda: self.is_running)
+
         # Use async approach if JavaScript rendering is enabled
         if self.config.get('enable_javascript', False):
             print("Initializing JavaScript rendering...")
             asyncio.run(self._crawl_async_with_js())
             return
 
+        # Asyncio fetch engine keeps hundreds of requests in flight on one event loop
+        if self.config.get('fetch_engine') == 'async':
+            print("Initializing async fetch engine...")
+            asyncio.run(self._crawl_async_with_http())
+            return
+
         # Traditional HTTP crawling with smooth rate limiting
         max_workers = self.config.get('concurrency', 5)
 
+        # Pages waiting for a parse worker - their fetch slots are already free
+        parsing = []
+        max_parsing = self.config.get('parse_workers', 0) * PARSE_BACKLOG_PER_WORKER
+
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             active_futures = {}
 
@@ -709,54 +1272,50 @@ class WebCrawler:
                         time.sleep(1)
                         continue
 
-                    # Submit new tasks - fill ALL available slots, apply rate limiting per task
-                    while (len(active_futures) < max_workers and
-                           self.stats['crawled'] < self.config['max_urls']):
+                    # Anything queued or completed after this point wakes the wait below
+                    queue_version = self.link_manager.queue_version
+
+                    # Submit new tasks - fill ALL available slots with URLs whose host is ready
+                    while (len(active_futures) < self._dispatch_limit(max_workers) and
+                           self.stats['crawled'] < self.config['max_urls'] and
+                           len(parsing) <= max_parsing):
 
-                        url_info = self.link_manager.get_next_url()
+                        url_info = self.host_scheduler.next_url()
                         if not url_info:
                             break
 
                         current_url, depth = url_info
 
-                        # Skip if depth exceeded
-                        if depth > self.config['max_depth']:
-                            continue
-
-                        # Submit crawl task immediately - rate limiting happens inside the worker
+                        # Submit crawl task - the scheduler has already applied per-host rate limits
                         print(f"Submitting task for: {current_url}")
                         future = executor.submit(self._crawl_url, current_url, depth)
+                        future.add_done_callback(lambda _: self.link_manager.notify_queue_changed())
                         active_futures[future] = current_url
 
                     # Process completed tasks
-                    completed_futures = []
-                    for future in list(active_futures.keys()):
-                        if future.done():
-                            completed_futures.append(future)
-                            try:
-                                result = future.result()
-                                if result:
-                                    with self.results_lock:
-                                        self.crawl_results.append(result)
-                                        self.stats['crawled'] += 1
-                                        self.stats['depth'] = max(self.stats['depth'], result.get('depth', 0))
-                                        print(f"Added URL to results: {result['url']} - Total in results: {len(self.crawl_results)}")
-
-                                    # Detect issues
-                                    issues_before = len(self.issue_detector.detected_issues)
-                                    self.issue_detector.detect_issues(result)
-                                    issues_after = len(self.issue_detector.detected_issues)
-
-                                    # Add newly detected issues to unsaved batch
-                                    if self.db_save_enabled and issues_after > issues_before:
-                                        new_issues = self.issue_detector.detected_issues[issues_before:issues_after]
-                                        self.unsaved_issues.extend(new_issues)
-                            except Exception as e:
-                                print(f"Error in crawl task: {e}")
-
-                    # Remove completed futures
+                    completed_futures = [future for future in active_futures if future.done()]
                     for future in completed_futures:
-                        del active_futures[future]
+                        self.host_scheduler.release(active_futures.pop(future))
+                        try:
+                            result = future.result()
+                            if isinstance(result, PendingParse):
+                                result.future.add_done_callback(lambda _: self.link_manager.notify_queue_changed())
+                                parsing.append(result)
+                            elif result:
+                                self._record_result(result)
+                        except Exception as e:
+                            print(f"Error in crawl task: {e}")
+
+                    # Finish pages the parse workers are done with
+                    parsed = [pending for pending in parsing if pending.future.done()]
+                    for pending in parsed:
+                        parsing.remove(pending)
+                        try:
+                            result = pending.result()
+                            if result:
+                                self._record_result(result)
+                        except Exception as e:
+                            print(f"Error finishing parsed page: {e}")
 
                     # Check for completion
                     if self.stats['crawled'] >= self.config['max_urls']:
@@ -764,13 +1323,17 @@ class WebCrawler:
                         break
 
                     # Check if no more work
-                    link_stats = self.link_manager.get_stats()
-                    if link_stats['pending'] == 0 and len(active_futures) == 0:
+                    if self._pending_count() == 0 and len(active_futures) == 0 and not parsing:
                         print("No more URLs to crawl")
                         break
 
-                    # Tiny sleep only to yield CPU
-                    time.sleep(0.001)
+                    # Freed slots were just refilled, so sleep until a task or parse finishes,
+                    # a URL is queued or a cooling-down host becomes ready
+                    if not completed_futures and not parsed:
+                        self.link_manager.wait_for_queue_change(
+                            queue_version,
+                            self._dispatch_wait_timeout(len(active_futures) < self._dispatch_limit(max_workers))
+                        )
 
                 except Exception as e:
                     print(f"Error in crawl worker: {e}")
@@ -783,24 +1346,66 @@ class WebCrawler:
             self._run_pagespeed_analysis()
             self.is_running_pagespeed = False
 
+        self._finish_crawl()
+
+    def _record_result(self, result):
+        """Add a finished page to the results along with its issues"""
+        with self.results_lock:
+            self.crawl_results.append(result)
+            self.stats['crawled'] += 1
+            self.stats['depth'] = max(self.stats['depth'], result.get('depth', 0))
+            print(f"Added URL to results: {result['url']} - Total in results: {len(self.crawl_results)}")
+
+        # Index the status so links to this page pick it up
+        self.link_manager.record_status(result['url'], result.get('status_code'))
+
+        # Pages were checked while being processed; error results are checked here
+        issues = self._page_issues.pop(result['url'], None)
+        if issues is None:
+            issues = self.issue_detector.find_issues(result)
+
+        # Probe the page against the pages crawled so far - duplicates are reported as they are found
+        signature = self._page_signatures.pop(result['url'], None)
+        if self.config.get('enable_duplication_check', True):
+            issues = issues + self.issue_detector.find_duplication_issues(
+                result, signature, self.config.get('duplication_threshold', 0.85)
+            )
+        self.issue_detector.add_issues(issues)
+
+        self.data_size.record('crawl_results', (result,))
+        if issues:
+            self.data_size.record('issues', issues)
+
+        # Add newly detected issues to unsaved batch
+        if self.db_save_enabled:
+            with self.persist_lock:
+                if issues:
+                    self.unsaved_issues.extend(issues)
+                self.unsaved_queue_done.append(result['url'])
+
+        self.notify_results_changed()
+
+    def _finish_crawl(self):
+        """Run end-of-crawl processing, save final data and mark the crawl complete"""
         # Update all linked_from fields before completing
         self._update_all_linked_from()
 
-        # Run duplication detection on all crawled content
-        if self.issue_detector and self.config.get('enable_duplication_check', True):
-            print("Running duplication detection...")
-            duplication_threshold = self.config.get('duplication_threshold', 0.85)
-            self.issue_detector.detect_duplication_issues(self.crawl_results, duplication_threshold)
-            print(f"Duplication detection complete. Total issues: {len(self.issue_detector.get_issues())}")
+        self._shutdown_parse_pool()
+        self._cancel_sitemap_discovery()
+        self._shutdown_robots_service()
 
         # Save final data and mark as complete
         if self.db_save_enabled and self.crawl_id:
-            self._save_batch_to_db(force=True)
-            from src.crawl_db import set_crawl_status
+            self._stop_persistence()
+            from src.crawl_db import set_crawl_status, clear_crawl_queue
             set_crawl_status(self.crawl_id, 'completed')
+            clear_crawl_queue(self.crawl_id)
+
+        self._release_frontier()
 
         # Mark crawl as complete
         self.is_running = False
+        self.notify_results_changed()
         print(f"Crawl completed. Discovered: {self.stats['discovered']}, Crawled: {self.stats['crawled']}")
 
     def _crawl_url(self, url, depth):
@@ -835,12 +1440,16 @@ class WebCrawler:
                 except:
                     pass  # Continue if HEAD request fails
 
+            # Revalidate the cached copy instead of downloading it again
+            cache_entry = self.http_cache.lookup(url) if self.http_cache else None
+
             # Fetch the page with retries
             response = None
             for attempt in range(retries + 1):
                 try:
                     response = self.session.get(
                         url,
+                        headers=HttpCache.conditional_headers(cache_entry),
                         timeout=self.config['timeout'],
                         allow_redirects=self.config['follow_redirects']
                     )
@@ -850,104 +1459,29 @@ class WebCrawler:
                         raise e
                     time.sleep(1)
 
-            # Determine if URL is internal
-            is_internal = self.link_manager.is_internal(url)
-
-            # Create result structure
-            result = {
-                'url': url,
-                'status_code': response.status_code,
-                'content_type': response.headers.get('content-type', '').split(';')[0],
-                'size': len(response.content),
-                'is_internal': is_internal,
-                'depth': depth,
-                'title': '',
-                'meta_description': '',
-                'h1': '',
-                'h2': [],
-                'h3': [],
-                'word_count': 0,
-                'meta_tags': {},
-                'og_tags': {},
-                'twitter_tags': {},
-                'canonical_url': '',
-                'lang': '',
-                'charset': '',
-                'viewport': '',
-                'robots': '',
-                'author': '',
-                'keywords': '',
-                'generator': '',
-                'theme_color': '',
-                'json_ld': [],
-                'analytics': {
-                    'google_analytics': False,
-                    'gtag': False,
-                    'ga4_id': '',
-                    'gtm_id': '',
-                    'facebook_pixel': False,
-                    'hotjar': False,
-                    'mixpanel': False
-                },
-                'images': [],
-                'external_links': 0,
-                'internal_links': 0,
-                'response_time': 0,
-                'redirects': [],
-                'hreflang': [],
-                'schema_org': [],
-                'linked_from': []
-            }
-
-            # Only parse HTML content
-            if 'text/html' in response.headers.get('content-type', ''):
-                soup = BeautifulSoup(response.content, 'html.parser')
-
-                # Extract comprehensive data using SEO extractor
-                self.seo_extractor.extract_basic_seo_data(soup, result)
-                self.seo_extractor.extract_meta_tags(soup, result)
-                self.seo_extractor.extract_opengraph_tags(soup, result)
-                self.seo_extractor.extract_twitter_tags(soup, result)
-                self.seo_extractor.extract_json_ld(soup, result)
-                self.seo_extractor.extract_analytics_tracking(soup, response.text, result)
-                self.seo_extractor.extract_images(soup, url, result)
-                self.seo_extractor.extract_link_counts(soup, result, self.base_domain)
-                self.seo_extractor.extract_hreflang(soup, result)
-                self.seo_extractor.extract_schema_org(soup, result)
-
-                # Collect all links
-                links_before = len(self.link_manager.all_links)
-                self.link_manager.collect_all_links(soup, url, self.crawl_results)
-                links_after = len(self.link_manager.all_links)
-
-                # Add newly discovered links to unsaved batch
-                if self.db_save_enabled and links_after > links_before:
-                    new_links = self.link_manager.all_links[links_before:links_after]
-                    self.unsaved_links.extend(new_links)
-
-                # Extract links for further crawling
-                should_extract = (
-                    not self.list_mode and (
-                        (is_internal and depth < self.config['max_depth']) or
-                        (self.config['crawl_external'] and depth < self.config['max_depth'])
-                    )
+            if cache_entry:
+                cached_result = self._build_cached_page_result(
+                    url, depth, cache_entry, response.status_code,
+                    response.headers, response.content, start_time
                 )
+                if cached_result:
+                    return cached_result
 
-                if should_extract:
-                    self.link_manager.extract_links(soup, url, depth + 1, self._should_crawl_url)
-
-            # Populate linked_from after all link collection is complete
-            result['linked_from'] = self.link_manager.get_source_pages(url)
-            result['response_time'] = round((time.time() - start_time) * 1000, 2)
-
-            # Add to unsaved batch if DB persistence enabled
-            if self.db_save_enabled:
-                self.unsaved_urls.append(result)
-                # Trigger batch save if threshold reached
-                if len(self.unsaved_urls) >= self.batch_save_size:
-                    self._save_batch_to_db()
+                if response.status_code == 304:
+                    # The stored copy is gone - fetch the full page
+                    response = self.session.get(
+                        url,
+                        timeout=self.config['timeout'],
+                        allow_redirects=self.config['follow_redirects']
+                    )
 
-            return result
+            # With a parse pool, the page is finished by the dispatcher once parsed
+            return self._build_page_result(
+                url, depth, response.status_code,
+                response.headers.get('content-type', ''),
+                response.content, response.text, start_time,
+                response_headers=response.headers, defer_parse=True
+            )
 
         except Exception as e:
             return self.seo_extractor.create_empty_result(url, depth, 0, str(e))
@@ -963,104 +1497,12 @@ class WebCrawler:
             if error:
                 return self.seo_extractor.create_empty_result(url, depth, status_code, error)
 
-            # Determine if URL is internal
-            is_internal = self.link_manager.is_internal(url)
-
-            # Create result structure
-            result = {
-                'url': url,
-                'status_code': status_code,
-                'content_type': 'text/html',
-                'size': len(html_content.encode('utf-8')),
-                'is_internal': is_internal,
-                'depth': depth,
-                'title': '',
-                'meta_description': '',
-                'h1': '',
-                'h2': [],
-                'h3': [],
-                'word_count': 0,
-                'meta_tags': {},
-                'og_tags': {},
-                'twitter_tags': {},
-                'canonical_url': '',
-                'lang': '',
-                'charset': '',
-                'viewport': '',
-                'robots': '',
-                'author': '',
-                'keywords': '',
-                'generator': '',
-                'theme_color': '',
-                'json_ld': [],
-                'analytics': {
-                    'google_analytics': False,
-                    'gtag': False,
-                    'ga4_id': '',
-                    'gtm_id': '',
-                    'facebook_pixel': False,
-                    'hotjar': False,
-                    'mixpanel': False
-                },
-                'images': [],
-                'external_links': 0,
-                'internal_links': 0,
-                'response_time': 0,
-                'redirects': [],
-                'hreflang': [],
-                'schema_org': [],
-                'linked_from': [],
-                'javascript_rendered': True
-            }
-
-            # Parse HTML
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            # Extract comprehensive data
-            self.seo_extractor.extract_basic_seo_data(soup, result)
-            self.seo_extractor.extract_meta_tags(soup, result)
-            self.seo_extractor.extract_opengraph_tags(soup, result)
-            self.seo_extractor.extract_twitter_tags(soup, result)
-            self.seo_extractor.extract_json_ld(soup, result)
-            self.seo_extractor.extract_analytics_tracking(soup, html_content, result)
-            self.seo_extractor.extract_images(soup, url, result)
-            self.seo_extractor.extract_link_counts(soup, result, self.base_domain)
-            self.seo_extractor.extract_hreflang(soup, result)
-            self.seo_extractor.extract_schema_org(soup, result)
-
-            # Collect all links
-            links_before = len(self.link_manager.all_links)
-            self.link_manager.collect_all_links(soup, url, self.crawl_results)
-            links_after = len(self.link_manager.all_links)
-
-            # Add newly discovered links to unsaved batch
-            if self.db_save_enabled and links_after > links_before:
-                new_links = self.link_manager.all_links[links_before:links_after]
-                self.unsaved_links.extend(new_links)
-
-            # Extract links for further crawling
-            should_extract = (
-                not self.list_mode and (
-                    (is_internal and depth < self.config['max_depth']) or
-                    (self.config['crawl_external'] and depth < self.config['max_depth'])
-                )
+            page = self._build_page_result(
+                url, depth, status_code, 'text/html',
+                html_content, html_content, start_time,
+                javascript_rendered=True, defer_parse=True
             )
-
-            if should_extract:
-                self.link_manager.extract_links(soup, url, depth + 1, self._should_crawl_url)
-
-            # Populate linked_from after all link collection is complete
-            result['linked_from'] = self.link_manager.get_source_pages(url)
-            result['response_time'] = round((time.time() - start_time) * 1000, 2)
-
-            # Add to unsaved batch if DB persistence enabled
-            if self.db_save_enabled:
-                self.unsaved_urls.append(result)
-                # Trigger batch save if threshold reached
-                if len(self.unsaved_urls) >= self.batch_save_size:
-                    self._save_batch_to_db()
-
-            return result
+            return await self._await_parse(page)
 
         except Exception as e:
             return self.seo_extractor.create_empty_result(url, depth, 0, f'JavaScript rendering error: {str(e)}')
@@ -1074,10 +1516,10 @@ class WebCrawler:
             print("JavaScript renderer initialized successfully")
 
             max_workers = self.config.get('js_max_concurrent_pages', 3)
-            active_tasks = set()
+            active_tasks = {}
             
             # Track initial stats
-            initial_pending = self.link_manager.get_stats()['pending']
+            initial_pending = self._pending_count()
             print(f"Starting JS crawl with {initial_pending} URLs in queue, max_workers={max_workers}")
 
             while self.is_running and self.stats['crawled'] < self.config['max_urls']:
@@ -1086,67 +1528,47 @@ class WebCrawler:
                     await asyncio.sleep(1)
                     continue
 
-                # Get current queue stats
-                link_stats = self.link_manager.get_stats()
-                
-                # Submit new tasks - fill ALL available slots
+                # Submit new tasks - fill ALL available slots with URLs whose host is ready
                 urls_submitted = 0
-                while len(active_tasks) < max_workers:
-                    url_info = self.link_manager.get_next_url()
+                while len(active_tasks) < self._dispatch_limit(max_workers):
+                    url_info = self.host_scheduler.next_url()
                     if not url_info:
                         break
 
                     current_url, depth = url_info
 
-                    if depth <= self.config['max_depth']:
-                        # SMOOTH RATE LIMITING: Only apply if delay > 0
-                        if self.config.get('delay', 0) > 0:
-                            await self.rate_limiter.acquire_async()
-
-                        # Create task
-                        task = asyncio.create_task(self._crawl_url_with_javascript(current_url, depth))
-                        active_tasks.add(task)
-                        urls_submitted += 1
+                    # Create task
+                    task = asyncio.create_task(self._crawl_url_with_javascript(current_url, depth))
+                    active_tasks[task] = current_url
+                    urls_submitted += 1
                 
                 if urls_submitted > 0:
                     print(f"Submitted {urls_submitted} new URLs for JS rendering, active tasks: {len(active_tasks)}")
 
-                # Process completed tasks
-                if active_tasks:
-                    done, active_tasks = await asyncio.wait(active_tasks, timeout=0.5, return_when=asyncio.FIRST_COMPLETED)
-
-                    for task in done:
-                        try:
-                            result = await task
-                            if result:
-                                with self.results_lock:
-                                    self.crawl_results.append(result)
-                                    self.stats['crawled'] += 1
-                                    self.stats['depth'] = max(self.stats['depth'], result.get('depth', 0))
-                                    print(f"JS Crawl complete: {result['url']} - Total results: {len(self.crawl_results)}")
-
-                                # Detect issues
-                                issues_before = len(self.issue_detector.detected_issues)
-                                self.issue_detector.detect_issues(result)
-                                issues_after = len(self.issue_detector.detected_issues)
-
-                                # Add newly detected issues to unsaved batch
-                                if self.db_save_enabled and issues_after > issues_before:
-                                    new_issues = self.issue_detector.detected_issues[issues_before:issues_after]
-                                    self.unsaved_issues.extend(new_issues)
-                        except Exception as e:
-                            print(f"Error in async crawl task: {e}")
-                            import traceback
-                            traceback.print_exc()
-
                 # Check completion - only exit if no pending URLs AND no active tasks
-                link_stats = self.link_manager.get_stats()
-                if link_stats['pending'] == 0 and len(active_tasks) == 0:
+                if self._pending_count() == 0 and len(active_tasks) == 0:
                     print(f"No more URLs to crawl. Crawled: {self.stats['crawled']}")
                     break
 
-                await asyncio.sleep(0.01)
+                # Wait for a task to finish or a cooling-down host to become ready
+                timeout = self._dispatch_wait_timeout(len(active_tasks) < self._dispatch_limit(max_workers))
+                if not active_tasks:
+                    await asyncio.sleep(timeout)
+                    continue
+
+                done, _ = await asyncio.wait(list(active_tasks), timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
 
+                for task in done:
+                    self.host_scheduler.release(active_tasks.pop(task))
+                    try:
+                        result = await task
+                        if result:
+                            self._record_result(result)
+                    except Exception as e:
+                        print(f"Error in async crawl task: {e}")
+                        import traceback
+                        traceback.print_exc()
 
             # Run PageSpeed if enabled
             if self.config.get('enable_pagespeed', False):
@@ -1155,104 +1577,352 @@ class WebCrawler:
                 self.is_running_pagespeed = False
 
         finally:
-            # Update all linked_from fields before completing
-            self._update_all_linked_from()
-
-            # Run duplication detection on all crawled content
-            if self.issue_detector and self.config.get('enable_duplication_check', True):
-                print("Running duplication detection...")
-                duplication_threshold = self.config.get('duplication_threshold', 0.85)
-                self.issue_detector.detect_duplication_issues(self.crawl_results, duplication_threshold)
-                print(f"Duplication detection complete. Total issues: {len(self.issue_detector.get_issues())}")
-
-            # Save final data and mark as complete
-            if self.db_save_enabled and self.crawl_id:
-                self._save_batch_to_db(force=True)
-                from src.crawl_db import set_crawl_status
-                set_crawl_status(self.crawl_id, 'completed')
+            self._finish_crawl()
 
             # Clean up
             await self.js_renderer.cleanup()
-            self.is_running = False
-            print(f"Crawl completed. Discovered: {self.stats['discovered']}, Crawled: {self.stats['crawled']}")
+
+    async def _crawl_url_with_aiohttp(self, url, depth):
+        """Crawl a single URL using the asyncio fetch engine"""
+        start_time = time.time()
+
+        try:
+            # Revalidate the cached copy instead of downloading it again
+            cache_entry = None
+            if self.http_cache and self.http_cache.revalidate:
+                cache_entry = await asyncio.to_thread(self.http_cache.lookup, url)
+
+            status_code, headers, content, text, error = await self.async_fetcher.fetch(
+                url, HttpCache.conditional_headers(cache_entry)
+            )
+
+            if error:
+                return self.seo_extractor.create_empty_result(url, depth, status_code, error)
+
+            if cache_entry:
+                cached_result = await asyncio.to_thread(
+                    self._build_cached_page_result,
+                    url, depth, cache_entry, status_code, headers, content, start_time
+                )
+                if cached_result:
+                    return cached_result
+
+                if status_code == 304:
+                    # The stored copy is gone - fetch the full page
+                    status_code, headers, content, text, error = await self.async_fetcher.fetch(url)
+                    if error:
+                        return self.seo_extractor.create_empty_result(url, depth, status_code, error)
+
+            # Parse off the event loop so in-flight requests keep moving
+            page = await asyncio.to_thread(
+                self._build_page_result,
+                url, depth, status_code,
+                headers.get('content-type', ''),
+                content, text, start_time,
+                response_headers=headers, defer_parse=True
+            )
+            return await self._await_parse(page)
+
+        except Exception as e:
+            return self.seo_extractor.create_empty_result(url, depth, 0, str(e))
+
+    async def _crawl_async_with_http(self):
+        """Async crawling loop for the asyncio fetch engine"""
+        try:
+            await self.async_fetcher.initialize()
+
+            max_in_flight = self.config.get('async_max_connections', 100)
+            active_tasks = {}
+
+            print(f"Starting async crawl with {self._pending_count()} URLs in queue, "
+                  f"max_in_flight={max_in_flight}")
+
+            while self.is_running:
+                # Check if paused
+                if self.is_paused:
+                    await asyncio.sleep(1)
+                    continue
+
+                # Submit new tasks - in-flight requests count towards max_urls
+                while (len(active_tasks) < self._dispatch_limit(max_in_flight) and
+                       self.stats['crawled'] + len(active_tasks) < self.config['max_urls']):
+                    url_info = self.host_scheduler.next_url()
+                    if not url_info:
+                        break
+
+                    current_url, depth = url_info
+
+                    task = asyncio.create_task(self._crawl_url_with_aiohttp(current_url, depth))
+                    active_tasks[task] = current_url
+
+                # Check for completion
+                if self.stats['crawled'] >= self.config['max_urls']:
+                    print(f"Reached maximum URLs limit ({self.config['max_urls']})")
+                    break
+
+                if self._pending_count() == 0 and len(active_tasks) == 0:
+                    print(f"No more URLs to crawl. Crawled: {self.stats['crawled']}")
+                    break
+
+                # Wait for a task to finish or a cooling-down host to become ready
+                can_dispatch = (len(active_tasks) < self._dispatch_limit(max_in_flight) and
+                                self.stats['crawled'] + len(active_tasks) < self.config['max_urls'])
+                timeout = self._dispatch_wait_timeout(can_dispatch)
+                if not active_tasks:
+                    await asyncio.sleep(timeout)
+                    continue
+
+                done, _ = await asyncio.wait(list(active_tasks), timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    self.host_scheduler.release(active_tasks.pop(task))
+                    try:
+                        result = task.result()
+                        if result:
+                            self._record_result(result)
+                    except Exception as e:
+                        print(f"Error in async crawl task: {e}")
+
+            # Let in-flight requests finish before shutting the pool down
+            if active_tasks:
+                await asyncio.wait(list(active_tasks))
+
+            # Run PageSpeed if enabled
+            if self.config.get('enable_pagespeed', False):
+                self.is_running_pagespeed = True
+                self._run_pagespeed_analysis()
+                self.is_running_pagespeed = False
+
+        finally:
+            self._finish_crawl()
+
+            # Clean up
+            await self.async_fetcher.cleanup()
+
+    def _build_page_result(self, url, depth, status_code, content_type, content, text, start_time,
+                           javascript_rendered=False, response_headers=None, defer_parse=False):
+        """
+        Build the result for a fetched page and feed its links into the link manager.
+        Shared by the requests, asyncio and JavaScript fetch paths.
+
+        With defer_parse, an HTML page sent to the parse pool is returned as a PendingParse
+        instead of waiting for the worker, so the fetch slot is freed while it parses.
+        """
+        args = self._process_page_args(
+            url, depth, status_code, content_type, content, text, start_time, javascript_rendered
+        )
+        finish = lambda parsed: self._finish_page_result(url, depth, status_code, content, response_headers, parsed)
+
+        pool = self.parse_pool
+        if pool and 'text/html' in content_type:
+            try:
+                future = pool.submit(process_page, *args)
+                pending = PendingParse(future, args, finish)
+                return pending if defer_parse else pending.result()
+            except Exception as e:
+                print(f"Parse worker failed for {url}, parsing inline: {e}")
+
+        return finish(process_page(*args))
+
+    async def _await_parse(self, page):
+        """Wait for a page sent to a parse worker without blocking the event loop"""
+        if not isinstance(page, PendingParse):
+            return page
+        try:
+            await asyncio.wrap_future(page.future)
+        except Exception:
+            pass  # Parsed inline by result()
+        return await asyncio.to_thread(page.result)
+
+    def _finish_page_result(self, url, depth, status_code, content, response_headers, parsed):
+        """Record a parsed page's issues and validators, and feed its links into the link manager"""
+        result, link_records, issues, signature = parsed
+        self._page_issues[url] = issues
+        if signature is not None:
+            self._page_signatures[url] = signature
+
+        # Remember validators so the next crawl can revalidate instead of refetching
+        if self.http_cache and response_headers is not None and status_code == 200:
+            self.http_cache.record(url, response_headers, HttpCache.content_hash(content))
+
+        return self._apply_page_result(url, depth, result, link_records)
+
+    def _build_cached_page_result(self, url, depth, cache_entry, status_code, response_headers, content,
+                                  start_time):
+        """
+        Rebuild a page the server reports as unchanged (304, or the same content hash) from the
+        HTTP cache. Returns None if the page has to be processed normally.
+        """
+        if not self.http_cache.is_unchanged(cache_entry, status_code, content):
+            return None
+
+        cached_page = self.http_cache.load_page(cache_entry, depth)
+        if not cached_page:
+            return None
+
+        result, link_records, signature = cached_page
+        result['response_time'] = round((time.time() - start_time) * 1000, 2)
+        self._page_issues[url] = self.issue_detector.find_issues(result)
+        if signature is not None:
+            self._page_signatures[url] = signature
+        self.http_cache.record(url, response_headers, cache_entry['content_hash'], previous=cache_entry)
+        print(f"Page unchanged since crawl {cache_entry['crawl_id']}, reusing stored data: {url}")
+
+        return self._apply_page_result(url, depth, result, link_records, cache_entry=cache_entry)
+
+    def _apply_page_result(self, url, depth, result, link_records, cache_entry=None):
+        """
+        Feed a page's links into the link manager and queue the result for saving.
+        Pages reused from the HTTP cache (cache_entry set) are copied from their stored rows instead.
+        """
+        if link_records:
+            # Collect all links
+            new_links = self.link_manager.add_link_records(link_records, url)
+            self.data_size.record('links', new_links)
+
+            # Add newly discovered links to unsaved batch
+            if self.db_save_enabled and not cache_entry and new_links:
+                with self.persist_lock:
+                    self.unsaved_links.extend(new_links)
+
+            # Extract links for further crawling
+            should_extract = (
+                not self.list_mode and (
+                    (result['is_internal'] and depth < self.config['max_depth']) or
+                    (self.config['crawl_external'] and depth < self.config['max_depth'])
+                )
+            )
+
+            if should_extract:
+                self.link_manager.queue_link_records(link_records, url, depth + 1, self._should_crawl_url)
+
+        # Populate linked_from after all link collection is complete
+        result['linked_from'] = self.link_manager.get_source_pages(url)
+
+        # Add to unsaved batch if DB persistence enabled - the persistence thread saves it
+        if self.db_save_enabled:
+            if cache_entry:
+                self.http_cache.queue_copy(cache_entry, result)
+            with self.persist_lock:
+                if not cache_entry:
+                    self.unsaved_urls.append(result)
+                    signature = self._page_signatures.get(url)
+                    if signature is not None:
+                        self.unsaved_signatures[url] = signature
+                # Wake the persistence thread once a batch is ready
+                if self._pending_save_count() >= self.batch_save_size:
+                    self.persist_changed.notify_all()
+
+        return result
+
+    def _process_page_args(self, url, depth, status_code, content_type, content, text, start_time,
+                           javascript_rendered=False):
+        """Arguments for process_page (only HTML is sent to the parse pool - the rest is cheaper inline)"""
+        return (
+            url, depth, status_code, content_type, content, text, start_time,
+            self.base_domain,
+            self.config.get('parser_backend', 'html.parser'),
+            self.issue_detector.exclusion_patterns,
+            javascript_rendered,
+            self.config.get('enable_duplication_check', True)
+        )
+
+    def _next_queued_url(self):
+        """Get the next URL from the crawl queue that is within max_depth"""
+        while True:
+            url_info = self.link_manager.get_next_url()
+            if not url_info or url_info[1] <= self.config['max_depth']:
+                return url_info
+
+    def _pending_count(self):
+        """
+        Count URLs waiting in the crawl queue, the per-host scheduler and for robots.txt,
+        plus sitemap files still being read
+        """
+        pending = self.link_manager.pending_count()
+        if self.host_scheduler:
+            pending += self.host_scheduler.pending_count()
+        if self.robots_service:
+            pending += self.robots_service.pending_count()
+        if self.sitemap_discovery:
+            pending += self.sitemap_discovery.pending_count()
+        return pending
+
+    def _dispatch_limit(self, max_in_flight):
+        """Concurrent fetches allowed right now - one at a time while the memory governor throttles"""
+        if self.memory_governor and self.memory_governor.throttled:
+            return 1
+        return max_in_flight
+
+    def _spill_results(self, keep_rows):
+        """Spill the older URL results, links and issues to disk (called by the memory governor)"""
+        spilled = self.crawl_results.spill(keep_rows['crawl_results']) if hasattr(self.crawl_results, 'spill') else 0
+        if self.link_manager:
+            spilled += self.link_manager.spill_links(keep_rows['links'])
+        if self.issue_detector and hasattr(self.issue_detector.detected_issues, 'spill'):
+            spilled += self.issue_detector.detected_issues.spill(keep_rows['issues'])
+        return spilled
+
+    def _dispatch_wait_timeout(self, can_dispatch):
+        """
+        How long the dispatch loop may sleep before re-checking for work.
+        Capped so stop/pause requests are still noticed promptly.
+        """
+        timeout = self.host_scheduler.time_until_ready() if can_dispatch else None
+        if timeout is None:
+            return 1.0
+        return min(max(timeout, 0.001), 1.0)
+
+    def _get_crawl_delay(self, origin):
+        """Get the Crawl-delay for a host from the cached robots.txt"""
+        if not self.config.get('respect_robots', True) or not self.robots_service:
+            return None
+        return self.robots_service.crawl_delay(origin)
 
     def _update_all_linked_from(self):
         """Update linked_from field for all crawled URLs based on collected source_pages data"""
         print("Updating linked_from data for all URLs...")
         updated_count = 0
 
-        for result in self.crawl_results:
-            url = result['url']
-            sources = self.link_manager.get_source_pages(url)
+        def update_linked_from(result):
+            nonlocal updated_count
+            sources = self.link_manager.get_source_pages(result['url'])
             if sources:
                 result['linked_from'] = sources
                 updated_count += 1
+                return True
+            return False
+
+        # Spilled results are rewritten on disk
+        self.crawl_results.update_each(update_linked_from)
 
         print(f"Updated linked_from data for {updated_count} URLs")
 
-    def _should_crawl_url(self, url):
-        """Check if URL should be crawled based on settings"""
-        parsed = urlparse(url)
+    def _should_crawl_url(self, url, depth=0):
+        """
+        Check if URL should be crawled based on settings.
+        A URL whose host's robots.txt is still being fetched is not crawlable yet: it waits
+        in the robots service and is queued at the given depth once robots.txt allows it.
 
-        # Check external domain policy
-        if not self.config['crawl_external']:
-            if not self.link_manager.is_internal(url):
-                return False
+        Returns:
+            bool or None: None while the URL waits for its host's robots.txt
+        """
+        # Check the compiled scope rules (domain policy, extensions, URL patterns)
+        scope_filter = self.scope_filter or self._build_scope_filter()
+        if not scope_filter.allows(url):
+            return False
 
         # Check robots.txt
-        if self.config['respect_robots']:
-            if not self._check_robots_txt(url):
-                return False
-
-        # Check file extensions
-        path = parsed.path.lower()
-        if '.' in path:
-            extension = path.split('.')[-1]
-
-            if extension in self.config['exclude_extensions']:
-                return False
-
-            if self.config['include_extensions'] and extension not in self.config['include_extensions']:
-                return False
-
-        # Check URL patterns
-        if self.config['exclude_patterns']:
-            for pattern in self.config['exclude_patterns']:
-                if pattern and re.search(pattern, url):
-                    return False
-
-        if self.config['include_patterns']:
-            pattern_match = False
-            for pattern in self.config['include_patterns']:
-                if pattern and re.search(pattern, url):
-                    pattern_match = True
-                    break
-            if not pattern_match:
-                return False
+        if self.config['respect_robots'] and self.robots_service:
+            return self.robots_service.check(url, depth)
 
         return True
 
-    def _check_robots_txt(self, url):
-        """Check if URL is allowed by robots.txt"""
-        try:
-            parsed = urlparse(url)
-            robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
-
-            if robots_url not in self._robots_cache:
-                rp = RobotFileParser()
-                rp.set_url(robots_url)
-                try:
-                    rp.read()
-                    self._robots_cache[robots_url] = rp
-                except:
-                    return True
-
-            rp = self._robots_cache[robots_url]
-            user_agent = self.config.get('user_agent', '*')
-            return rp.can_fetch(user_agent, url)
-
-        except Exception:
-            return True
+    def _build_scope_filter(self):
+        """Compile the scope rules of the current config (rebuilt after the config changes)"""
+        self.scope_filter = ScopeFilter.from_config(self.config, self.base_domain)
+        return self.scope_filter
 
     def _run_pagespeed_analysis(self):
         """Run PageSpeed analysis on selected pages"""
@@ -34,12 +34,12 @@ class SettingsManager:
         ]
 
         # extra: all in user + Filters, Requests, Custom CSS, JavaScript tabs
-        # NOTE: Advanced tab settings (concurrency, memoryLimit, logLevel, saveSession,
+        # NOTE: Advanced tab settings (concurrency, fetchEngine, parserBackend, parseWorkers, urlSeenSet, memoryLimit, logLevel, saveSession,
         #       enableProxy, proxyUrl, customHeaders) are ADMIN ONLY
         extra_settings = user_settings + [
             # Requests tab
             'userAgent', 'timeout', 'retries', 'acceptLanguage', 'respectRobotsTxt', 'allowCookies',
-            'discoverSitemaps', 'enablePageSpeed', 'googleApiKey',
+            'useHttpCache', 'discoverSitemaps', 'enablePageSpeed', 'googleApiKey',
             # Filters tab
             'includeExtensions', 'excludeExtensions', 'includePatterns', 'excludePatterns', 'maxFileSize',
             # JavaScript tab
@@ -87,6 +87,7 @@ class SettingsManager:
             'acceptLanguage': 'en-US,en;q=0.9',
             'respectRobotsTxt': True,
             'allowCookies': True,
+            'useHttpCache': False,
             'discoverSitemaps': True,
             'enablePageSpeed': False,
             'googleApiKey': '',
@@ -108,6 +109,12 @@ class SettingsManager:
 
             # Advanced settings
             'concurrency': 5,
+            'fetchEngine': 'threads',
+            'parserBackend': 'html.parser',
+            'parseWorkers': 0,
+            'urlSeenSet': 'exact',
+            'asyncMaxConnections': 100,
+            'maxPerHostConcurrency': 0,
             'memoryLimit': 512,
             'logLevel': 'INFO',
             'saveSession': False,
@@ -431,6 +438,9 @@ class SettingsManager:
                 'retries': (0, 10),
                 'maxFileSize': (1, 1000),
                 'concurrency': (1, 50),
+                'asyncMaxConnections': (1, 1000),
+                'parseWorkers': (0, 64),
+                'maxPerHostConcurrency': (0, 50),
                 'memoryLimit': (64, 4096),
                 'jsWaitTime': (0, 30),
                 'jsTimeout': (5, 120),
@@ -488,12 +498,19 @@ class SettingsManager:
             'accept_language': settings['acceptLanguage'],
             'respect_robots': settings['respectRobotsTxt'],
             'allow_cookies': settings['allowCookies'],
+            'use_http_cache': settings['useHttpCache'],
             'include_extensions': [ext.strip() for ext in settings['includeExtensions'].split(',') if ext.strip()],
             'exclude_extensions': [ext.strip() for ext in settings['excludeExtensions'].split(',') if ext.strip()],
             'include_patterns': [p.strip() for p in settings['includePatterns'].split('\n') if p.strip()],
             'exclude_patterns': [p.strip() for p in settings['excludePatterns'].split('\n') if p.strip()],
             'max_file_size': settings['maxFileSize'] * 1024 * 1024,  # Convert MB to bytes
             'concurrency': settings['concurrency'],
+            'fetch_engine': settings['fetchEngine'],
+            'parser_backend': settings['parserBackend'],
+            'parse_workers': settings['parseWorkers'],
+            'url_seen_set': settings['urlSeenSet'],
+            'async_max_connections': settings['asyncMaxConnections'],
+            'max_per_host_concurrency': settings['maxPerHostConcurrency'],
             'memory_limit': settings['memoryLimit'] * 1024 * 1024,  # Convert MB to bytes
             'log_level': settings['logLevel'],
             'enable_proxy': settings['enableProxy'],
@@ -0,0 +1,87 @@
+"""
+Crawl database writer tests.
+
+Checks that writes from many threads all land through the single writer
+connection, and that a failing write doesn't take the others down with it.
+
+Run with: python -m pytest tests/test_crawl_db_writer.py
+"""
+import sys
+import os
+import threading
+
+import pytest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import crawl_db
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(crawl_db, 'DB_FILE', str(tmp_path / 'crawls.db'))
+    crawl_db.init_crawl_tables()
+    yield crawl_db
+    crawl_db.close_connections()
+
+
+def test_concurrent_batches_all_saved(db):
+    crawl_ids = [db.create_crawl(1, 'session', 'https://www.example.com/', 'www.example.com', {}) for _ in range(4)]
+
+    def save(crawl_id):
+        for batch in range(20):
+            urls = [{'url': f"https://www.example.com/{batch}/{i}", 'status_code': 200, 'h2': ['Heading']}
+                    for i in range(5)]
+            assert db.save_url_batch(crawl_id, urls)
+
+    threads = [threading.Thread(target=save, args=(crawl_id,)) for crawl_id in crawl_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for crawl_id in crawl_ids:
+        urls = db.load_crawled_urls(crawl_id)
+        assert len(urls) == 100
+        assert urls[0]['h2'] == ['Heading']
+
+    with db.get_db() as conn:
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_failing_write_is_rolled_back_alone(db):
+    crawl_id = db.create_crawl(1, 'session', 'https://www.example.com/', 'www.example.com', {})
+
+    def partial_write(conn):
+        conn.execute("UPDATE crawls SET status = 'paused' WHERE id = ?", (crawl_id,))
+        conn.execute('INSERT INTO missing_table VALUES (1)')
+
+    failed = db.get_writer().submit(partial_write, wait=False)
+    assert db.set_crawl_status(crawl_id, 'completed')
+    failed.done.wait()
+
+    assert failed.error is not None
+    assert db.get_crawl_by_id(crawl_id)['status'] == 'completed'
+
+
+def test_http_cache_is_scoped_by_owner(db):
+    url = 'https://www.example.com/'
+    crawls = {
+        'user 1': db.create_crawl(1, 'session-a', url, 'www.example.com', {}),
+        'user 2': db.create_crawl(2, 'session-b', url, 'www.example.com', {}),
+        'guest': db.create_crawl(None, 'session-c', url, 'www.example.com', {})
+    }
+    assert db.save_url_batch(crawls['user 1'], [{'url': url, 'status_code': 200}])
+    assert db.save_http_cache_batch(crawls['user 1'], [{'url': url, 'etag': '"v1"', 'content_hash': 'a'}])
+
+    later_crawl = db.create_crawl(1, 'session-d', url, 'www.example.com', {})
+    assert db.get_http_cache_entry(later_crawl, url)['etag'] == '"v1"'
+    assert db.get_http_cache_entry(crawls['user 2'], url) is None
+    assert db.get_http_cache_entry(crawls['guest'], url) is None
+
+    # The same URL cached by another owner gets its own entry
+    assert db.save_url_batch(crawls['user 2'], [{'url': url, 'status_code': 200}])
+    assert db.save_http_cache_batch(crawls['user 2'], [{'url': url, 'etag': '"v2"', 'content_hash': 'b'}])
+    assert db.get_http_cache_entry(later_crawl, url)['etag'] == '"v1"'
+    assert db.get_recrawl_seed(crawls['user 1'])[0]['change_count'] == 0
@@ -0,0 +1,175 @@
+"""
+Crawler persistence tests.
+
+Checks that rows handed over by crawl threads are saved by the persistence thread,
+exactly once, that a batch that fails to save is kept and retried, and that URLs
+waiting for robots.txt are kept in the saved queue.
+
+Run with: python -m pytest tests/test_crawler_persistence.py
+"""
+import sys
+import os
+import threading
+import time
+
+import pytest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import crawl_db
+from src.crawler import WebCrawler
+from src.core.http_cache import HttpCache
+from src.core.robots_service import RobotsCache, RobotsService
+
+
+@pytest.fixture
+def crawler(tmp_path, monkeypatch):
+    monkeypatch.setattr(crawl_db, 'DB_FILE', str(tmp_path / 'crawls.db'))
+    crawl_db.init_crawl_tables()
+    crawler = WebCrawler()
+    crawler.crawl_id = crawl_db.create_crawl(1, 'session', 'https://www.example.com/', 'www.example.com', {})
+    crawler.db_save_enabled = True
+    crawler.batch_save_size = 10
+    yield crawler
+    crawler._stop_persistence(final_save=False)
+    crawl_db.close_connections()
+
+
+def _hand_over(crawler, urls):
+    with crawler.persist_lock:
+        crawler.unsaved_urls.extend({'url': url, 'status_code': 200} for url in urls)
+        crawler.persist_changed.notify_all()
+
+
+def _saved_urls(crawler):
+    return [row['url'] for row in crawl_db.load_crawled_urls(crawler.crawl_id)]
+
+
+def test_rows_from_many_threads_saved_once(crawler):
+    crawler._start_persistence_thread()
+
+    threads = [threading.Thread(target=_hand_over, args=(crawler, [f"https://www.example.com/{t}/{i}" for i in range(25)]))
+               for t in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert crawler.flush_persistence(timeout=10)
+    saved = _saved_urls(crawler)
+    assert len(saved) == 100
+    assert len(set(saved)) == 100
+
+    _hand_over(crawler, ['https://www.example.com/last'])
+    crawler._stop_persistence()
+    assert not crawler.persist_thread
+    assert len(_saved_urls(crawler)) == 101
+
+
+def test_failed_batch_is_retried(crawler, monkeypatch):
+    attempts = []
+    save_url_batch = crawl_db.save_url_batch
+
+    def flaky_save(crawl_id, urls, signatures=None):
+        attempts.append(len(urls))
+        return len(attempts) > 1 and save_url_batch(crawl_id, urls, signatures)
+
+    monkeypatch.setattr(crawl_db, 'save_url_batch', flaky_save)
+    _hand_over(crawler, ['https://www.example.com/a', 'https://www.example.com/b'])
+    crawler.unsaved_signatures['https://www.example.com/a'] = b'signature'
+    crawler.unsaved_queue_done.append('https://www.example.com/a')
+
+    assert not crawler.flush_persistence()
+    assert len(crawler.unsaved_urls) == 2
+    assert crawler.unsaved_signatures == {'https://www.example.com/a': b'signature'}
+    assert crawler.unsaved_queue_done == ['https://www.example.com/a']
+
+    assert crawler.flush_persistence()
+    assert attempts == [2, 2]
+    assert sorted(_saved_urls(crawler)) == ['https://www.example.com/a', 'https://www.example.com/b']
+    assert crawl_db.load_content_signatures(crawler.crawl_id) == {'https://www.example.com/a': b'signature'}
+
+
+def test_failing_saves_back_off(crawler, monkeypatch):
+    attempts = []
+    monkeypatch.setattr(crawl_db, 'save_url_batch', lambda crawl_id, urls, signatures=None: attempts.append(len(urls)) and False)
+    crawler.save_retry_delay = 0.5
+    crawler._start_persistence_thread()
+
+    _hand_over(crawler, [f"https://www.example.com/{i}" for i in range(20)])
+    time.sleep(1.2)
+
+    # One attempt when the batch filled up, then one per retry delay - not a busy loop
+    assert 2 <= len(attempts) <= 4
+    assert len(crawler.unsaved_urls) == 20
+
+
+def test_reused_page_leaves_queue_only_when_copied(crawler, monkeypatch):
+    url = 'https://www.example.com/unchanged'
+    stored_crawl = crawl_db.create_crawl(1, 'session', 'https://www.example.com/', 'www.example.com', {})
+    assert crawl_db.save_url_batch(stored_crawl, [{'url': url, 'status_code': 200}])
+    url_row_id = crawl_db.load_crawled_urls(stored_crawl)[0]['id']
+    assert crawl_db.save_queue_changes(crawler.crawl_id, [(url, 0)], [])
+
+    crawler.http_cache = HttpCache(crawler.crawl_id)
+    crawler.http_cache.queue_copy({'url_row_id': url_row_id}, {'url': url, 'depth': 0, 'response_time': 0.1})
+    crawler.unsaved_queue_done.append(url)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(crawl_db, 'copy_reused_pages', lambda crawl_id, pages: False)
+        assert not crawler.flush_persistence()
+        assert crawl_db.load_crawl_queue(crawler.crawl_id)
+
+    assert crawler.flush_persistence()
+    assert not crawl_db.load_crawl_queue(crawler.crawl_id)
+    assert _saved_urls(crawler) == [url]
+
+
+def test_reused_page_keeps_its_signature(crawler):
+    url = 'https://www.example.com/unchanged'
+    stored_crawl = crawl_db.create_crawl(1, 'session', 'https://www.example.com/', 'www.example.com', {})
+    assert crawl_db.save_url_batch(stored_crawl, [{'url': url, 'status_code': 200}], {url: b'signature'})
+    url_row_id = crawl_db.load_crawled_urls(stored_crawl)[0]['id']
+
+    crawler.http_cache = HttpCache(crawler.crawl_id)
+    assert crawler.http_cache.load_page({'url_row_id': url_row_id}, 0)[2] == b'signature'
+
+    crawler.http_cache.queue_copy({'url_row_id': url_row_id}, {'url': url, 'depth': 0, 'response_time': 0.1})
+    assert crawler.flush_persistence()
+    assert crawl_db.load_content_signatures(crawler.crawl_id) == {url: b'signature'}
+    assert 'content_signature' not in crawl_db.load_crawled_urls(crawler.crawl_id)[0]
+
+
+class HeldRobotsSession:
+    """Serves one robots.txt, holding the fetch until release is set"""
+
+    def __init__(self, text):
+        self.text = text
+        self.release = threading.Event()
+
+    def get(self, url, timeout=None):
+        self.release.wait(5)
+        return type('Response', (), {'status_code': 200, 'text': self.text})()
+
+
+def test_urls_waiting_for_robots_are_saved_in_queue(crawler):
+    session = HeldRobotsSession("User-agent: *\nDisallow: /private/\n")
+    resolved = threading.Event()
+    crawler.robots_service = RobotsService(session, on_parked=crawler._save_robots_parked_url,
+                                           on_rejected=crawler._drop_saved_queue_url,
+                                           on_resolved=resolved.set, cache=RobotsCache())
+
+    assert crawler.robots_service.check('https://www.example.com/a', 1) is None
+    assert crawler.robots_service.check('https://www.example.com/private/b', 1) is None
+    assert crawler.flush_persistence()
+    assert sorted(crawl_db.load_crawl_queue(crawler.crawl_id)) == [
+        ('https://www.example.com/a', 1), ('https://www.example.com/private/b', 1)
+    ]
+
+    # Disallowed URLs leave the saved queue once robots.txt arrives
+    session.release.set()
+    assert resolved.wait(5)
+    assert crawler.flush_persistence()
+    assert crawl_db.load_crawl_queue(crawler.crawl_id) == [('https://www.example.com/a', 1)]
+    crawler.robots_service.close()
@@ -0,0 +1,62 @@
+"""
+Deferred parsing tests.
+
+Checks that a page sent to the parse pool comes back as a PendingParse without
+waiting for the worker, and that finishing it gives the same result as parsing inline.
+
+Run with: python -m pytest tests/test_deferred_parse.py
+"""
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core import page_processor
+from src.crawler import WebCrawler, PendingParse
+
+PAGE = b"<html><head><title>Page</title></head><body><h1>Hi</h1><a href='/next'>Next</a></body></html>"
+
+
+def _crawler():
+    crawler = WebCrawler()
+    crawler.base_url = 'https://example.com/'
+    crawler.base_domain = 'example.com'
+    crawler.config['respect_robots'] = False
+    crawler._initialize_components()
+    crawler._reset_state()
+    return crawler
+
+
+def _build(crawler, url, defer_parse):
+    return crawler._build_page_result(url, 0, 200, 'text/html', PAGE, PAGE.decode(), time.time(),
+                                      defer_parse=defer_parse)
+
+
+def test_fetch_thread_does_not_wait_for_the_parse(monkeypatch):
+    release = threading.Event()
+    process_page = page_processor.process_page
+
+    def slow_process_page(*args):
+        release.wait(5)
+        return process_page(*args)
+
+    monkeypatch.setattr('src.crawler.process_page', slow_process_page)
+    crawler = _crawler()
+    crawler.parse_pool = ThreadPoolExecutor(max_workers=1)
+
+    pending = _build(crawler, 'https://example.com/a', defer_parse=True)
+    assert isinstance(pending, PendingParse)
+    assert not pending.future.done()
+
+    release.set()
+    pending.future.result(5)
+    result = pending.result()
+    crawler.parse_pool.shutdown()
+
+    inline = _build(_crawler(), 'https://example.com/a', defer_parse=False)
+    assert result['title'] == inline['title'] == 'Page'
+    assert result['internal_links'] == inline['internal_links']
@@ -0,0 +1,67 @@
+"""
+Exclusion matcher tests.
+
+Checks that the compiled matcher excludes exactly the URLs the per-pattern fnmatch
+loop it replaces did, for the default issue exclusion patterns.
+
+Run with: python -m pytest tests/test_exclusion_matcher.py
+"""
+import sys
+import os
+from fnmatch import fnmatch
+from urllib.parse import urlparse
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.exclusion_matcher import ExclusionMatcher, get_exclusion_matcher
+from src.crawler import WebCrawler
+
+
+def _reference_excludes(url, patterns):
+    path = urlparse(url).path
+    for pattern in patterns:
+        if '*' in pattern:
+            if fnmatch(path, pattern):
+                return True
+        elif path == pattern or path.startswith(pattern.rstrip('*')):
+            return True
+    return False
+
+
+def _urls():
+    paths = ['/', '/blog/post-1', '/wp-admin/options.php', '/wp-admin', '/login', '/login-help', '/Login',
+             '/cart/', '/cart', '/account/password/reset', '/feed', '/blog/feed/', '/search?q=x',
+             '/page/2/', '/tag/seo', '/products/widget.html', '/admin/', '/administrator/index.php',
+             '/static/app.js', '/xmlrpc.php', '/wp-json/wp/v2/posts', '/checkout/step-1']
+    return [f"https://www.example.com{path}" for path in paths]
+
+
+def test_default_patterns_match_fnmatch_loop():
+    patterns = WebCrawler()._get_default_config()['issue_exclusion_patterns']
+    matcher = ExclusionMatcher(patterns)
+
+    for url in _urls():
+        assert matcher.excludes(url) == _reference_excludes(url, patterns), url
+
+
+def test_globs_prefixes_and_comments():
+    patterns = ['# comment', '', '/private', '/docs/*.pdf', '/a?c/*', '/[xy]/*', '/tmp*']
+    matcher = ExclusionMatcher(patterns)
+
+    assert matcher.excludes('https://www.example.com/private/file')
+    assert matcher.excludes('https://www.example.com/docs/guides/manual.pdf')
+    assert not matcher.excludes('https://www.example.com/docs/manual.html')
+    assert matcher.excludes('https://www.example.com/abc/page')
+    assert matcher.excludes('https://www.example.com/y/page')
+    assert not matcher.excludes('https://www.example.com/z/page')
+    assert matcher.excludes('https://www.example.com/tmpfile')
+    assert not matcher.excludes('https://www.example.com/')
+
+    issues = [{'url': 'https://www.example.com/private'}, {'url': 'https://www.example.com/public'}]
+    assert matcher.filter_issues(issues) == issues[1:]
+
+
+def test_matchers_are_shared():
+    assert get_exclusion_matcher(['/a/*', '/b']) is get_exclusion_matcher(('/a/*', '/b'))
+    assert get_exclusion_matcher([]).filter_issues([{'url': 'https://www.example.com/'}])
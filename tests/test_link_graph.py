@@ -0,0 +1,97 @@
+"""
+LinkGraph tests.
+
+Checks that links read back from the id-based edge arrays match the link dicts they
+were built from, with target statuses looked up as they are read.
+
+Run with: python -m pytest tests/test_link_graph.py
+"""
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.link_graph import LinkGraph
+from src.core.url_set import FingerprintSet
+
+
+def _links(count):
+    return [{
+        'source_url': f"https://www.example.com/page-{i // 10}.html",
+        'target_url': f"https://www.example.com/page-{i}.html" if i % 7 else 'https://other.example.org/',
+        'anchor_text': f"Link {i % 3}",
+        'is_internal': bool(i % 7),
+        'target_domain': 'www.example.com' if i % 7 else 'other.example.org',
+        'target_status': None,
+        'placement': ('body', 'navigation', 'footer')[i % 3]
+    } for i in range(count)]
+
+
+def test_links_read_back_unchanged():
+    links = _links(200)
+    graph = LinkGraph()
+    graph.extend(links)
+
+    assert len(graph) == 200
+    assert list(graph) == links
+    assert graph[50:60] == links[50:60]
+    assert graph[-1] == links[-1]
+    assert len(graph.anchors) == 3
+
+
+def test_statuses_are_looked_up_when_read():
+    statuses = {}
+    graph = LinkGraph(statuses.get)
+    graph.extend(_links(20))
+
+    assert graph[5]['target_status'] is None
+    statuses['https://www.example.com/page-5.html'] = 404
+    assert graph[5]['target_status'] == 404
+
+    # Statuses that came with the link (e.g. from the database) are kept per target URL
+    saved = dict(_links(1)[0], target_url='https://www.example.com/saved', target_status=301)
+    graph.append(saved)
+    assert graph[-1]['target_status'] == 301
+
+
+def test_saved_link_rows_are_normalized():
+    graph = LinkGraph()
+    link = _links(2)[1]
+    graph.append(dict(link, id=7, crawl_id=3, is_internal=1, discovered_at='2025-01-01 00:00:00'))
+
+    assert graph[0] == link
+
+
+def test_delete_from_front_keeps_url_ids():
+    links = _links(100)
+    graph = LinkGraph()
+    graph.extend(links)
+    key = graph.link_key(links[80]['source_url'], links[80]['target_url'])
+
+    del graph[:60]
+    assert list(graph) == links[60:]
+    assert graph.link_key(links[80]['source_url'], links[80]['target_url']) == key
+
+
+def test_internal_links_between():
+    links = _links(100)
+    graph = LinkGraph()
+    graph.extend(links)
+
+    pages = {f"https://www.example.com/page-{i}.html" for i in range(10)}
+    expected = [(link['source_url'], link['target_url']) for link in links
+                if link['is_internal'] and link['source_url'] in pages and link['target_url'] in pages]
+    assert expected
+    assert graph.internal_links_between(pages) == expected
+
+
+def test_link_keys_in_fingerprint_set():
+    graph = LinkGraph()
+    seen = FingerprintSet()
+    keys = {graph.link_key(link['source_url'], link['target_url']) for link in _links(5000)}
+
+    for key in keys:
+        assert seen.add(key)
+    assert len(seen) == len(keys)
+    assert all(key in seen for key in keys)
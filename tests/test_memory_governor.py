@@ -0,0 +1,79 @@
+"""
+Memory governor tests.
+
+Checks that process RSS growth only triggers spilling, and that the dispatch throttle
+follows the crawl's own in-memory rows - set while they are over the limit, cleared
+once a spill brings them back under it.
+
+Run with: python -m pytest tests/test_memory_governor.py
+"""
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.memory_governor import MemoryGovernor
+
+MB = 1024 * 1024
+
+
+class FakeMonitor:
+    def __init__(self, memory_mb):
+        self.current_memory_mb = memory_mb
+
+    def update(self):
+        pass
+
+
+class FakeLog(list):
+    @property
+    def memory_count(self):
+        return len(self) - self.spilled
+
+    spilled = 0
+
+
+class FakeDataSize:
+    """1 MB per row"""
+
+    def __init__(self, log):
+        self.log = log
+
+    def get_sizes(self):
+        return {'crawl_results_count': len(self.log), 'crawl_results_deep_mb': len(self.log),
+                'links_count': 0, 'issues_count': 0}
+
+
+def _governor(rows, rss_mb, keep_rows):
+    log = FakeLog(range(rows))
+    log.keep_rows = keep_rows  # Rows the spill leaves in memory
+
+    def spill(keep):
+        spilled = max(log.memory_count - log.keep_rows, 0)
+        log.spilled += spilled
+        return spilled
+
+    monitor = FakeMonitor(0)
+    governor = MemoryGovernor(monitor, FakeDataSize(log), lambda: (log, [], []), spill, 100 * MB)
+    monitor.current_memory_mb = rss_mb  # Growth since the governor started
+    return governor, log
+
+
+def test_rss_growth_spills_but_does_not_throttle():
+    governor, log = _governor(rows=50, rss_mb=500, keep_rows=10)
+    governor.check()
+
+    assert log.memory_count == 10
+    assert not governor.throttled
+
+
+def test_throttle_clears_once_rows_are_spilled():
+    governor, log = _governor(rows=150, rss_mb=0, keep_rows=120)
+    governor.check()
+    assert governor.throttled
+
+    log.keep_rows = 30
+    governor.check()
+    assert log.memory_count == 30
+    assert not governor.throttled
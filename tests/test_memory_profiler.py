@@ -0,0 +1,85 @@
+"""
+Data size accounting tests.
+
+Checks that DataSizeTracker's sampled, cached figures stay close to a full
+MemoryProfiler.get_crawler_data_size walk of the same data.
+
+Run with: python -m pytest tests/test_memory_profiler.py
+"""
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.memory_profiler import DataSizeTracker, MemoryProfiler
+from src.core.result_log import ResultLog
+
+
+def _results(count):
+    return [{
+        'url': f"https://www.example.com/page-{i}.html",
+        'status_code': 200 if i % 10 else 404,
+        'title': f"Page {i} title " * (1 + i % 4),
+        'meta_description': 'Description ' * (i % 12),
+        'h2': [f"Heading {i}-{j}" for j in range(i % 5)],
+        'depth': i % 6,
+        'response_time': 0.25
+    } for i in range(count)]
+
+
+def _links(count):
+    return [{
+        'source_url': f"https://www.example.com/page-{i // 20}.html",
+        'target_url': f"https://www.example.com/page-{i}.html",
+        'anchor_text': f"Link {i}",
+        'is_internal': True,
+        'target_status': 200,
+        'placement': 'body'
+    } for i in range(count)]
+
+
+def _close(measured, exact, tolerance=0.15):
+    return abs(measured - exact) <= exact * tolerance
+
+
+def test_sampled_sizes_match_full_measurement():
+    crawl_results, links, issues = _results(5000), _links(20000), []
+    tracker = DataSizeTracker(lambda: (crawl_results, links, issues))
+
+    # Half the rows recorded at append time, the rest only seen by sampling (e.g. a loaded crawl)
+    tracker.record('crawl_results', crawl_results[:2500])
+    tracker.record('links', links[:10000])
+
+    sizes = tracker.get_sizes()
+    exact = MemoryProfiler.get_crawler_data_size(crawl_results, links, issues)
+
+    assert sizes['crawl_results_count'] == 5000
+    assert sizes['links_count'] == 20000
+    for key in ('crawl_results_deep_mb', 'crawl_results_json_mb', 'links_deep_mb', 'links_json_mb'):
+        assert _close(sizes[key], exact[key]), key
+
+
+def test_get_sizes_reads_the_cache():
+    crawl_results = _results(100)
+    tracker = DataSizeTracker(lambda: (crawl_results, [], []))
+
+    first = tracker.get_sizes()
+    crawl_results.extend(_results(100))
+    assert tracker.get_sizes() is first
+
+    assert tracker.refresh()['crawl_results_count'] == 200
+
+
+def test_spilled_rows_are_not_loaded(tmp_path):
+    loaded = []
+    log = ResultLog(spill_dir=str(tmp_path), on_load=loaded.append)
+    for start in range(0, 2000, 100):
+        log.extend(_results(2000)[start:start + 100])
+        log.spill(keep=50)
+    tracker = DataSizeTracker(lambda: (log, [], []))
+
+    sizes = tracker.refresh()
+    assert not loaded
+    assert sizes['crawl_results_count'] == 2000
+    assert sizes['crawl_results_json_mb'] > 0
@@ -0,0 +1,90 @@
+"""
+Near-duplicate detection tests.
+
+Checks that MinHash signatures estimate text similarity, that LSH finds clusters of
+near-duplicate pages without comparing every pair, and that IssueDetector reports
+one issue per page of a cluster.
+
+Run with: python -m pytest tests/test_near_duplicates.py
+"""
+import sys
+import os
+import random
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.issue_detector import IssueDetector
+from src.core.near_duplicates import DuplicateIndex, content_signature, signature_similarity
+
+
+def _text(seed, words=300):
+    rng = random.Random(seed)
+    return ' '.join(f"word{rng.randrange(2000)}" for _ in range(words))
+
+
+def _edit(text, changes, seed=0):
+    rng = random.Random(seed)
+    words = text.split()
+    for _ in range(changes):
+        words[rng.randrange(len(words))] = 'changed'
+    return ' '.join(words)
+
+
+def test_signature_similarity():
+    text = _text(1)
+    assert signature_similarity(content_signature(text), content_signature(text)) == 1.0
+    assert signature_similarity(content_signature(text), content_signature(text.upper())) == 1.0
+    assert signature_similarity(content_signature(text), content_signature(_edit(text, 3))) > 0.85
+    assert signature_similarity(content_signature(text), content_signature(_text(2))) < 0.1
+    assert content_signature('  ') is None
+
+
+def test_clusters_of_near_duplicates():
+    index = DuplicateIndex()
+    templates = [_text(seed) for seed in range(5)]
+    flagged = []
+    for page in range(100):
+        template = templates[page % 5]
+        text = _edit(template, 2, seed=page) if page < 50 else _text(100 + page)
+        flagged.extend(index.add(f"https://www.example.com/{page}", content_signature(text), 0.7))
+
+    clusters = index.clusters()
+    assert sorted(len(urls) for urls, _ in clusters) == [10] * 5
+    for urls, similarity in clusters:
+        assert len({int(url.rsplit('/', 1)[1]) % 5 for url in urls}) == 1
+        assert 0.7 <= similarity <= 1.0
+
+    # Every clustered page is reported once, when it joins its cluster
+    assert sorted(url for url, _, _, _ in flagged) == sorted(url for urls, _ in clusters for url in urls)
+    url, other_count, other_urls, _ = flagged[-1]
+    assert other_count == 9
+    assert len(other_urls) == 5 and url not in other_urls
+
+
+def test_issues_reported_as_pages_arrive():
+    detector = IssueDetector(exclusion_patterns=['/excluded/*'])
+    signature = content_signature(_text(7))
+
+    def check(name, signature=None):
+        result = {'url': f"https://www.example.com/{name}", 'title': 'Same title here', 'meta_description': '',
+                  'h1': 'Same heading', 'h2': [], 'h3': []}
+        return [issue['url'] for issue in detector.find_duplication_issues(result, signature)]
+
+    assert check('a', signature) == []
+    assert check('excluded/b', signature) == []
+    assert check('c', signature) == ['https://www.example.com/c', 'https://www.example.com/a']
+    assert check('d', signature) == ['https://www.example.com/d']
+
+    # Results without a content signature are left out of the index
+    assert check('x') == []
+    assert check('y') == []
+
+    # Pages already checked are skipped by the batch pass, pages without a stored signature too
+    detector.detect_duplication_issues([{'url': 'https://www.example.com/a'}, {'url': 'https://www.example.com/e'}],
+                                       {'https://www.example.com/a': signature})
+    assert detector.get_issues() == []
+
+    detector.detect_duplication_issues([{'url': 'https://www.example.com/f'}],
+                                       {'https://www.example.com/f': signature})
+    assert [issue['url'] for issue in detector.get_issues()] == ['https://www.example.com/f']
@@ -0,0 +1,91 @@
+"""
+Parser backend conformance tests.
+
+Every parser backend must produce the same result dict and link records as
+html.parser for the stored pages in tests/fixtures/pages. Pages there should be
+well-formed HTML: on malformed markup each parser applies its own recovery rules.
+
+Run with: python -m pytest tests/test_parser_conformance.py
+"""
+import sys
+import os
+import glob
+import importlib.util
+
+import pytest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.seo_extractor import SEOExtractor
+from src.core.html_document import PARSER_BACKENDS, parse_html
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'pages')
+PAGE_URL = 'https://shop.example.com/section/page.html'
+BASE_DOMAIN = 'shop.example.com'
+
+BACKEND_MODULES = {'lxml': 'lxml', 'selectolax': 'selectolax'}
+
+
+def _pages():
+    return sorted(glob.glob(os.path.join(PAGES_DIR, '*.html')))
+
+
+def _extract(content, backend):
+    result = SEOExtractor.create_result(PAGE_URL, 0)
+    document = parse_html(content, backend)
+    link_records = SEOExtractor.extract_page(document, content.decode('utf-8'), result, BASE_DOMAIN)
+    return result, link_records
+
+
+@pytest.mark.parametrize('backend', [b for b in PARSER_BACKENDS if b != 'html.parser'])
+@pytest.mark.parametrize('page', _pages(), ids=os.path.basename)
+def test_backend_matches_html_parser(backend, page):
+    module = BACKEND_MODULES.get(backend)
+    if module and importlib.util.find_spec(module) is None:
+        pytest.skip(f"{backend} is not installed")
+
+    with open(page, 'rb') as f:
+        content = f.read()
+
+    expected_result, expected_links = _extract(content, 'html.parser')
+    result, links = _extract(content, backend)
+
+    for key in expected_result:
+        assert result[key] == expected_result[key], f"{backend} differs on '{key}'"
+    assert links == expected_links
+
+
+def test_product_page_fields():
+    with open(os.path.join(PAGES_DIR, 'product.html'), 'rb') as f:
+        result, links = _extract(f.read(), 'html.parser')
+
+    assert result['title'] == 'Trail Running Shoe X2 | Example Outdoor Store'
+    assert result['canonical_url'] == 'https://shop.example.com/p/trail-shoe-x2'
+    assert result['charset'] == 'utf-8'
+    assert len(result['json_ld']) == 2
+    assert len(result['hreflang']) == 3
+    assert [item['type'] for item in result['schema_org']] == [
+        'https://schema.org/Product', 'https://schema.org/Offer', 'https://schema.org/AggregateRating'
+    ]
+    assert result['schema_org'][1]['properties']['priceCurrency'] == 'USD'
+    assert result['analytics']['ga4_id'] == 'G-1A2B3C4D5E'
+    assert result['analytics']['facebook_pixel']
+
+    placements = {}
+    for url, _, _, placement in links:
+        placements.setdefault(url, placement)
+    assert placements['https://shop.example.com/c/shoes/trail'] == 'navigation'
+    assert placements['https://shop.example.com/help/returns'] == 'footer'
+    assert placements['https://shop.example.com/p/trail-shoe-x1'] == 'body'
+    assert 'https://shop.example.com/p/trail-shoe-x2/reviews?page=2' in placements
+
+
+def test_unknown_backend_falls_back_to_html_parser():
+    with open(os.path.join(PAGES_DIR, 'article.html'), 'rb') as f:
+        content = f.read()
+    assert _extract(content, 'no-such-parser') == _extract(content, 'html.parser')
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-v']))
@@ -0,0 +1,74 @@
+"""
+ResultLog tests.
+
+Checks that a log reads the same as a plain list before and after rows are spilled to disk.
+
+Run with: python -m pytest tests/test_result_log.py
+"""
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.result_log import ResultLog
+
+
+def _rows(start, stop):
+    return [{'url': f"https://www.example.com/page-{i}.html", 'status_code': 200} for i in range(start, stop)]
+
+
+def _spilled_log(tmp_path):
+    log = ResultLog(spill_dir=str(tmp_path))
+    log.extend(_rows(0, 100))
+    assert log.spill(keep=30) == 70
+    log.extend(_rows(100, 150))
+    assert log.spill(keep=10) == 70
+    log.extend(_rows(150, 160))
+    return log
+
+
+def test_reads_match_a_list_after_spilling(tmp_path):
+    log = _spilled_log(tmp_path)
+    expected = _rows(0, 160)
+
+    assert log.memory_count == 20
+    assert len(log) == len(expected)
+    assert list(log) == expected
+    assert log.copy() == expected
+    for start, stop in ((0, 160), (65, 75), (69, 141), (140, 160), (155, 500), (160, 160)):
+        assert log[start:stop] == expected[start:stop]
+    assert log[0] == expected[0]
+    assert log[-1] == expected[-1]
+    assert log[100] == expected[100]
+
+
+def test_update_each_writes_back_spilled_rows(tmp_path):
+    log = _spilled_log(tmp_path)
+
+    def mark(row):
+        row['linked_from'] = ['https://www.example.com/']
+        return True
+
+    log.update_each(mark)
+    assert all(row.get('linked_from') for row in log)
+
+
+def test_on_load_refreshes_spilled_rows(tmp_path):
+    statuses = {}
+    log = ResultLog(spill_dir=str(tmp_path), on_load=lambda rows: [row.update(status_code=statuses.get(row['url'])) for row in rows])
+    log.extend(_rows(0, 10))
+    log.spill()
+
+    statuses['https://www.example.com/page-3.html'] = 404
+    assert log[3]['status_code'] == 404
+
+
+def test_clear_removes_segment_files(tmp_path):
+    log = _spilled_log(tmp_path)
+    segment_dir = log.segment_dir
+    assert os.listdir(segment_dir)
+
+    log.clear()
+    assert len(log) == 0
+    assert not os.path.exists(segment_dir)
@@ -0,0 +1,118 @@
+"""
+ResultStore tests.
+
+Checks that rows read back from the columnar store exactly as they were appended,
+and that the store holds them in much less memory than the dicts it replaces.
+
+Run with: python -m pytest tests/test_result_store.py
+"""
+import sys
+import os
+import pickle
+import tracemalloc
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.result_log import ResultLog
+from src.core.result_store import ResultStore
+from src.core.seo_extractor import SEOExtractor
+
+
+def _result(i):
+    url = f"https://www.example.com/section-{i % 20}/page-{i}.html"
+    result = SEOExtractor.create_result(url, i % 4)
+    result.update({
+        'status_code': 200 if i % 10 else 404,
+        'content_type': 'text/html; charset=utf-8',
+        'size': 20000 + i,
+        'is_internal': True,
+        'title': f"Page {i} title",
+        'meta_description': 'Description of the page ' * 3,
+        'h1': f"Heading {i}",
+        'h2': [f"Section {i}-{j}" for j in range(i % 5)],
+        'word_count': 500 + i,
+        'lang': 'en',
+        'charset': 'utf-8',
+        'canonical_url': url,
+        'meta_tags': {'description': 'Description of the page'},
+        'images': [{'src': f"/img/{i}-{j}.png", 'alt': '', 'width': '', 'height': ''} for j in range(3)],
+        'internal_links': 40,
+        'response_time': 120.5 + i,
+        'linked_from': [f"https://www.example.com/section-{i % 20}/page-{i + k}.html" for k in range(5)]
+    })
+    return result
+
+
+def test_rows_read_back_unchanged():
+    error = {'url': 'https://www.example.com/broken', 'status_code': 0, 'error': 'Connection refused',
+             'depth': 2, 'is_internal': None, 'response_time': 15, 'javascript_rendered': True}
+    rows = [_result(i) for i in range(50)] + [error]
+
+    store = ResultStore()
+    store.extend(rows)
+
+    assert len(store) == len(rows)
+    assert list(store) == rows
+    assert store[10:20] == rows[10:20]
+    assert [list(row) for row in store] == [list(row) for row in rows]  # key order
+    assert store[-1].copy() == error
+    assert dict(store[3]) == rows[3]
+
+
+def test_row_views_write_through():
+    store = ResultStore()
+    store.extend([_result(i) for i in range(5)])
+
+    row = store[2]
+    row['linked_from'] = ['https://www.example.com/']
+    row['status_code'] = None
+    row['title'] = 'Changed'
+    assert store[2]['linked_from'] == ['https://www.example.com/']
+    assert store[2]['status_code'] is None
+    assert store[2:3][0]['title'] == 'Changed'
+
+    del row['h1']
+    assert 'h1' not in store[2]
+    assert 'h1' not in store[2:3][0]
+
+    # Values read from a view are copies
+    store[2]['linked_from'].append('https://www.example.com/other')
+    assert store[2]['linked_from'] == ['https://www.example.com/']
+
+
+def test_delete_from_front_and_spill():
+    rows = [_result(i) for i in range(100)]
+    log = ResultLog(rows[:60], table=ResultStore())
+    assert log.spill(keep=20) == 40
+    log.extend(rows[60:])
+
+    assert log.memory_count == 60
+    assert list(log) == rows
+    assert log[45] == rows[45]
+
+    def mark(row):
+        row['linked_from'] = [row['url']]
+        return True
+
+    log.update_each(mark)
+    assert all(row['linked_from'] == [row['url']] for row in log)
+
+
+def test_uses_less_memory_than_dicts():
+    rows = [_result(i) for i in range(2000)]
+
+    tracemalloc.start()
+    try:
+        dicts = pickle.loads(pickle.dumps(rows))  # Fresh copies, allocated while tracing
+        dict_bytes = tracemalloc.get_traced_memory()[0]
+        del dicts
+
+        before = tracemalloc.get_traced_memory()[0]
+        store = ResultStore()
+        store.extend(rows)
+        store_bytes = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert store_bytes * 5 < dict_bytes
@@ -0,0 +1,156 @@
+"""
+Robots service tests.
+
+Checks that URLs of a host whose robots.txt is being fetched wait for it instead of
+blocking (reported as parked, then allowed or rejected), that each robots.txt is fetched
+once and cached with a TTL - sitemap lookups included - and that fetch errors follow
+RobotFileParser's rules.
+
+Run with: python -m pytest tests/test_robots_service.py
+"""
+import sys
+import os
+import threading
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.robots_service import RobotsCache, RobotsService
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=''):
+        self.status_code = status_code
+        self.text = text
+
+
+class FakeSession:
+    """Serves robots.txt files from a dict, holding each fetch until release is set"""
+
+    def __init__(self, files):
+        self.files = files
+        self.fetched = []
+        self.release = threading.Event()
+
+    def get(self, url, timeout=None):
+        self.release.wait(5)
+        self.fetched.append(url)
+        status, text = self.files.get(url, (404, ''))
+        return FakeResponse(status, text)
+
+
+ROBOTS = "User-agent: *\nDisallow: /private/\nCrawl-delay: 2\n"
+
+
+def _service(files):
+    session = FakeSession(files)
+    allowed = []
+    resolved = threading.Event()
+    service = RobotsService(session, on_allowed=lambda url, depth: allowed.append((url, depth)),
+                            on_resolved=resolved.set, cache=RobotsCache())
+    return service, session, allowed, resolved
+
+
+def test_urls_wait_for_robots_txt():
+    service, session, allowed, resolved = _service({'https://example.com/robots.txt': (200, ROBOTS)})
+
+    assert service.check('https://example.com/a', 1) is None
+    assert service.check('https://example.com/private/b', 1) is None
+    assert service.check('https://example.com/a', 2) is None
+    assert service.pending_count() == 2
+
+    session.release.set()
+    assert resolved.wait(5)
+    assert allowed == [('https://example.com/a', 1)]
+    assert service.pending_count() == 0
+
+    # Answered from the cache from now on
+    assert service.check('https://example.com/c') is True
+    assert service.check('https://example.com/private/c') is False
+    assert service.crawl_delay('https://example.com') == 2
+    assert session.fetched == ['https://example.com/robots.txt']
+    service.close()
+
+
+def test_fetch_errors_and_ttl():
+    service, session, allowed, resolved = _service({
+        'https://forbidden.example.com/robots.txt': (403, ''),
+        'https://broken.example.com/robots.txt': (503, '')
+    })
+    session.release.set()
+
+    for host in ('forbidden', 'broken', 'missing'):
+        resolved.clear()
+        assert service.check(f"https://{host}.example.com/page") is None
+        assert resolved.wait(5)
+    assert allowed == [('https://missing.example.com/page', 0)]
+
+    cache = RobotsCache()
+    cache.put('https://example.com/robots.txt', object(), ttl=-1)
+    assert cache.get('https://example.com/robots.txt') is None
+    service.close()
+
+
+def test_cache_evicts_least_recently_used():
+    cache = RobotsCache(max_entries=2)
+    cache.put('a', 'A', 60)
+    cache.put('b', 'B', 60)
+    assert cache.get('a') == 'A'
+    cache.put('c', 'C', 60)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 'A' and cache.get('c') == 'C'
+
+
+def test_urls_stay_counted_until_queued():
+    session = FakeSession({'https://example.com/robots.txt': (200, ROBOTS)})
+    counts = []
+    resolved = threading.Event()
+    service = RobotsService(session, on_allowed=lambda url, depth: counts.append(service.pending_count()),
+                            on_resolved=resolved.set, cache=RobotsCache())
+
+    for page in range(3):
+        assert service.check(f"https://example.com/{page}", 1) is None
+
+    session.release.set()
+    assert resolved.wait(5)
+    # The caller queues each URL inside on_allowed, so it must still be pending until then
+    assert counts == [3, 3, 3]
+    assert service.pending_count() == 0
+    service.close()
+
+
+def test_parked_and_rejected_urls_reported():
+    session = FakeSession({'https://example.com/robots.txt': (200, ROBOTS)})
+    events = []
+    resolved = threading.Event()
+    service = RobotsService(session, on_parked=lambda url, depth: events.append(('parked', url)),
+                            on_rejected=lambda url, depth: events.append(('rejected', url)),
+                            on_resolved=resolved.set, cache=RobotsCache())
+
+    assert service.check('https://example.com/a', 1) is None
+    assert service.check('https://example.com/private/b', 1) is None
+    assert service.check('https://example.com/a', 2) is None
+
+    session.release.set()
+    assert resolved.wait(5)
+    assert events == [('parked', 'https://example.com/a'), ('parked', 'https://example.com/private/b'),
+                      ('rejected', 'https://example.com/private/b')]
+    service.close()
+
+
+def test_sitemaps_share_the_cached_fetch():
+    session = FakeSession({'https://example.com/robots.txt': (200, ROBOTS + "Sitemap: https://example.com/s.xml\n")})
+    resolved = threading.Event()
+    service = RobotsService(session, on_resolved=resolved.set, cache=RobotsCache())
+
+    # Waits for the fetch a check started instead of fetching again
+    assert service.check('https://example.com/a') is None
+    session.release.set()
+    assert service.sitemaps('https://example.com/robots.txt') == ['https://example.com/s.xml']
+    assert resolved.wait(5)
+    assert service.sitemaps('https://missing.example.com/robots.txt') == []
+    assert session.fetched == ['https://example.com/robots.txt', 'https://missing.example.com/robots.txt']
+
+    service.close()
+    assert service.parser('https://other.example.com/robots.txt') is None
@@ -0,0 +1,66 @@
+"""
+Scope filter tests.
+
+Checks the compiled scope rules against the crawl settings they come from, and that
+a filter survives pickling for worker processes.
+
+Run with: python -m pytest tests/test_scope_filter.py
+"""
+import sys
+import os
+import pickle
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.scope_filter import ScopeFilter
+from src.crawler import WebCrawler
+
+
+def test_default_config_scope():
+    scope_filter = ScopeFilter.from_config(WebCrawler()._get_default_config(), 'www.example.com')
+
+    assert scope_filter.allows('https://www.example.com/page')
+    assert scope_filter.allows('https://example.com/page')
+    assert not scope_filter.allows('https://other.example.org/page')
+    assert scope_filter.is_internal('http://example.com/')
+
+
+def test_extensions_and_patterns():
+    scope_filter = ScopeFilter(
+        'example.com',
+        crawl_external=True,
+        exclude_extensions=['pdf', 'jpg'],
+        include_patterns=[r'/blog/', r'/news/(\d+)', ''],
+        exclude_patterns=[r'\?replytocom=', r'/(tag|category)/']
+    )
+
+    assert scope_filter.allows('https://example.com/blog/post')
+    assert scope_filter.allows('https://other.example.org/news/12')
+    assert not scope_filter.allows('https://example.com/about')
+    assert not scope_filter.allows('https://example.com/blog/File.PDF')
+    assert not scope_filter.allows('https://example.com/blog/post?replytocom=5')
+    assert not scope_filter.allows('https://example.com/blog/tag/seo')
+    assert len(scope_filter.include_regexes) == 1
+
+    only_html = ScopeFilter('example.com', include_extensions=['html'])
+    assert only_html.allows('https://example.com/page.html')
+    assert only_html.allows('https://example.com/page')
+    assert not only_html.allows('https://example.com/v1.2/page')
+
+
+def test_patterns_that_cannot_be_combined():
+    scope_filter = ScopeFilter('example.com', exclude_patterns=[r'/(\w+)/\1/', r'(?i)/PRIVATE', '[unclosed'])
+
+    assert not scope_filter.allows('https://example.com/a/a/')
+    assert scope_filter.allows('https://example.com/a/b/')
+    assert not scope_filter.allows('https://example.com/private/x')
+    assert len(scope_filter.exclude_regexes) == 2
+
+
+def test_pickles_for_worker_processes():
+    scope_filter = ScopeFilter('example.com', exclude_extensions=['pdf'], include_patterns=['/docs/'])
+    copy = pickle.loads(pickle.dumps(scope_filter))
+
+    for url in ('https://example.com/docs/a', 'https://example.com/docs/a.pdf', 'https://example.com/b'):
+        assert copy.allows(url) == scope_filter.allows(url)
@@ -0,0 +1,147 @@
+"""
+Sitemap parser tests.
+
+Checks that sitemap indexes, gzipped and namespaced sitemaps are streamed into entries
+with their lastmod and priority, that URLs repeated across sitemaps are passed on once,
+that robots.txt is read through the robots service when there is one, and that a
+cancelled discovery stops reading.
+
+Run with: python -m pytest tests/test_sitemap_parser.py
+"""
+import sys
+import os
+import gzip
+import threading
+from datetime import datetime
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.robots_service import RobotsCache, RobotsService
+from src.core.sitemap_parser import SitemapParser
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b''):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode('utf-8', 'replace')
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        # Small chunks, so elements are split across feeds
+        for start in range(0, len(self.content), 7):
+            yield self.content[start:start + 7]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    """Serves files from a dict"""
+
+    def __init__(self, files):
+        self.files = files
+        self.fetched = []
+        self.lock = threading.Lock()
+
+    def get(self, url, timeout=None, stream=False):
+        with self.lock:
+            self.fetched.append(url)
+        if url not in self.files:
+            return FakeResponse(404)
+        return FakeResponse(200, self.files[url])
+
+
+SITE = 'https://example.com'
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+INDEX = f"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex {NS}>
+  <sitemap><loc>{SITE}/pages.xml</loc><lastmod>2025-01-01</lastmod></sitemap>
+  <sitemap><loc>{SITE}/posts.xml.gz</loc></sitemap>
+  <sitemap><loc>{SITE}/sitemap.xml</loc></sitemap>
+</sitemapindex>""".encode()
+
+PAGES = f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset {NS} xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+  <url>
+    <loc> {SITE}/a </loc>
+    <lastmod>2025-03-01T12:00:00+02:00</lastmod>
+    <priority>0.8</priority>
+    <image:image><image:loc>{SITE}/a.jpg</image:loc></image:image>
+  </url>
+  <url><loc>{SITE}/b</loc><priority>high</priority></url>
+</urlset>""".encode()
+
+POSTS = gzip.compress(f"""<urlset {NS}>
+  <url><loc>{SITE}/b</loc></url>
+  <url><loc>{SITE}/post</loc><lastmod>not a date</lastmod></url>
+</urlset>""".encode())
+
+
+def _discover(files):
+    session = FakeSession(files)
+    entries = []
+    discovery = SitemapParser(session, 'example.com').start_discovery(
+        f"{SITE}/start", lambda url, lastmod, priority: entries.append((url, lastmod, priority))
+    )
+    assert discovery.wait(5)
+    return sorted(entries), session
+
+
+def test_index_gzip_and_namespaces():
+    entries, session = _discover({
+        f"{SITE}/robots.txt": f"User-agent: *\nSitemap: {SITE}/index.xml\n".encode(),
+        f"{SITE}/index.xml": INDEX,
+        f"{SITE}/pages.xml": PAGES,
+        f"{SITE}/posts.xml.gz": POSTS
+    })
+
+    assert entries == [
+        (f"{SITE}/a", datetime(2025, 3, 1, 10, 0), 0.8),
+        (f"{SITE}/b", None, None),
+        (f"{SITE}/post", None, None)
+    ]
+    # Each sitemap is read once, though the index lists one of the common locations again
+    assert session.fetched.count(f"{SITE}/sitemap.xml") == 1
+
+
+def test_sync_wrappers_and_invalid_xml():
+    files = {
+        f"{SITE}/sitemap.xml": PAGES,
+        f"{SITE}/sitemaps.xml": f"<urlset {NS}><url><loc>{SITE}/c</loc></url><url><loc>".encode()
+    }
+    parser = SitemapParser(FakeSession(files), 'example.com')
+
+    assert sorted(parser.discover_sitemaps(SITE)) == [f"{SITE}/a", f"{SITE}/b", f"{SITE}/c"]
+    assert (f"{SITE}/a", datetime(2025, 3, 1, 10, 0)) in parser.discover_sitemap_entries(SITE)
+
+
+def test_robots_txt_read_through_robots_service():
+    session = FakeSession({
+        f"{SITE}/robots.txt": f"User-agent: *\nDisallow: /private/\nSitemap: {SITE}/pages.xml\n".encode(),
+        f"{SITE}/pages.xml": PAGES
+    })
+    robots = RobotsService(session, cache=RobotsCache())
+    entries = []
+    discovery = SitemapParser(session, 'example.com', robots=robots).start_discovery(
+        SITE, lambda url, lastmod, priority: entries.append(url)
+    )
+    assert discovery.wait(5)
+
+    assert sorted(entries) == [f"{SITE}/a", f"{SITE}/b"]
+    # The crawl's robots checks are answered from the same fetch
+    assert robots.check(f"{SITE}/private/page") is False
+    assert session.fetched.count(f"{SITE}/robots.txt") == 1
+    robots.close()
+
+
+def test_cancel_stops_discovery():
+    session = FakeSession({f"{SITE}/sitemap.xml": PAGES})
+    entries = []
+    discovery = SitemapParser(session, 'example.com').start_discovery(SITE, lambda *entry: entries.append(entry))
+    discovery.cancel()
+
+    assert discovery.wait(5)
+    assert discovery.pending_count() == 0
@@ -0,0 +1,66 @@
+"""
+Seen-set tests.
+
+Checks that the compact seen-sets behave like a set of URL strings, and measures
+the Bloom filter's false-positive rate against its configured bound.
+
+Run with: python -m pytest tests/test_url_set.py
+"""
+import sys
+import os
+
+import pytest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.url_set import BloomFilter, FingerprintSet, SEEN_SET_TYPES, make_seen_set
+
+
+def _urls(prefix, count):
+    return [f"https://www.example.com/{prefix}/page-{i}.html?ref={i % 7}" for i in range(count)]
+
+
+@pytest.mark.parametrize('seen_set_type', SEEN_SET_TYPES)
+def test_behaves_like_a_set(seen_set_type):
+    seen = make_seen_set(seen_set_type)
+    urls = _urls('a', 5000)
+
+    for url in urls:
+        seen.add(url)
+    seen.add(urls[0])
+
+    assert len(seen) == len(urls)
+    assert all(url in seen for url in urls)
+
+    seen.clear()
+    assert len(seen) == 0
+    assert urls[0] not in seen
+
+
+def test_fingerprint_set_grows_without_losing_entries():
+    seen = FingerprintSet()
+    urls = _urls('grow', 50000)
+
+    assert all(seen.add(url) for url in urls)
+    assert not any(seen.add(url) for url in urls)
+    assert len(seen) == len(urls)
+    assert not any(url in seen for url in _urls('other', 50000))
+    assert seen.memory_bytes() <= 24 * len(urls)
+
+
+@pytest.mark.parametrize('error_rate', [0.01, 0.001])
+def test_bloom_false_positive_rate_within_bound(error_rate):
+    # Small initial capacity so the filter has to scale through several stages
+    seen = BloomFilter(capacity=5000, error_rate=error_rate)
+    for url in _urls('seen', 60000):
+        seen.add(url)
+
+    assert len(seen.stages) > 1
+
+    probes = _urls('unseen', 200000)
+    measured = sum(1 for url in probes if url in seen) / len(probes)
+
+    # str hashes are randomized per process, so allow for sampling noise around the bound
+    assert measured <= error_rate * 1.25
+    assert seen.false_positive_rate() <= error_rate
@@ -27,6 +27,8 @@ let crawlState = {
 
 // Incremental polling instance
 let incrementalPoller = null;
+let crawlStream = null;  // Open EventSource for crawl progress, if streaming
+let crawlStreamFailed = false;  // Stream unavailable - poll instead
 
 // Virtual Scrollers
 let virtualScrollers = {
@@ -250,6 +252,7 @@ function startCrawl() {
         incrementalPoller = new IncrementalPoller();
     }
     incrementalPoller.reset();
+    crawlStreamFailed = false;
 
     // Update UI
     updateCrawlButtons();
@@ -293,6 +296,7 @@ function resumeCrawl() {
 function stopCrawl() {
     crawlState.isRunning = false;
     crawlState.isPaused = false;
+    closeCrawlStream();
 
     // Update UI
     updateCrawlButtons();
@@ -415,46 +419,18 @@ function stopPythonCrawl() {
 function pollCrawlProgress() {
     if (!crawlState.isRunning) return;
 
-    // Use incremental poller if available, otherwise fall back to regular fetch
-    const fetchPromise = incrementalPoller
-        ? incrementalPoller.fetchUpdate()
-        : fetch('/api/crawl_status').then(response => response.json());
+    // Prefer the pushed stream; fall back to polling if it isn't available
+    if (!incrementalPoller) {
+        incrementalPoller = new IncrementalPoller();
+    }
+    if (!crawlStreamFailed && startCrawlStream()) {
+        return;
+    }
 
-    fetchPromise
+    incrementalPoller.fetchUpdate()
         .then(data => {
-            updateCrawlData(data);
-
-            // Update bottom status bar based on current state
-            if (data.is_running_pagespeed) {
-                updateStatus('Running PageSpeed analysis...');
-            } else if (data.status === 'running') {
-                updateStatus('Crawling in progress...');
-            }
-
-            // Update visualization if visualization tab is active
-            const vizTab = document.getElementById('visualization-tab');
-            if (vizTab && vizTab.classList.contains('active') && typeof loadVisualizationData === 'function') {
-                loadVisualizationData();
-            }
-
-            if (crawlState.isRunning && data.status !== 'completed') {
+            if (handleCrawlUpdate(data)) {
                 setTimeout(pollCrawlProgress, 1000); // Poll every second
-            } else if (data.status === 'completed') {
-                stopCrawl();
-                updateStatus('Crawl completed');
-                // Update visualization one final time when crawl completes
-                if (typeof loadVisualizationData === 'function') {
-                    loadVisualizationData();
-                }
-                // Notify plugins that crawl is complete
-                if (window.LibreCrawlPlugin && window.LibreCrawlPlugin.loader) {
-                    window.LibreCrawlPlugin.loader.notifyCrawlComplete({
-                        urls: crawlState.urls,
-                        links: crawlState.links,
-                        issues: crawlState.issues,
-                        stats: crawlState.stats
-                    });
-                }
             }
         })
         .catch(error => {
@@ -466,6 +442,76 @@ function pollCrawlProgress() {
         });
 }
 
+function startCrawlStream() {
+    if (crawlStream) return true;
+
+    crawlStream = incrementalPoller.openStream(
+        data => {
+            if (!handleCrawlUpdate(data)) {
+                closeCrawlStream();
+            }
+        },
+        failed => {
+            crawlStream = null;
+            if (failed) {
+                console.log('Crawl stream unavailable, polling instead');
+                crawlStreamFailed = true;
+            }
+            // Stream ended without the crawl finishing (e.g. the server closed it) - pick up from the cursors
+            if (crawlState.isRunning) {
+                setTimeout(pollCrawlProgress, 1000);
+            }
+        }
+    );
+    return crawlStream !== null;
+}
+
+function closeCrawlStream() {
+    if (crawlStream) {
+        crawlStream.close();
+        crawlStream = null;
+    }
+}
+
+// Apply one progress update; returns true while more updates are expected
+function handleCrawlUpdate(data) {
+    updateCrawlData(data);
+
+    // Update bottom status bar based on current state
+    if (data.is_running_pagespeed) {
+        updateStatus('Running PageSpeed analysis...');
+    } else if (data.status === 'running') {
+        updateStatus('Crawling in progress...');
+    }
+
+    // Update visualization if visualization tab is active
+    const vizTab = document.getElementById('visualization-tab');
+    if (vizTab && vizTab.classList.contains('active') && typeof loadVisualizationData === 'function') {
+        loadVisualizationData();
+    }
+
+    if (crawlState.isRunning && data.status !== 'completed') {
+        return true;
+    } else if (data.status === 'completed') {
+        stopCrawl();
+        updateStatus('Crawl completed');
+        // Update visualization one final time when crawl completes
+        if (typeof loadVisualizationData === 'function') {
+            loadVisualizationData();
+        }
+        // Notify plugins that crawl is complete
+        if (window.LibreCrawlPlugin && window.LibreCrawlPlugin.loader) {
+            window.LibreCrawlPlugin.loader.notifyCrawlComplete({
+                urls: crawlState.urls,
+                links: crawlState.links,
+                issues: crawlState.issues,
+                stats: crawlState.stats
+            });
+        }
+    }
+    return false;
+}
+
 function updateCrawlData(data) {
     // Update statistics
     crawlState.stats = data.stats || crawlState.stats;
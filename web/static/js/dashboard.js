@@ -56,6 +56,7 @@ async function openDashboard() {
                     <td style="white-space: nowrap;">
                         <button class="btn btn-primary" style="margin-right: 5px; padding: 6px 12px; font-size: 13px;" onclick="loadCrawlFromDashboard(${crawl.id})">Load</button>
                         <button class="btn btn-secondary" style="margin-right: 5px; padding: 6px 12px; font-size: 13px;" onclick="resumeCrawlFromDashboard(${crawl.id})">Resume</button>
+                        ${status !== 'running' ? `<button class="btn btn-secondary" style="margin-right: 5px; padding: 6px 12px; font-size: 13px;" onclick="recrawlFromDashboard(${crawl.id})">Recrawl</button>` : ''}
                         <button class="btn btn-danger" style="padding: 6px 12px; font-size: 13px;" onclick="deleteCrawlFromDashboard(${crawl.id})">Delete</button>
                     </td>
                 </tr>
@@ -224,6 +225,46 @@ async function resumeCrawlFromDashboard(crawlId) {
     }
 }
 
+async function recrawlFromDashboard(crawlId) {
+    if (!confirm('Recrawl this site? Unchanged pages are reused from this crawl and any unsaved current data will be lost.')) return;
+
+    try {
+        const response = await fetch(`/api/crawls/${crawlId}/recrawl`, {
+            method: 'POST'
+        });
+        const data = await response.json();
+
+        if (!data.success) {
+            alert('Error: ' + (data.error || data.message));
+            return;
+        }
+
+        // Close dashboard
+        closeDashboard();
+
+        // Start from a clean UI - results stream in as the recrawl runs
+        clearAllTables();
+        resetStats();
+        crawlState.urls = [];
+        crawlState.links = [];
+        crawlState.issues = [];
+
+        crawlState.isRunning = true;
+        crawlState.isPaused = false;
+        crawlState.startTime = new Date();
+        showProgress();
+        updateCrawlButtons();
+        pollCrawlProgress();
+
+        updateStatus('Recrawl started');
+        showNotification(data.message || 'Recrawl started', 'success');
+
+    } catch (error) {
+        console.error('Error starting recrawl:', error);
+        alert('Error starting recrawl');
+    }
+}
+
 async function deleteCrawlFromDashboard(crawlId) {
     if (!confirm('Delete this crawl permanently? This cannot be undone.')) return;
 
@@ -6,10 +6,11 @@
 
 class IncrementalPoller {
     constructor() {
-        // Track what we've received so far
+        // Server-side cursors: positions in the server's result logs we've received up to
         this.lastUrlCount = 0;
         this.lastLinkCount = 0;
         this.lastIssueCount = 0;
+        this.generation = null;
 
         // Accumulated data
         this.allUrls = [];
@@ -32,6 +33,7 @@ class IncrementalPoller {
         this.lastUrlCount = 0;
         this.lastLinkCount = 0;
         this.lastIssueCount = 0;
+        this.generation = null;
         this.allUrls = [];
         this.allLinks = [];
         this.allIssues = [];
@@ -43,58 +45,35 @@ class IncrementalPoller {
         this.memoryData = null;
     }
 
+    /**
+     * Query parameters asking for the data after our cursors
+     * @returns {URLSearchParams}
+     */
+    cursorParams() {
+        const params = new URLSearchParams({
+            url_since: this.lastUrlCount,
+            link_since: this.lastLinkCount,
+            issue_since: this.lastIssueCount
+        });
+        if (this.generation !== null) {
+            params.set('generation', this.generation);
+        }
+        return params;
+    }
+
     /**
      * Fetch incremental update from server
      * @returns {Promise<Object>} Full crawl data (accumulated + new)
      */
     async fetchUpdate() {
         try {
-            // Request only data after our last known counts
-            const params = new URLSearchParams({
-                url_since: this.lastUrlCount,
-                link_since: this.lastLinkCount,
-                issue_since: this.lastIssueCount
-            });
+            // Request only data after our last known cursors
+            const params = this.cursorParams();
 
             const response = await fetch(`/api/crawl_status?${params}`);
             const data = await response.json();
 
-            // Update stats and status (always sent in full)
-            this.latestStats = data.stats || this.latestStats;
-            this.latestStatus = data.status || this.latestStatus;
-            this.latestProgress = data.progress || 0;
-            this.isRunningPagespeed = data.is_running_pagespeed || false;
-            this.memory = data.memory || this.memory;
-            this.memoryData = data.memory_data || this.memoryData;
-
-            // Accumulate new data
-            if (data.urls && data.urls.length > 0) {
-                this.allUrls.push(...data.urls);
-                this.lastUrlCount = this.allUrls.length;
-            }
-
-            if (data.links && data.links.length > 0) {
-                this.allLinks.push(...data.links);
-                this.lastLinkCount = this.allLinks.length;
-            }
-
-            if (data.issues && data.issues.length > 0) {
-                this.allIssues.push(...data.issues);
-                this.lastIssueCount = this.allIssues.length;
-            }
-
-            // Return data in the same format as the old get_status
-            return {
-                status: this.latestStatus,
-                stats: this.latestStats,
-                urls: this.allUrls,
-                links: this.allLinks,
-                issues: this.allIssues,
-                progress: this.latestProgress,
-                is_running_pagespeed: this.isRunningPagespeed,
-                memory: this.memory,
-                memory_data: this.memoryData
-            };
+            return this.applyUpdate(data);
 
         } catch (error) {
             console.error('Error in incremental fetch:', error);
@@ -102,6 +81,90 @@ class IncrementalPoller {
         }
     }
 
+    /**
+     * Merge an incremental update (from polling or the stream) into the accumulated data
+     * @param {Object} data - Response of /api/crawl_status or one /api/crawl_stream event
+     * @returns {Object} Full crawl data (accumulated + new)
+     */
+    applyUpdate(data) {
+        // Update stats and status (always sent in full)
+        this.latestStats = data.stats || this.latestStats;
+        this.latestStatus = data.status || this.latestStatus;
+        this.latestProgress = data.progress || 0;
+        this.isRunningPagespeed = data.is_running_pagespeed || false;
+        this.memory = data.memory || this.memory;
+        this.memoryData = data.memory_data || this.memoryData;
+
+        // Server results were cleared or replaced - start accumulating again
+        if (data.reset) {
+            this.allUrls = [];
+            this.allLinks = [];
+            this.allIssues = [];
+        }
+
+        // Accumulate new data
+        if (data.urls && data.urls.length > 0) {
+            this.allUrls.push(...data.urls);
+        }
+
+        if (data.links && data.links.length > 0) {
+            this.allLinks.push(...data.links);
+        }
+
+        if (data.issues && data.issues.length > 0) {
+            this.allIssues.push(...data.issues);
+        }
+
+        // Advance the cursors (issues can be filtered server-side, so don't count them locally)
+        if (data.cursors) {
+            this.lastUrlCount = data.cursors.urls;
+            this.lastLinkCount = data.cursors.links;
+            this.lastIssueCount = data.cursors.issues;
+            this.generation = data.cursors.generation;
+        }
+
+        // Return data in the same format as the old get_status
+        return this.getCurrentData();
+    }
+
+    /**
+     * Open a Server-Sent Events stream of crawl updates, starting from our cursors.
+     * The server coalesces updates, so each event carries every row added since the previous one.
+     * @param {Function} onUpdate - Called with the full crawl data after each event
+     * @param {Function} onClose - Called once when the stream ends; failed is true if it
+     *                             could not be used (the caller should poll instead)
+     * @returns {EventSource|null} The stream, or null if EventSource is unsupported
+     */
+    openStream(onUpdate, onClose) {
+        if (!window.EventSource) {
+            return null;
+        }
+
+        const params = this.cursorParams();
+
+        const source = new EventSource(`/api/crawl_stream?${params}`);
+        let received = false;
+        const close = (failed) => {
+            source.close();
+            onClose(failed);
+        };
+
+        source.addEventListener('status', event => {
+            received = true;
+            onUpdate(this.applyUpdate(JSON.parse(event.data)));
+        });
+        source.addEventListener('end', () => close(false));
+        source.onerror = () => {
+            // Reconnects (e.g. after the server's max stream duration) resume from the last event id;
+            // a stream that never delivered an event (refused, unsupported) is given up
+            if (!received || source.readyState === EventSource.CLOSED) {
+                close(!received);
+            }
+        };
+
+        return source;
+    }
+
     /**
      * Get current accumulated data without fetching
      * @returns {Object} Current full crawl data
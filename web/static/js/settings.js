@@ -15,6 +15,7 @@ let defaultSettings = {
     acceptLanguage: 'en-US,en;q=0.9',
     respectRobotsTxt: true,
     allowCookies: true,
+    useHttpCache: false,
     discoverSitemaps: true,
     enablePageSpeed: false,
     googleApiKey: '',
@@ -36,6 +37,12 @@ let defaultSettings = {
 
     // Advanced settings
     concurrency: 5,
+    fetchEngine: 'threads',
+    parserBackend: 'html.parser',
+    parseWorkers: 0,
+    urlSeenSet: 'exact',
+    asyncMaxConnections: 100,
+    maxPerHostConcurrency: 0,
     memoryLimit: 512,
     logLevel: 'INFO',
     saveSession: false,
@@ -458,10 +465,10 @@ function collectSettingsFromForm() {
     // Collect regular form fields
     const formFields = [
         'maxDepth', 'maxUrls', 'crawlDelay', 'followRedirects', 'crawlExternalLinks',
-        'userAgent', 'timeout', 'retries', 'acceptLanguage', 'respectRobotsTxt', 'allowCookies', 'discoverSitemaps', 'enablePageSpeed', 'googleApiKey',
+        'userAgent', 'timeout', 'retries', 'acceptLanguage', 'respectRobotsTxt', 'allowCookies', 'useHttpCache', 'discoverSitemaps', 'enablePageSpeed', 'googleApiKey',
         'includeExtensions', 'excludeExtensions', 'includePatterns', 'excludePatterns', 'maxFileSize',
         'enableDuplicationCheck', 'duplicationThreshold',
-        'exportFormat', 'concurrency', 'memoryLimit', 'logLevel', 'saveSession',
+        'exportFormat', 'concurrency', 'fetchEngine', 'parserBackend', 'parseWorkers', 'urlSeenSet', 'asyncMaxConnections', 'maxPerHostConcurrency', 'memoryLimit', 'logLevel', 'saveSession',
         'enableProxy', 'proxyUrl', 'customHeaders',
         'enableJavaScript', 'jsWaitTime', 'jsTimeout', 'jsBrowser', 'jsHeadless', 'jsUserAgent', 'jsViewportWidth', 'jsViewportHeight', 'jsMaxConcurrentPages',
         'customCSS', 'issueExclusionPatterns'
@@ -594,6 +601,18 @@ function validateSettings(settings) {
         errors.push('Concurrency must be between 1 and 50');
     }
 
+    if (settings.asyncMaxConnections < 1 || settings.asyncMaxConnections > 1000) {
+        errors.push('Async max connections must be between 1 and 1000');
+    }
+
+    if (settings.parseWorkers < 0 || settings.parseWorkers > 64) {
+        errors.push('Parse workers must be between 0 and 64');
+    }
+
+    if (settings.maxPerHostConcurrency < 0 || settings.maxPerHostConcurrency > 50) {
+        errors.push('Max requests per host must be between 0 and 50');
+    }
+
     if (settings.memoryLimit < 64 || settings.memoryLimit > 4096) {
         errors.push('Memory limit must be between 64 and 4096 MB');
     }